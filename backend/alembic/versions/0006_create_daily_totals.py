@@ -0,0 +1,40 @@
+"""create daily_totals
+
+Revision ID: 0006_create_daily_totals
+Revises: 0005_create_telegram_link_codes
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006_create_daily_totals"
+down_revision = "0005_create_telegram_link_codes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "daily_totals",
+        sa.Column("user_id", sa.UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("meals_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("calories", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("protein_g", sa.Numeric(8, 2), nullable=False, server_default=sa.text("0")),
+        sa.PrimaryKeyConstraint("user_id", "date", name="pk_daily_totals"),
+    )
+
+    # Initial backfill; later drift is handled by `python -m app.db.reconcile_daily_totals`.
+    op.execute(
+        """
+        INSERT INTO daily_totals (user_id, date, meals_count, calories, protein_g)
+        SELECT user_id, meal_date, COUNT(*), SUM(total_calories), SUM(total_protein_g)
+        FROM meals
+        GROUP BY user_id, meal_date
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("daily_totals")
@@ -0,0 +1,156 @@
+"""partition meals by month
+
+Revision ID: 0007_partition_meals
+Revises: 0006_create_daily_totals
+Create Date: 2026-10-18
+
+Rebuilds `meals` as a declarative RANGE-partitioned table on meal_date, one
+partition per month (meals_pYYYY_MM) plus a DEFAULT partition as a safety net.
+Future partitions are created and old ones archived by
+`python -m app.db.meal_partitions`.
+
+Postgres requires the partition key in every unique constraint, so the primary
+key becomes (id, meal_date). A foreign key can then no longer point at meals.id
+alone: meal_items.meal_id loses its FK, and an AFTER DELETE trigger on meals
+keeps the ON DELETE CASCADE behaviour.
+"""
+
+import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007_partition_meals"
+down_revision = "0006_create_daily_totals"
+branch_labels = None
+depends_on = None
+
+# Months created ahead of the current one; the maintenance command keeps this going.
+MONTHS_AHEAD = 3
+
+
+def _month_start(d: datetime.date) -> datetime.date:
+    return d.replace(day=1)
+
+
+def _next_month(d: datetime.date) -> datetime.date:
+    return (d.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+
+
+def _create_partition(month: datetime.date) -> None:
+    op.execute(
+        f"CREATE TABLE meals_p{month:%Y_%m} PARTITION OF meals "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_next_month(month).isoformat()}')"
+    )
+
+
+def upgrade() -> None:
+    op.create_table(
+        "meal_archives",
+        sa.Column("id", sa.BigInteger(), sa.Identity(), primary_key=True),
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("meals_rows", sa.Integer(), nullable=False),
+        sa.Column("items_rows", sa.Integer(), nullable=False),
+        sa.Column("meals_file", sa.Text(), nullable=False),
+        sa.Column("items_file", sa.Text(), nullable=False),
+        sa.Column("archived_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+    )
+
+    op.create_index("ix_meal_archives_month", "meal_archives", ["month"])
+
+    op.drop_constraint("meal_items_meal_id_fkey", "meal_items", type_="foreignkey")
+
+    op.rename_table("meals", "meals_legacy")
+    op.execute("ALTER INDEX ix_meals_user_date RENAME TO ix_meals_legacy_user_date")
+    op.execute("ALTER INDEX ix_meals_user_created_at RENAME TO ix_meals_legacy_user_created_at")
+
+    op.execute(
+        """
+        CREATE TABLE meals (
+            id uuid NOT NULL DEFAULT gen_random_uuid(),
+            user_id uuid NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+            raw_text text NOT NULL,
+            title text NOT NULL,
+            total_calories integer NOT NULL,
+            total_protein_g numeric(6, 2) NOT NULL,
+            meal_date date NOT NULL,
+            created_at timestamptz NOT NULL DEFAULT now(),
+            CONSTRAINT pk_meals PRIMARY KEY (id, meal_date),
+            CONSTRAINT ck_meals_total_calories_nonneg CHECK (total_calories >= 0),
+            CONSTRAINT ck_meals_total_protein_nonneg CHECK (total_protein_g >= 0)
+        ) PARTITION BY RANGE (meal_date)
+        """
+    )
+    op.create_index("ix_meals_user_date", "meals", ["user_id", "meal_date"])
+    op.create_index("ix_meals_user_created_at", "meals", ["user_id", "created_at"])
+
+    bind = op.get_bind()
+    today = datetime.date.today()
+    first = bind.execute(sa.text("SELECT min(meal_date) FROM meals_legacy")).scalar() or today
+
+    month = _month_start(min(first, today))
+    last = _month_start(today)
+    for _ in range(MONTHS_AHEAD):
+        last = _next_month(last)
+    while month <= last:
+        _create_partition(month)
+        month = _next_month(month)
+    op.execute("CREATE TABLE meals_default PARTITION OF meals DEFAULT")
+
+    op.execute(
+        """
+        INSERT INTO meals (id, user_id, raw_text, title, total_calories, total_protein_g, meal_date, created_at)
+        SELECT id, user_id, raw_text, title, total_calories, total_protein_g, meal_date, created_at
+        FROM meals_legacy
+        """
+    )
+    op.drop_table("meals_legacy")
+
+    op.execute(
+        """
+        CREATE FUNCTION meals_delete_items() RETURNS trigger AS $$
+        BEGIN
+            DELETE FROM meal_items WHERE meal_id = OLD.id;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER trg_meals_delete_items AFTER DELETE ON meals "
+        "FOR EACH ROW EXECUTE FUNCTION meals_delete_items()"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER trg_meals_delete_items ON meals")
+    op.execute("DROP FUNCTION meals_delete_items()")
+
+    op.rename_table("meals", "meals_partitioned")
+    op.execute("ALTER INDEX ix_meals_user_date RENAME TO ix_meals_partitioned_user_date")
+    op.execute("ALTER INDEX ix_meals_user_created_at RENAME TO ix_meals_partitioned_user_created_at")
+
+    op.create_table(
+        "meals",
+        sa.Column("id", sa.UUID(as_uuid=True), primary_key=True, server_default=sa.text("gen_random_uuid()")),
+        sa.Column("user_id", sa.UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("raw_text", sa.Text(), nullable=False),
+        sa.Column("title", sa.Text(), nullable=False),
+        sa.Column("total_calories", sa.Integer(), nullable=False),
+        sa.Column("total_protein_g", sa.Numeric(6, 2), nullable=False),
+        sa.Column("meal_date", sa.Date(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.CheckConstraint("total_calories >= 0", name="ck_meals_total_calories_nonneg"),
+        sa.CheckConstraint("total_protein_g >= 0", name="ck_meals_total_protein_nonneg"),
+    )
+    op.execute("INSERT INTO meals SELECT * FROM meals_partitioned")
+    op.drop_table("meals_partitioned")  # drops every attached partition
+    op.create_index("ix_meals_user_date", "meals", ["user_id", "meal_date"])
+    op.create_index("ix_meals_user_created_at", "meals", ["user_id", "created_at"])
+
+    # Items of archived (already detached) months would violate the FK: they were
+    # deleted at archive time, so only items of live meals remain.
+    op.create_foreign_key(
+        "meal_items_meal_id_fkey", "meal_items", "meals", ["meal_id"], ["id"], ondelete="CASCADE"
+    )
+    op.drop_table("meal_archives")
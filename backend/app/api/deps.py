@@ -1,10 +1,82 @@
 from __future__ import annotations
 
-from typing import Annotated
+from typing import Annotated, Any
 
 from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from app.db.session import get_db
+from app.auth.deps import (
+    get_current_db_user,
+    get_current_db_user_async,
+    get_current_user,
+    get_current_user_async,
+)
+from app.core.config import settings
+from app.db.session import get_async_db, get_db
+from app.repositories.meal_repository import AsyncMealRepository, MealRepository
+from app.repositories.telegram_repository import AsyncTelegramRepository, TelegramRepository
+from app.services.days.day_service import AsyncDayService, DayService
+from app.services.meals.meal_service import AsyncMealService, MealService
+from app.services.telegram.service import TelegramWebhookService
 
 DbSession = Annotated[Session, Depends(get_db)]
+
+
+class _OnThreadpool:
+    """
+    The async interface of a sync service or repository: `await x.method(...)`
+    runs `method` on the threadpool. Lets the sync classes stand in for their
+    Async* counterparts when DB_ASYNC_ENABLED=false.
+    """
+
+    def __init__(self, target: Any) -> None:
+        self._target = target
+
+    def __getattr__(self, name: str) -> Any:
+        method = getattr(self._target, name)
+
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            return await run_in_threadpool(method, *args, **kwargs)
+
+        return call
+
+
+# Hot read routes have a single async handler each; the session flavour behind
+# it is chosen here, once (DB_ASYNC_ENABLED): the AsyncSession engine, or the
+# sync services on the threadpool (e.g. SQLite, which has no async driver here).
+if settings.db_async_enabled:
+    get_principal = get_current_user_async
+    get_db_user = get_current_db_user_async
+
+    def get_day_service(db: AsyncSession = Depends(get_async_db)) -> Any:
+        return AsyncDayService(db)
+
+    def get_meal_reader(db: AsyncSession = Depends(get_async_db)) -> Any:
+        return AsyncMealService(db)
+
+    def get_telegram_webhook_service(db: AsyncSession = Depends(get_async_db)) -> TelegramWebhookService:
+        return TelegramWebhookService(
+            repo=AsyncTelegramRepository(db),
+            meal_repo=AsyncMealRepository(db),
+            meal_service=AsyncMealService(db),
+        )
+
+else:
+    get_principal = get_current_user
+    get_db_user = get_current_db_user
+
+    def get_day_service(db: Session = Depends(get_db)) -> Any:
+        return _OnThreadpool(DayService(db))
+
+    def get_meal_reader(db: Session = Depends(get_db)) -> Any:
+        return _OnThreadpool(MealService(db))
+
+    def get_telegram_webhook_service(db: Session = Depends(get_db)) -> TelegramWebhookService:
+        return TelegramWebhookService(
+            repo=_OnThreadpool(TelegramRepository(db)),
+            meal_repo=_OnThreadpool(MealRepository(db)),
+            # Already a coroutine on MealService (parses on the loop, writes briefly).
+            meal_service=MealService(db),
+        )
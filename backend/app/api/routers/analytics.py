@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import datetime
+from zoneinfo import ZoneInfo
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.auth.deps import get_current_user
+from app.core.config import settings
+from app.db.session import get_db
+from app.schemas.analytics import AnalyticsSummaryOut
+from app.services.analytics.analytics_service import AnalyticsService
+
+router = APIRouter(prefix="/api/v1/analytics", tags=["analytics"])
+
+
+@router.get("/summary", response_model=AnalyticsSummaryOut)
+def summary(db: Session = Depends(get_db), user=Depends(get_current_user)) -> AnalyticsSummaryOut:
+    tz = ZoneInfo(settings.app_timezone)
+    today_date = datetime.datetime.now(tz).date()
+    return AnalyticsService(db).get_summary(user=user, today=today_date)
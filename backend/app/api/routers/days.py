@@ -3,29 +3,42 @@ from __future__ import annotations
 import datetime
 from zoneinfo import ZoneInfo
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from typing import Literal
 
-from app.auth.deps import get_current_user
+from fastapi import APIRouter, Depends, Query
+
+from app.api.deps import get_day_service, get_principal
 from app.core.config import settings
-from app.db.session import get_db
-from app.schemas.day import DaySummaryOut
-from app.services.days.day_service import DayService
+from app.schemas.day import DayRangeOut, DaySummaryOut
 
 router = APIRouter(prefix="/api/v1/days", tags=["days"])
 
 
-@router.get("/today", response_model=DaySummaryOut)
-def today(db: Session = Depends(get_db), user=Depends(get_current_user)) -> DaySummaryOut:
+def _today() -> datetime.date:
     tz = ZoneInfo(settings.app_timezone)
-    today_date = datetime.datetime.now(tz).date()
-    return DayService(db).get_day_summary(user=user, date=today_date)
+    return datetime.datetime.now(tz).date()
+
+
+@router.get("", response_model=DayRangeOut)
+async def get_range(
+    from_date: datetime.date = Query(alias="from"),
+    to_date: datetime.date = Query(alias="to"),
+    bucket: Literal["day", "week", "month"] = Query(default="day"),
+    service=Depends(get_day_service),
+    user=Depends(get_principal),
+) -> DayRangeOut:
+    return await service.get_range(user=user, start=from_date, end=to_date, bucket=bucket)
+
+
+@router.get("/today", response_model=DaySummaryOut)
+async def today(service=Depends(get_day_service), user=Depends(get_principal)) -> DaySummaryOut:
+    return await service.get_day_summary(user=user, date=_today())
 
 
 @router.get("/{date}", response_model=DaySummaryOut)
-def get_by_date(
+async def get_by_date(
     date: datetime.date,
-    db: Session = Depends(get_db),
-    user=Depends(get_current_user),
+    service=Depends(get_day_service),
+    user=Depends(get_principal),
 ) -> DaySummaryOut:
-    return DayService(db).get_day_summary(user=user, date=date)
+    return await service.get_day_summary(user=user, date=date)
@@ -2,15 +2,21 @@
 from __future__ import annotations
 
 import datetime
+import functools
 import uuid
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, File, Query, Request, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
+from app.api.deps import get_meal_reader, get_principal
 from app.auth.deps import get_current_user
-from app.db.session import get_db
-from app.models.user import User
-from app.schemas.meal import MealCreateRequest, MealOut, MealPatchRequest
+from app.auth.principal import Principal
+from app.db.session import get_db, open_request_session
+from app.schemas.meal import MealCreateRequest, MealImportOut, MealJobOut, MealOut, MealPatchRequest
+from app.services.analytics.analytics_service import bump_analytics_version
+from app.services.meals.meal_export import MEDIA_TYPES, ExportFormat, export_meals
+from app.services.meals.meal_import import ImportFormat, MealImportService
 from app.services.meals.meal_service import MealService
 from app.infra.redis.cache import cache_delete
 from app.infra.redis.keys import day_summary_key
@@ -29,24 +35,79 @@ def _meal_out(meal) -> MealOut:
 def create(
     payload: MealCreateRequest,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
 ) -> MealOut:
     service = MealService(db)
     meal = service.analyze_and_create(user.id, payload.text)
     cache_delete(day_summary_key(user.id, meal.meal_date))
+    bump_analytics_version(user.id)
     return _meal_out(meal)
 
 
+@router.post("/jobs", response_model=MealJobOut, status_code=status.HTTP_202_ACCEPTED)
+def create_job(
+    payload: MealCreateRequest,
+    db: Session = Depends(get_db),
+    user: Principal = Depends(get_current_user),
+) -> MealJobOut:
+    job = MealService(db).submit_job(user.id, payload.text)
+    return MealJobOut(job_id=job["id"], status=job["status"])
+
+
+@router.get("/jobs/{job_id}", response_model=MealJobOut)
+def get_job(
+    job_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    user: Principal = Depends(get_current_user),
+) -> MealJobOut:
+    service = MealService(db)
+    job = service.get_job(job_id, user.id)
+    meal = None
+    if job["status"] == "succeeded":
+        meal = _meal_out(service.get_owned(uuid.UUID(job["meal_id"]), user.id))
+    return MealJobOut(job_id=job["id"], status=job["status"], meal=meal, error=job["error"])
+
+
+@router.get("/export")
+def export(
+    request: Request,
+    format: ExportFormat = Query(default="ndjson"),
+    user: Principal = Depends(get_current_user),
+) -> StreamingResponse:
+    # The body is produced after the request's session is gone: the stream opens its own.
+    chunks = export_meals(functools.partial(open_request_session, request), user.id, format)
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="meals.{format}"'},
+    )
+
+
+@router.post("/import", response_model=MealImportOut)
+def import_meals(
+    file: UploadFile = File(...),
+    format: ImportFormat = Query(default="ndjson"),
+    db: Session = Depends(get_db),
+    user: Principal = Depends(get_current_user),
+) -> MealImportOut:
+    # Pre-structured history (the export formats); no LLM involved. Caches are refreshed by the service.
+    return MealImportService(db).import_file(user.id, file.file, format)
+
+
 @router.get("", response_model=list[MealOut])
-def list_meals(
+async def list_meals(
+    response: Response,
     date: str | None = Query(default=None, description="YYYY-MM-DD"),
     limit: int = Query(default=50, ge=1, le=200),
     offset: int = Query(default=0, ge=0),
-    db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    cursor: str | None = Query(default=None, description="Opaque cursor from X-Next-Cursor; takes precedence over offset"),
+    service=Depends(get_meal_reader),
+    user: Principal = Depends(get_principal),
 ) -> list[MealOut]:
     parsed_date = datetime.date.fromisoformat(date) if date else None
-    meals = MealService(db).list(user.id, parsed_date, limit=limit, offset=offset)
+    meals, next_cursor = await service.list(user.id, parsed_date, limit=limit, offset=offset, cursor=cursor)
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
     return [_meal_out(m) for m in meals]
 
 
@@ -55,7 +116,7 @@ def patch(
     meal_id: uuid.UUID,
     payload: MealPatchRequest,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
 ) -> MealOut:
     service = MealService(db)
     meal = service.patch(
@@ -65,6 +126,7 @@ def patch(
         items=[it.model_dump() for it in payload.items] if payload.items else None,
     )
     cache_delete(day_summary_key(user.id, meal.meal_date))
+    bump_analytics_version(user.id)
     return _meal_out(meal)
 
 
@@ -72,11 +134,12 @@ def patch(
 def delete(
     meal_id: uuid.UUID,
     db: Session = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_user),
 ) -> dict[str, bool]:
     service = MealService(db)
     meal = service.get_owned(meal_id, user.id)
     meal_date = meal.meal_date
     service.delete(meal_id, user.id)
     cache_delete(day_summary_key(user.id, meal_date))
+    bump_analytics_version(user.id)
     return {"ok": True}
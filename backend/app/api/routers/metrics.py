@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import hmac
+from typing import Any
+
+from fastapi import APIRouter, Depends, Header
+
+from app.auth.principal import principal_cache_stats
+from app.core.config import settings
+from app.core.errors import ErrorCodes, http_error
+from app.core.password_pool import password_pool_metrics
+from app.db.session import db_pool_metrics
+from app.infra.redis.hybrid_rate_limit import hybrid_rate_limit_stats
+from app.services.openai.meal_parser import meal_parse_flight_stats
+from app.services.openai.parse_cache import parse_cache_stats
+
+router = APIRouter(tags=["metrics"])
+
+
+def require_metrics_token(authorization: str | None = Header(default=None)) -> None:
+    token = settings.metrics_token
+    if not token or token == "change_me":
+        raise http_error(401, ErrorCodes.METRICS_UNAUTHORIZED, "Metrics token not configured")
+
+    scheme, _, credentials = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(credentials.strip().encode(), token.encode()):
+        raise http_error(401, ErrorCodes.METRICS_UNAUTHORIZED, "Unauthorized")
+
+
+@router.get("/metrics", dependencies=[Depends(require_metrics_token)])
+def metrics() -> dict[str, Any]:
+    # Per worker process: every uvicorn worker has its own pools and counters.
+    return {
+        "db_pool": db_pool_metrics(),
+        "parse_cache": parse_cache_stats(),
+        "singleflight": meal_parse_flight_stats(),
+        "principal_cache": principal_cache_stats(),
+        "password_pool": password_pool_metrics(),
+        "rate_limit_hybrid": hybrid_rate_limit_stats(),
+    }
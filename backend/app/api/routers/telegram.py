@@ -3,12 +3,13 @@ from __future__ import annotations
 from fastapi import APIRouter, Depends, Header, Request
 from sqlalchemy.orm import Session
 
+from app.api.deps import get_telegram_webhook_service
 from app.auth.deps import get_current_user
 from app.core.config import settings
 from app.core.errors import http_error, ErrorCodes
 from app.db.session import get_db
 from app.schemas.telegram import LinkCodeResponse, TelegramStatusResponse
-from app.services.telegram.service import TelegramService
+from app.services.telegram.service import TelegramService, TelegramWebhookService
 
 router = APIRouter(prefix="/api/v1/telegram", tags=["telegram"])
 
@@ -30,7 +31,7 @@ def status(db: Session = Depends(get_db), user=Depends(get_current_user)):
 @router.post("/webhook")
 async def webhook(
     request: Request,
-    db: Session = Depends(get_db),
+    svc: TelegramWebhookService = Depends(get_telegram_webhook_service),
     telegram_secret_token: str | None = Header(default=None, alias="X-Telegram-Bot-Api-Secret-Token"),
 ):
     # Telegram sends the webhook secret in this header when you set `secret_token` in setWebhook:
@@ -42,6 +43,5 @@ async def webhook(
         raise http_error(401, ErrorCodes.TELEGRAM_WEBHOOK_UNAUTHORIZED, "Unauthorized")
 
     update = await request.json()
-    svc = TelegramService(db)
     await svc.handle_update(update)
     return {"ok": True}
@@ -3,15 +3,17 @@ from __future__ import annotations
 import uuid
 from typing import Any
 
-from fastapi import Depends
+from fastapi import Depends, Request
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jose import JWTError, jwt
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.auth.jwt import request_subject
+from app.auth.principal import Principal, principal_cache
 from app.core.config import settings
 from app.core.errors import ErrorCodes, http_error
-from app.db.session import get_db
-from app.repositories.user_repository import UserRepository
+from app.db.session import get_async_db, get_db
+from app.repositories.user_repository import AsyncUserRepository, UserRepository
 from typing import NoReturn
 
 bearer_scheme = HTTPBearer(auto_error=False)
@@ -20,10 +22,7 @@ bearer_scheme = HTTPBearer(auto_error=False)
 def _unauthorized() -> NoReturn:
     raise http_error(401, ErrorCodes.AUTH_UNAUTHORIZED, "Not authenticated")
 
-def get_current_user(
-    db: Session = Depends(get_db),
-    credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
-):
+def _user_id_from(request: Request, credentials: HTTPAuthorizationCredentials | None) -> uuid.UUID:
     # No header at all
     if credentials is None:
         _unauthorized()
@@ -32,25 +31,98 @@ def get_current_user(
     if credentials.scheme.lower() != "bearer":
         _unauthorized()
 
-    token = credentials.credentials
+    # Decoded once per request (shared with DB routing, which runs first via get_db).
+    subject = request_subject(request)
+    if subject is None:
+        _unauthorized()
+
     try:
-        payload = jwt.decode(
-            token,
-            settings.jwt_secret,
-            algorithms=[settings.jwt_algorithm],
-        )
+        return uuid.UUID(subject)
+    except ValueError:
+        _unauthorized()
 
-        subject = payload.get("sub")
-        if subject is None:
-            _unauthorized()
 
-        user_id = uuid.UUID(subject)
+def _cached_principal(user_id: uuid.UUID) -> Principal | None:
+    return principal_cache.get(user_id) if settings.principal_cache_enabled else None
 
-    except (JWTError, ValueError):
-        _unauthorized()
+
+def _remember(user) -> Principal:
+    principal = Principal.from_user(user)
+    if settings.principal_cache_enabled:
+        principal_cache.set(principal)
+    return principal
+
+
+async def _cached_principal_async(user_id: uuid.UUID) -> Principal | None:
+    return await principal_cache.get_async(user_id) if settings.principal_cache_enabled else None
+
+
+async def _remember_async(user) -> Principal:
+    principal = Principal.from_user(user)
+    if settings.principal_cache_enabled:
+        await principal_cache.set_async(principal)
+    return principal
+
+
+def get_current_user(
+    request: Request,
+    db: Session = Depends(get_db),
+    credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
+) -> Principal:
+    """
+    The caller's `Principal` (id + goals). Served from the principal cache when
+    possible: a hit costs no DB query (the request session stays unconnected).
+    """
+    user_id = _user_id_from(request, credentials)
+    principal = _cached_principal(user_id)
+    if principal is not None:
+        return principal
 
     user = UserRepository(db).get_by_id(user_id)
     if not user:
         _unauthorized()
 
+    return _remember(user)
+
+
+async def get_current_user_async(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
+) -> Principal:
+    # Same as get_current_user, for async handlers (shares their AsyncSession).
+    user_id = _user_id_from(request, credentials)
+    principal = await _cached_principal_async(user_id)
+    if principal is not None:
+        return principal
+
+    user = await AsyncUserRepository(db).get_by_id(user_id)
+    if not user:
+        _unauthorized()
+
+    return await _remember_async(user)
+
+
+def get_current_db_user(
+    request: Request,
+    db: Session = Depends(get_db),
+    credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
+):
+    # The full users row, uncached: for endpoints that need more than id + goals.
+    user = UserRepository(db).get_by_id(_user_id_from(request, credentials))
+    if not user:
+        _unauthorized()
+
+    return user
+
+
+async def get_current_db_user_async(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
+):
+    user = await AsyncUserRepository(db).get_by_id(_user_id_from(request, credentials))
+    if not user:
+        _unauthorized()
+
     return user
@@ -3,7 +3,8 @@ from __future__ import annotations
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
-from jose import jwt
+from jose import JWTError, jwt
+from starlette.requests import HTTPConnection
 
 from app.core.config import settings
 
@@ -30,3 +31,41 @@ def create_access_token(subject: str) -> str:
         settings.jwt_secret,
         algorithm=settings.jwt_algorithm,
     )
+
+
+def token_claims(token: str) -> tuple[str, float] | None:
+    """
+    (`sub`, `exp` as a Unix timestamp) of a valid token, or None; a token
+    without `exp` never expires. Never raises (for routing, not authentication).
+    """
+    try:
+        payload = jwt.decode(token, settings.jwt_secret, algorithms=[settings.jwt_algorithm])
+    except JWTError:
+        return None
+    subject = payload.get("sub")
+    if not isinstance(subject, str):
+        return None
+    exp = payload.get("exp")
+    return subject, float(exp) if isinstance(exp, (int, float)) else float("inf")
+
+
+def token_subject(token: str) -> str | None:
+    """
+    `sub` of a valid token, or None. Never raises (for routing, not authentication).
+    """
+    claims = token_claims(token)
+    return claims[0] if claims is not None else None
+
+
+def request_subject(conn: HTTPConnection) -> str | None:
+    """
+    `token_subject` of the request's bearer token, decoded once per request:
+    the result is kept in the ASGI scope's state, shared by every Request
+    object built over it (DB routing, auth dependencies).
+    """
+    state = conn.scope.setdefault("state", {})
+    if "token_subject" not in state:
+        scheme, _, token = conn.headers.get("authorization", "").partition(" ")
+        valid = scheme.lower() == "bearer" and token.strip()
+        state["token_subject"] = token_subject(token.strip()) if valid else None
+    return state["token_subject"]
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Optional
+
+from app.core.config import settings
+from app.infra.redis.cache import (
+    cache_add_str,
+    cache_add_str_async,
+    cache_get_str,
+    cache_get_str_async,
+    cache_set_str,
+    cache_set_str_async,
+)
+from app.infra.redis.keys import principal_key
+
+# L2 value written by `invalidate`: reads treat it as a miss, and it blocks
+# re-population (SET NX) until it expires.
+_TOMBSTONE = "-"
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    The authenticated user as request handlers see it: identity plus goals.
+    Endpoints that need the full row (email, created_at) load it explicitly.
+    """
+
+    id: uuid.UUID
+    goal_calories: int | None = None
+    goal_protein_g: Decimal | None = None
+
+    @classmethod
+    def from_user(cls, user: Any) -> "Principal":
+        return cls(id=user.id, goal_calories=user.goal_calories, goal_protein_g=user.goal_protein_g)
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "goal_calories": self.goal_calories,
+                "goal_protein_g": str(self.goal_protein_g) if self.goal_protein_g is not None else None,
+            }
+        )
+
+    @classmethod
+    def from_json(cls, user_id: uuid.UUID, value: str) -> "Principal":
+        data = json.loads(value)
+        protein = data["goal_protein_g"]
+        return cls(
+            id=user_id,
+            goal_calories=data["goal_calories"],
+            goal_protein_g=Decimal(protein) if protein is not None else None,
+        )
+
+
+@dataclass
+class PrincipalCacheStats:
+    local_hits: int = 0
+    redis_hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+        }
+
+
+class PrincipalCache:
+    """
+    Two-tier cache of `Principal`s by user id, so authenticated requests skip the
+    users lookup.
+
+    - L1: in-process LRU, short `local_ttl_seconds`: the staleness bound other
+      workers have after an invalidation
+    - L2: Redis (shared across workers), `ttl_seconds`; invalidated explicitly
+
+    L2 is only ever populated with SET NX, and `invalidate` replaces the entry
+    with a tombstone for `tombstone_seconds`. A request that read the users row
+    before an update committed therefore cannot write its stale copy back for
+    the full TTL; at worst it lands once the tombstone has expired.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int,
+        ttl_seconds: int,
+        local_ttl_seconds: float,
+        tombstone_seconds: int,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.local_ttl_seconds = local_ttl_seconds
+        self.tombstone_seconds = tombstone_seconds
+        self.stats = PrincipalCacheStats()
+        self._entries: OrderedDict[uuid.UUID, tuple[float, Principal]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _local_get(self, user_id: uuid.UUID) -> Optional[Principal]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, principal = entry
+            if expires_at <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return principal
+
+    def _local_set(self, principal: Principal) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[principal.id] = (time.monotonic() + self.local_ttl_seconds, principal)
+            self._entries.move_to_end(principal.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, user_id: uuid.UUID) -> Optional[Principal]:
+        principal = self._local_get(user_id)
+        if principal is not None:
+            self.stats.local_hits += 1
+            return principal
+
+        value = cache_get_str(principal_key(user_id))
+        if value is not None and value != _TOMBSTONE:
+            self.stats.redis_hits += 1
+            principal = Principal.from_json(user_id, value)
+            self._local_set(principal)
+            return principal
+
+        self.stats.misses += 1
+        return None
+
+    def set(self, principal: Principal) -> None:
+        self._local_set(principal)
+        cache_add_str(principal_key(principal.id), principal.to_json(), ttl_seconds=self.ttl_seconds)
+
+    async def get_async(self, user_id: uuid.UUID) -> Optional[Principal]:
+        # `get` for async dependencies: L2 through redis.asyncio.
+        principal = self._local_get(user_id)
+        if principal is not None:
+            self.stats.local_hits += 1
+            return principal
+
+        value = await cache_get_str_async(principal_key(user_id))
+        if value is not None and value != _TOMBSTONE:
+            self.stats.redis_hits += 1
+            principal = Principal.from_json(user_id, value)
+            self._local_set(principal)
+            return principal
+
+        self.stats.misses += 1
+        return None
+
+    async def set_async(self, principal: Principal) -> None:
+        self._local_set(principal)
+        await cache_add_str_async(principal_key(principal.id), principal.to_json(), ttl_seconds=self.ttl_seconds)
+
+    def _local_invalidate(self, user_id: uuid.UUID) -> None:
+        self.stats.invalidations += 1
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def invalidate(self, user_id: uuid.UUID) -> None:
+        self._local_invalidate(user_id)
+        cache_set_str(principal_key(user_id), _TOMBSTONE, ttl_seconds=self.tombstone_seconds)
+
+    async def invalidate_async(self, user_id: uuid.UUID) -> None:
+        self._local_invalidate(user_id)
+        await cache_set_str_async(principal_key(user_id), _TOMBSTONE, ttl_seconds=self.tombstone_seconds)
+
+    def clear_local(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+principal_cache = PrincipalCache(
+    max_entries=settings.principal_cache_local_max_entries,
+    ttl_seconds=settings.principal_cache_ttl_seconds,
+    local_ttl_seconds=settings.principal_cache_local_ttl_seconds,
+    tombstone_seconds=settings.principal_cache_tombstone_seconds,
+)
+
+
+def principal_cache_stats() -> dict[str, int]:
+    return principal_cache.stats.as_dict()
@@ -6,7 +6,8 @@ from sqlalchemy.orm import Session
 from app.auth.jwt import create_access_token
 from app.core.config import settings
 from app.core.errors import ErrorCodes, http_error
-from app.core.security import hash_password, verify_password
+from app.core.password_pool import get_password_pool
+from app.db.routing import mark_recent_write
 from app.db.session import get_db
 from app.repositories.user_repository import UserRepository
 from app.schemas.auth import LoginRequest, RegisterRequest, TokenResponse
@@ -31,10 +32,13 @@ def register(payload: RegisterRequest, db: Session = Depends(get_db)) -> UserOut
     if repo.get_by_email(payload.email):
         raise http_error(409, ErrorCodes.AUTH_EMAIL_ALREADY_EXISTS, "Email already exists")
 
-    user = repo.create(
-        email=payload.email,
-        hashed_password=hash_password(payload.password),
-    )
+    # Don't hold a pooled connection while waiting on bcrypt.
+    db.close()
+    hashed_password = get_password_pool().hash(payload.password)
+
+    user = repo.create(email=payload.email, hashed_password=hashed_password)
+    # Unauthenticated write: open the read-your-writes window explicitly (login / me follow).
+    mark_recent_write(user.id)
     return UserOut.model_validate(user)
 
 
@@ -43,7 +47,8 @@ def login(payload: LoginRequest, db: Session = Depends(get_db)) -> TokenResponse
     repo = UserRepository(db)
 
     user = repo.get_by_email(payload.email)
-    if not user or not verify_password(payload.password, user.hashed_password):
+    db.close()  # the row stays usable, detached; bcrypt runs without a connection
+    if not user or not get_password_pool().verify(payload.password, user.hashed_password):
         raise http_error(401, ErrorCodes.AUTH_INVALID_CREDENTIALS, "Invalid credentials")
 
     return _token_response(str(user.id))
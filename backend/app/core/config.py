@@ -16,13 +16,83 @@ class Settings(BaseSettings):
     db_port: int = 5435
 
     database_url: str
+    # Optional read replica for GET requests; unset = everything on database_url.
+    database_read_url: str | None = None
+    # After a user's own write, their reads stay on the primary this long (read-your-writes).
+    db_read_your_writes_seconds: int = 5
+    # Hot read endpoints run as `async def` over an AsyncSession (psycopg async driver).
+    # Set to false to keep every handler on the sync engine / threadpool.
+    db_async_enabled: bool = True
+
+    # Connection pool, per engine and per worker process (ignored for SQLite).
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout_seconds: float = 30.0
+    db_pool_recycle_seconds: int = 1800
+    # Server-side statement_timeout for every pooled connection; 0 disables it.
+    db_statement_timeout_ms: int = 0
 
     jwt_secret: str
     jwt_algorithm: str = "HS256"
     jwt_expires_minutes: int = 60
 
+    # Authenticated-principal cache (id + goals) in front of the users lookup.
+    # The local TTL bounds how long other workers serve goals after an update.
+    principal_cache_enabled: bool = True
+    principal_cache_ttl_seconds: int = 300
+    principal_cache_local_ttl_seconds: float = 5.0
+    principal_cache_local_max_entries: int = 10_000
+    # After an update, how long the Redis tier refuses to be re-populated.
+    principal_cache_tombstone_seconds: int = 10
+
+    # bcrypt runs in a dedicated process pool; beyond max_pending calls -> 503.
+    # 0 workers = hash inline on the request thread.
+    password_hash_workers: int = 2
+    password_hash_max_pending: int = 16
+
+    # Rate-limit rule table as JSON, inline or in a file (see RuleTableSpec);
+    # unset = the built-in rules. A file is re-read when it changes, checked at
+    # most every reload_seconds per worker.
+    rate_limit_rules: str | None = None
+    rate_limit_rules_file: str | None = None
+    rate_limit_rules_reload_seconds: float = 5.0
+
     openai_api_key: str | None = None
     openai_model: str = "gpt-4.1-mini"
+    openai_base_url: str | None = None
+
+    # Process-wide OpenAI HTTP pool (shared by the sync and async clients).
+    openai_max_connections: int = 20
+    openai_max_keepalive_connections: int = 10
+    openai_connect_timeout_seconds: float = 5.0
+    openai_timeout_seconds: float = 30.0
+    openai_max_retries: int = 2
+
+    # Parse cache in front of the LLM: in-process LRU + Redis.
+    meal_parse_cache_enabled: bool = True
+    meal_parse_cache_ttl_seconds: int = 7 * 24 * 3600
+    meal_parse_cache_local_max_entries: int = 1024
+
+    # Coalesce concurrent identical parses (in-process + across workers via Redis).
+    meal_parse_singleflight_enabled: bool = True
+    meal_parse_singleflight_lock_ttl_seconds: int = 30
+    meal_parse_singleflight_wait_seconds: float = 30.0
+
+    # Background meal-creation jobs (POST /api/v1/meals/jobs).
+    meal_jobs_concurrency: int = 4
+    meal_jobs_max_queue_depth: int = 100
+    meal_job_ttl_seconds: int = 3600
+    # Jobs run in the worker that accepted them. Each worker refreshes a liveness key
+    # in Redis this often; a queued/running job whose worker missed 3 refreshes
+    # (restarted, crashed) is reported as failed with MEAL_JOB_LOST when polled.
+    meal_job_heartbeat_seconds: int = 10
+
+    # Bulk history import (POST /api/v1/meals/import): meals per file.
+    meal_import_max_meals: int = 200_000
+
+    # Bearer token required by GET /metrics (scrapers send "Authorization: Bearer <token>").
+    # Unset: the endpoint answers 401 to everyone.
+    metrics_token: str | None = None
 
     telegram_bot_token: str | None = None
     telegram_webhook_secret: str | None = None
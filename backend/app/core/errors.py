@@ -10,13 +10,24 @@ def http_error(status_code: int, code: str, message: str) -> HTTPException:
 class ErrorCodes:
     AUTH_INVALID_CREDENTIALS = "AUTH_INVALID_CREDENTIALS"
     AUTH_EMAIL_ALREADY_EXISTS = "AUTH_EMAIL_ALREADY_EXISTS"
+    AUTH_BUSY = "AUTH_BUSY"
 
     MEAL_PARSE_FAILED = "MEAL_PARSE_FAILED"
+    MEAL_SAVE_FAILED = "MEAL_SAVE_FAILED"
     MEAL_NOT_FOUND = "MEAL_NOT_FOUND"
+    MEAL_CURSOR_INVALID = "MEAL_CURSOR_INVALID"
+    MEAL_JOB_NOT_FOUND = "MEAL_JOB_NOT_FOUND"
+    MEAL_JOBS_SATURATED = "MEAL_JOBS_SATURATED"
+    MEAL_JOB_LOST = "MEAL_JOB_LOST"
+    MEAL_IMPORT_INVALID = "MEAL_IMPORT_INVALID"
+    MEAL_IMPORT_TOO_LARGE = "MEAL_IMPORT_TOO_LARGE"
+
+    DAY_RANGE_INVALID = "DAY_RANGE_INVALID"
 
     TELEGRAM_NOT_LINKED = "TELEGRAM_NOT_LINKED"
     TELEGRAM_ALREADY_LINKED = "TELEGRAM_ALREADY_LINKED"
     TELEGRAM_LINK_CODE_INVALID = "TELEGRAM_LINK_CODE_INVALID"
     TELEGRAM_LINK_CODE_EXPIRED = "TELEGRAM_LINK_CODE_EXPIRED"
     TELEGRAM_WEBHOOK_UNAUTHORIZED = "TELEGRAM_WEBHOOK_UNAUTHORIZED"
-    AUTH_UNAUTHORIZED = "AUTH_UNAUTHORIZED"
\ No newline at end of file
+    AUTH_UNAUTHORIZED = "AUTH_UNAUTHORIZED"
+    METRICS_UNAUTHORIZED = "METRICS_UNAUTHORIZED"
\ No newline at end of file
@@ -2,9 +2,7 @@ from __future__ import annotations
 
 import logging
 import time
-from typing import Callable
-
-from fastapi import Request, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.config import settings
 
@@ -20,23 +18,38 @@ def configure_logging() -> None:
     )
 
 
-async def access_log_middleware(request: Request, call_next: Callable) -> Response:
+class AccessLogMiddleware:
     """
-    Simple access log middleware.
-    Logs method, path, status code and request duration.
+    Simple access log middleware (plain ASGI).
+    Logs method, path, status code and request duration, once the response
+    has been sent; the response itself passes through untouched.
     """
-    logger = logging.getLogger("access")
-
-    start_time = time.perf_counter()
-    response = await call_next(request)
-    duration_ms = (time.perf_counter() - start_time) * 1000
-
-    logger.info(
-        "%s %s -> %s (%.2fms)",
-        request.method,
-        request.url.path,
-        response.status_code,
-        duration_ms,
-    )
 
-    return response
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.logger = logging.getLogger("access")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = None
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start_time = time.perf_counter()
+        await self.app(scope, receive, send_with_status)
+        duration_ms = (time.perf_counter() - start_time) * 1000
+
+        self.logger.info(
+            "%s %s -> %s (%.2fms)",
+            scope["method"],
+            scope["path"],
+            status_code,
+            duration_ms,
+        )
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import base64
+import datetime
+import uuid
+
+
+def encode_cursor(created_at: datetime.datetime, row_id: uuid.UUID) -> str:
+    """
+    Opaque keyset cursor for (created_at, id) ordered listings.
+    """
+    raw = f"{created_at.isoformat()}|{row_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime.datetime, uuid.UUID]:
+    """
+    Inverse of `encode_cursor`. Raises ValueError on malformed input.
+    """
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        created_at, row_id = raw.split("|", 1)
+        return datetime.datetime.fromisoformat(created_at), uuid.UUID(row_id)
+    except (UnicodeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
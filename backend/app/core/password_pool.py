@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable
+
+from app.core.config import settings
+from app.core.errors import ErrorCodes, http_error
+from app.core.security import hash_password, run_timed, verify_password
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PasswordPoolStats:
+    completed: int = 0
+    rejected: int = 0
+    queue_wait_seconds_total: float = 0.0
+    queue_wait_seconds_max: float = 0.0
+    hash_seconds_total: float = 0.0
+    hash_seconds_max: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, queue_wait: float, hash_time: float) -> None:
+        with self._lock:
+            self.completed += 1
+            self.queue_wait_seconds_total += queue_wait
+            self.queue_wait_seconds_max = max(self.queue_wait_seconds_max, queue_wait)
+            self.hash_seconds_total += hash_time
+            self.hash_seconds_max = max(self.hash_seconds_max, hash_time)
+
+    def record_rejected(self) -> None:
+        with self._lock:
+            self.rejected += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        with self._lock:
+            n = self.completed
+            return {
+                "completed": n,
+                "rejected": self.rejected,
+                "queue_wait_ms_avg": round(self.queue_wait_seconds_total * 1000 / n, 3) if n else 0.0,
+                "queue_wait_ms_max": round(self.queue_wait_seconds_max * 1000, 3),
+                "hash_ms_avg": round(self.hash_seconds_total * 1000 / n, 3) if n else 0.0,
+                "hash_ms_max": round(self.hash_seconds_max * 1000, 3),
+            }
+
+
+class PasswordPool:
+    """
+    bcrypt off the request threadpool: hashes run in a dedicated process pool of
+    `workers` processes. At most `max_pending` calls may be queued or running;
+    beyond that callers get 503 at once instead of queueing behind a login storm.
+    `workers=0` hashes inline (still admission-controlled).
+
+    Callers block until their hash is done, so `max_pending` also caps how many
+    request threads a storm can tie up.
+    """
+
+    def __init__(self, *, workers: int, max_pending: int) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self.stats = PasswordPoolStats()
+        self._executor: Executor | None = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a process that already runs threads is unsafe.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _reset_executor(self, broken: Executor) -> None:
+        with self._lock:
+            if self._executor is broken:
+                self._executor = None
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.stats.record_rejected()
+                raise http_error(503, ErrorCodes.AUTH_BUSY, "Too many concurrent sign-ins, retry shortly")
+            self._pending += 1
+
+        submitted_at = time.time()
+        try:
+            if self.workers <= 0:
+                result, started_at, hash_time = run_timed(fn, *args)
+            else:
+                executor = self._get_executor()
+                try:
+                    result, started_at, hash_time = executor.submit(run_timed, fn, *args).result()
+                except BrokenProcessPool:
+                    logger.exception("Password pool broke; recreating it")
+                    self._reset_executor(executor)
+                    raise
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+        self.stats.record(max(started_at - submitted_at, 0.0), hash_time)
+        return result
+
+    def hash(self, password: str) -> str:
+        return self._run(hash_password, password)
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        return self._run(verify_password, password, hashed_password)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+            **self.stats.as_dict(),
+        }
+
+
+@lru_cache(maxsize=1)
+def get_password_pool() -> PasswordPool:
+    return PasswordPool(
+        workers=settings.password_hash_workers,
+        max_pending=settings.password_hash_max_pending,
+    )
+
+
+def password_pool_metrics() -> dict[str, Any]:
+    return get_password_pool().snapshot()
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import hashlib
+import time
+from typing import Any, Callable
 
 from passlib.context import CryptContext
 
@@ -35,3 +37,14 @@ def verify_password(password: str, hashed_password: str) -> bool:
     """
     normalized = _normalize_for_bcrypt(password)
     return _pwd_context.verify(normalized, hashed_password)
+
+
+def run_timed(fn: Callable[..., Any], *args: Any) -> tuple[Any, float, float]:
+    """
+    Call fn(*args) and report (result, wall-clock start, duration in seconds).
+    Runs inside password pool workers; the start time lets the parent measure queue wait.
+    """
+    started_at = time.time()
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, started_at, time.perf_counter() - start
@@ -8,3 +8,5 @@ from app.models.meal import Meal  # noqa: F401,E402
 from app.models.meal_item import MealItem  # noqa: F401,E402
 from app.models.telegram_link import TelegramLink  # noqa: F401,E402
 from app.models.telegram_link_code import TelegramLinkCode  # noqa: F401,E402
+from app.models.daily_total import DailyTotal  # noqa: F401,E402
+from app.models.meal_archive import MealArchive  # noqa: F401,E402
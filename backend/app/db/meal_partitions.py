@@ -0,0 +1,270 @@
+"""
+Lifecycle of the monthly `meals` partitions (see migration 0007_partition_meals).
+
+    python -m app.db.meal_partitions list
+    python -m app.db.meal_partitions ensure --ahead 3
+    python -m app.db.meal_partitions archive --before 2025-01 --dir /var/backups/meals [--dry-run]
+
+`ensure` creates the partitions for the current month and the next `--ahead`
+months (run it from cron well before month end), and splits any month that
+landed in meals_default out into its own partition.
+
+`archive` detaches every partition that ends on or before `--before`, writes
+its meals and their items to gzip'd CSV files (one pair per run, named by month
+and run timestamp), then drops it. daily_totals keeps the rollups of archived
+months, and each run is recorded as a row in meal_archives.
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import gzip
+import logging
+import os
+import re
+from dataclasses import dataclass
+
+import psycopg
+
+from app.core.config import settings
+from app.core.logging import configure_logging
+
+logger = logging.getLogger(__name__)
+
+PARENT = "meals"
+DEFAULT_PARTITION = "meals_default"
+_NAME_RE = re.compile(r"^meals_p(\d{4})_(\d{2})$")
+_BOUND_RE = re.compile(r"FROM \('([\d-]+)'\) TO \('([\d-]+)'\)")
+
+
+@dataclass(frozen=True)
+class Partition:
+    name: str
+    start: datetime.date
+    end: datetime.date  # exclusive
+
+
+def _next_month(d: datetime.date) -> datetime.date:
+    return (d.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+
+
+def partition_name(month: datetime.date) -> str:
+    return f"meals_p{month:%Y_%m}"
+
+
+def _connect() -> psycopg.Connection:
+    url = settings.database_url.replace("postgresql+psycopg", "postgresql")
+    # Autocommit: every `conn.transaction()` block below is its own real transaction.
+    return psycopg.connect(url, autocommit=True)
+
+
+def list_partitions(conn: psycopg.Connection) -> list[Partition]:
+    rows = conn.execute(
+        """
+        SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = %s::regclass
+        """,
+        (PARENT,),
+    ).fetchall()
+
+    partitions = []
+    for name, bound in rows:
+        match = _BOUND_RE.search(bound)
+        if match:  # the DEFAULT partition has no range
+            start, end = (datetime.date.fromisoformat(v) for v in match.groups())
+            partitions.append(Partition(name, start, end))
+    return sorted(partitions, key=lambda p: p.start)
+
+
+def _detached_leftovers(conn: psycopg.Connection) -> list[Partition]:
+    # Partitions detached by an archive run that stopped before dropping them.
+    attached = {p.name for p in list_partitions(conn)}
+    rows = conn.execute(
+        "SELECT relname FROM pg_class WHERE relkind = 'r' AND relname ~ '^meals_p[0-9]{4}_[0-9]{2}$'"
+    ).fetchall()
+
+    leftovers = []
+    for (name,) in rows:
+        if name in attached:
+            continue
+        year, month = _NAME_RE.match(name).groups()
+        start = datetime.date(int(year), int(month), 1)
+        leftovers.append(Partition(name, start, _next_month(start)))
+    return sorted(leftovers, key=lambda p: p.start)
+
+
+def create_partition(conn: psycopg.Connection, month: datetime.date) -> bool:
+    """
+    Create the partition for `month` unless it exists. Rows for that month already
+    sitting in meals_default are moved into it (Postgres refuses the CREATE otherwise).
+    """
+    name = partition_name(month)
+    start, end = month, _next_month(month)
+    if conn.execute("SELECT to_regclass(%s)", (name,)).fetchone()[0] is not None:
+        return False
+
+    with conn.transaction():
+        in_default = conn.execute(
+            f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE meal_date >= %s AND meal_date < %s)",
+            (start, end),
+        ).fetchone()[0]
+
+        if not in_default:
+            conn.execute(f"CREATE TABLE {name} PARTITION OF {PARENT} FOR VALUES FROM ('{start}') TO ('{end}')")
+        else:
+            # Park the month's rows, attach the new partition, then route them back in.
+            conn.execute(f"ALTER TABLE {PARENT} DETACH PARTITION {DEFAULT_PARTITION}")
+            conn.execute(f"CREATE TABLE {name} PARTITION OF {PARENT} FOR VALUES FROM ('{start}') TO ('{end}')")
+            moved = conn.execute(
+                f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE meal_date >= %s AND meal_date < %s RETURNING *) "
+                f"INSERT INTO {PARENT} SELECT * FROM moved",
+                (start, end),
+            ).rowcount
+            conn.execute(f"ALTER TABLE {PARENT} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT")
+            logger.info("moved %s rows from %s into %s", moved, DEFAULT_PARTITION, name)
+
+    logger.info("created partition %s [%s, %s)", name, start, end)
+    return True
+
+
+def ensure_partitions(conn: psycopg.Connection, *, ahead: int, today: datetime.date | None = None) -> int:
+    month = (today or datetime.date.today()).replace(day=1)
+    months = set()
+    for _ in range(ahead + 1):
+        months.add(month)
+        month = _next_month(month)
+
+    stray = conn.execute(
+        f"SELECT DISTINCT date_trunc('month', meal_date)::date FROM {DEFAULT_PARTITION}"
+    ).fetchall()
+    months.update(m for (m,) in stray)
+
+    return sum(create_partition(conn, m) for m in sorted(months))
+
+
+def _fsync_dir(directory: str) -> None:
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _export(conn: psycopg.Connection, query: str, path: str) -> None:
+    """
+    COPY `query` into a new gzip'd CSV at `path`, durably: the data and the
+    rename are fsync'd before returning, so a DROP committed afterwards never
+    outlives its archive. Refuses to overwrite an existing file.
+    """
+    if os.path.exists(path):
+        raise FileExistsError(f"archive file {path} already exists")
+    # Write to a temp name first: a file at `path` is always complete.
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="wb") as out:
+            with conn.cursor().copy(f"COPY ({query}) TO STDOUT WITH (FORMAT csv, HEADER)") as copy:
+                for chunk in copy:
+                    out.write(chunk)
+        raw.flush()
+        os.fsync(raw.fileno())
+    os.link(tmp_path, path)  # fails instead of replacing if `path` appeared meanwhile
+    os.unlink(tmp_path)
+    _fsync_dir(os.path.dirname(path) or ".")
+
+
+def archive_partition(conn: psycopg.Connection, partition: Partition, directory: str, *, attached: bool) -> None:
+    if attached:
+        # Short ACCESS EXCLUSIVE lock on meals; the export below runs on the standalone table.
+        with conn.transaction():
+            conn.execute(f"ALTER TABLE {PARENT} DETACH PARTITION {partition.name}")
+
+    # One set of files per run: a month can be archived again after a backdated
+    # import lands it in meals_default and `ensure` splits it back out.
+    run = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    suffix = f"{partition.start:%Y_%m}.{run}"
+    meals_file = os.path.join(directory, f"meals_{suffix}.csv.gz")
+    items_file = os.path.join(directory, f"meal_items_{suffix}.csv.gz")
+
+    with conn.transaction():
+        _export(conn, f"SELECT * FROM {partition.name} ORDER BY meal_date, created_at, id", meals_file)
+        _export(
+            conn,
+            f"SELECT mi.* FROM meal_items mi JOIN {partition.name} m ON m.id = mi.meal_id "
+            "ORDER BY mi.meal_id, mi.position",
+            items_file,
+        )
+        meals_rows = conn.execute(f"SELECT count(*) FROM {partition.name}").fetchone()[0]
+        items_rows = conn.execute(f"DELETE FROM meal_items mi USING {partition.name} m WHERE mi.meal_id = m.id").rowcount
+        conn.execute(f"DROP TABLE {partition.name}")
+        conn.execute(
+            """
+            INSERT INTO meal_archives (month, meals_rows, items_rows, meals_file, items_file)
+            VALUES (%s, %s, %s, %s, %s)
+            """,
+            (partition.start, meals_rows, items_rows, meals_file, items_file),
+        )
+
+    logger.info(
+        "archived %s: %s meals -> %s, %s items -> %s",
+        partition.name,
+        meals_rows,
+        meals_file,
+        items_rows,
+        items_file,
+    )
+
+
+def archive_before(conn: psycopg.Connection, *, before: datetime.date, directory: str, dry_run: bool = False) -> int:
+    leftovers = [p for p in _detached_leftovers(conn) if p.end <= before]
+    due = [p for p in list_partitions(conn) if p.end <= before]
+    if dry_run:
+        for p in leftovers + due:
+            logger.info("would archive %s [%s, %s)", p.name, p.start, p.end)
+        return len(leftovers) + len(due)
+
+    os.makedirs(directory, exist_ok=True)
+    for p in leftovers:
+        archive_partition(conn, p, directory, attached=False)
+    for p in due:
+        archive_partition(conn, p, directory, attached=True)
+    return len(leftovers) + len(due)
+
+
+def _month(value: str) -> datetime.date:
+    return datetime.datetime.strptime(value, "%Y-%m").date()
+
+
+def main() -> None:
+    configure_logging()
+    parser = argparse.ArgumentParser(description="Create and archive monthly meals partitions.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("list", help="show attached partitions")
+
+    ensure = sub.add_parser("ensure", help="create partitions for this month and the next N")
+    ensure.add_argument("--ahead", type=int, default=3)
+
+    archive = sub.add_parser("archive", help="detach, export and drop partitions ending on/before a month")
+    archive.add_argument("--before", type=_month, required=True, help="YYYY-MM (exclusive)")
+    archive.add_argument("--dir", required=True, help="directory for the .csv.gz files")
+    archive.add_argument("--dry-run", action="store_true")
+
+    args = parser.parse_args()
+
+    with _connect() as conn:
+        if args.command == "list":
+            for p in list_partitions(conn):
+                rows = conn.execute("SELECT count(*) FROM " + p.name).fetchone()[0]
+                print(f"{p.name}  [{p.start}, {p.end})  rows={rows}")
+        elif args.command == "ensure":
+            created = ensure_partitions(conn, ahead=args.ahead)
+            logger.info("ensure done: %s partitions created", created)
+        else:
+            archived = archive_before(conn, before=args.before, directory=args.dir, dry_run=args.dry_run)
+            logger.info("archive done: %s partitions%s", archived, " (dry run)" if args.dry_run else "")
+
+
+if __name__ == "__main__":
+    main()
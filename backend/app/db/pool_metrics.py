@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import Pool, QueuePool
+
+
+@dataclass
+class PoolStats:
+    checkouts: int = 0
+    checkins: int = 0
+    connects: int = 0
+    invalidations: int = 0
+    timeouts: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record_wait(self, seconds: float, *, timed_out: bool = False) -> None:
+        with self._lock:
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def incr(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def as_dict(self) -> dict[str, Any]:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "wait_ms_total": round(self.wait_seconds_total * 1000, 3),
+                "wait_ms_avg": round(self.wait_seconds_total * 1000 / attempts, 3) if attempts else 0.0,
+                "wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+            }
+
+
+def timed_pool_class(base: type[Pool], stats: PoolStats) -> type[Pool]:
+    """
+    Subclass of `base` that times every checkout, including the wait for a free
+    connection (there is no pool event for the start of a checkout).
+    Pool.recreate() (engine.dispose) keeps the class, so the stats survive it.
+    """
+
+    class TimedPool(base):  # type: ignore[misc, valid-type]
+        def _do_get(self):
+            start = time.perf_counter()
+            try:
+                conn = super()._do_get()
+            except PoolTimeoutError:
+                stats.record_wait(time.perf_counter() - start, timed_out=True)
+                raise
+            stats.record_wait(time.perf_counter() - start)
+            return conn
+
+    TimedPool.__name__ = TimedPool.__qualname__ = f"Timed{base.__name__}"
+    return TimedPool
+
+
+def instrument_engine(engine: Any, stats: PoolStats) -> None:
+    """
+    Count pool events on a sync Engine (pass `async_engine.sync_engine` for async ones).
+    """
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(*_args) -> None:
+        stats.incr("connects")
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(*_args) -> None:
+        stats.incr("checkouts")
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(*_args) -> None:
+        stats.incr("checkins")
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(*_args) -> None:
+        stats.incr("invalidations")
+
+    @event.listens_for(engine, "soft_invalidate")
+    def _on_soft_invalidate(*_args) -> None:
+        stats.incr("invalidations")
+
+
+def pool_snapshot(pool: Pool, stats: PoolStats) -> dict[str, Any]:
+    gauges: dict[str, Any] = {"class": type(pool).__name__}
+    # Gauges only exist on queue pools (not e.g. SQLite's SingletonThreadPool).
+    if isinstance(pool, QueuePool):
+        gauges.update(
+            {
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "in_use": pool.checkedout(),
+                # QueuePool counts overflow from -size; report connections beyond pool_size.
+                "overflow": max(0, pool.overflow()),
+                "timeout_seconds": pool.timeout(),
+            }
+        )
+    return {**gauges, **stats.as_dict()}
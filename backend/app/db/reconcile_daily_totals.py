@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import argparse
+import datetime
+import logging
+import uuid
+from decimal import Decimal
+
+import redis
+from sqlalchemy import and_, delete, func, insert, or_, select, true
+
+from app.core.logging import configure_logging
+import app.db.base  # noqa: F401  (registers every model for relationship resolution)
+from app.db.session import SessionLocal
+from app.infra.redis.cache import cache_delete_many
+from app.infra.redis.keys import day_summary_key
+from app.models.daily_total import DailyTotal
+from app.models.meal_archive import MealArchive
+from app.models.meal import Meal
+from app.repositories.daily_totals_repository import DailyTotalsRepository
+from app.services.analytics.analytics_service import bump_analytics_version
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+
+Totals = tuple[int, int, Decimal]
+
+
+def _live_dates(db):
+    """
+    Condition excluding months archived by app.db.meal_partitions: their meals are
+    gone on purpose, but daily_totals keeps the rollups.
+    """
+    conditions = []
+    for month in db.scalars(select(MealArchive.month)):
+        next_month = (month.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+        conditions.append(or_(DailyTotal.date < month, DailyTotal.date >= next_month))
+    return and_(*conditions) if conditions else true()
+
+
+def _expected(db, user_ids: list[uuid.UUID]) -> dict[tuple[uuid.UUID, object], Totals]:
+    rows = db.execute(
+        select(
+            Meal.user_id,
+            Meal.meal_date,
+            func.count(Meal.id),
+            func.sum(Meal.total_calories),
+            func.sum(Meal.total_protein_g),
+        )
+        .where(Meal.user_id.in_(user_ids))
+        .group_by(Meal.user_id, Meal.meal_date)
+    ).all()
+    return {(r[0], r[1]): (int(r[2]), int(r[3]), Decimal(r[4])) for r in rows}
+
+
+def _actual(db, user_ids: list[uuid.UUID], live) -> dict[tuple[uuid.UUID, object], Totals]:
+    rows = db.execute(
+        select(DailyTotal.user_id, DailyTotal.date, DailyTotal.meals_count, DailyTotal.calories, DailyTotal.protein_g)
+        .where(DailyTotal.user_id.in_(user_ids), live)
+    ).all()
+    # Zeroed rows (every meal of the day deleted) are equivalent to no row.
+    return {(r[0], r[1]): (int(r[2]), int(r[3]), Decimal(r[4])) for r in rows if r[2] != 0}
+
+
+def _refresh_caches(fixed: list[tuple[uuid.UUID, object]]) -> None:
+    # Cached day summaries / analytics still hold the drifted values.
+    if not fixed:
+        return
+    try:
+        cache_delete_many([day_summary_key(user_id, date) for user_id, date in fixed])
+        for user_id in {user_id for user_id, _ in fixed}:
+            bump_analytics_version(user_id)
+    except redis.RedisError:
+        logger.exception("daily_totals reconcile: could not drop cached summaries of %s rows", len(fixed))
+
+
+def reconcile(*, batch_size: int = DEFAULT_BATCH_SIZE, fix: bool = True) -> int:
+    """
+    Rebuild daily_totals from meals, one batch of users at a time.
+    Logs every drifting (user, date) and returns how many were found.
+    With fix=False only reports. Archived months are left untouched.
+
+    When fixing, each batch holds its users' rollup locks (see
+    DailyTotalsRepository.lock_for_rebuild) from reading meals to committing
+    the new rows, so a concurrent meal write lands either before the read or
+    after the rewrite, never in between.
+    """
+    drift = 0
+    last_user_id: uuid.UUID | None = None
+
+    while True:
+        db = SessionLocal()
+        try:
+            q = select(Meal.user_id).distinct().order_by(Meal.user_id).limit(batch_size)
+            if last_user_id is not None:
+                q = q.where(Meal.user_id > last_user_id)
+            user_ids = list(db.scalars(q))
+            if not user_ids:
+                break
+            last_user_id = user_ids[-1]
+
+            if fix:
+                DailyTotalsRepository(db).lock_for_rebuild(user_ids)
+            live = _live_dates(db)
+            expected = _expected(db, user_ids)
+            actual = _actual(db, user_ids, live)
+            drifting = []
+            for key in sorted(expected.keys() | actual.keys(), key=lambda k: (str(k[0]), k[1])):
+                if expected.get(key) != actual.get(key):
+                    drifting.append(key)
+                    logger.warning(
+                        "daily_totals drift user=%s date=%s expected=%s actual=%s",
+                        key[0],
+                        key[1],
+                        expected.get(key),
+                        actual.get(key),
+                    )
+            drift += len(drifting)
+
+            if fix:
+                db.execute(delete(DailyTotal).where(DailyTotal.user_id.in_(user_ids), live))
+                if expected:
+                    db.execute(
+                        insert(DailyTotal),
+                        [
+                            {
+                                "user_id": user_id,
+                                "date": date,
+                                "meals_count": count,
+                                "calories": calories,
+                                "protein_g": protein,
+                            }
+                            for (user_id, date), (count, calories, protein) in expected.items()
+                        ],
+                    )
+                db.commit()
+                _refresh_caches(drifting)
+        finally:
+            db.close()
+
+    # Rows for users with no meals left at all.
+    db = SessionLocal()
+    try:
+        orphan_filter = (
+            DailyTotal.meals_count != 0,
+            ~DailyTotal.user_id.in_(select(Meal.user_id).distinct()),
+            _live_dates(db),
+        )
+        orphans = list(db.execute(select(DailyTotal.user_id, DailyTotal.date).where(*orphan_filter)).all())
+        if orphans:
+            drift += len(orphans)
+            logger.warning("daily_totals drift: %s rows for users without meals", len(orphans))
+            if fix:
+                orphan_users = list({user_id for user_id, _ in orphans})
+                DailyTotalsRepository(db).lock_for_rebuild(orphan_users)
+                db.execute(delete(DailyTotal).where(DailyTotal.user_id.in_(orphan_users), *orphan_filter))
+                db.commit()
+                _refresh_caches([(user_id, date) for user_id, date in orphans])
+    finally:
+        db.close()
+
+    logger.info("daily_totals reconcile done: %s drifting rows%s", drift, " (fixed)" if fix and drift else "")
+    return drift
+
+
+def main() -> None:
+    configure_logging()
+    parser = argparse.ArgumentParser(description="Rebuild daily_totals from meals and report drift.")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="users per batch")
+    parser.add_argument("--check", action="store_true", help="report drift only, do not rewrite rows")
+    args = parser.parse_args()
+
+    drift = reconcile(batch_size=args.batch_size, fix=not args.check)
+    if args.check and drift:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any
+
+from starlette.requests import HTTPConnection
+
+from app.auth.jwt import request_subject
+from app.core.config import settings
+from app.infra.redis.cache import cache_get_str, cache_get_str_async, cache_set_str, cache_set_str_async
+from app.infra.redis.client import get_redis_client
+from app.infra.redis.keys import recent_write_key
+
+READ_METHODS = frozenset({"GET", "HEAD"})
+
+# Fallback when Redis is disabled: only covers writes seen by this worker process.
+_local_writes: dict[str, float] = {}
+_local_lock = threading.Lock()
+
+
+def _window_seconds() -> int:
+    # 0 when there is no replica to route to, or the window is disabled.
+    return settings.db_read_your_writes_seconds if settings.database_read_url else 0
+
+
+def _mark_local(user_id: Any, ttl: int) -> None:
+    with _local_lock:
+        _local_writes[str(user_id)] = time.monotonic() + ttl
+
+
+def _wrote_recently_local(user_id: str) -> bool:
+    with _local_lock:
+        expires_at = _local_writes.get(user_id)
+        if expires_at is not None and expires_at <= time.monotonic():
+            del _local_writes[user_id]
+            expires_at = None
+    return expires_at is not None
+
+
+def mark_recent_write(user_id: Any) -> None:
+    """
+    Pin the user's reads to the primary for `db_read_your_writes_seconds`.
+    Called automatically after authenticated write requests; call it explicitly
+    from writers outside a request (background jobs, Telegram).
+    """
+    ttl = _window_seconds()
+    if ttl <= 0:
+        return
+    if get_redis_client() is None:
+        _mark_local(user_id, ttl)
+        return
+    cache_set_str(recent_write_key(user_id), "1", ttl_seconds=ttl)
+
+
+async def mark_recent_write_async(user_id: Any) -> None:
+    # Same as mark_recent_write, for code on the event loop (redis.asyncio).
+    ttl = _window_seconds()
+    if ttl <= 0:
+        return
+    if get_redis_client() is None:
+        _mark_local(user_id, ttl)
+        return
+    await cache_set_str_async(recent_write_key(user_id), "1", ttl_seconds=ttl)
+
+
+def _wrote_recently(user_id: str) -> bool:
+    if get_redis_client() is None:
+        return _wrote_recently_local(user_id)
+    return cache_get_str(recent_write_key(user_id)) is not None
+
+
+async def _wrote_recently_async(user_id: str) -> bool:
+    if get_redis_client() is None:
+        return _wrote_recently_local(user_id)
+    return await cache_get_str_async(recent_write_key(user_id)) is not None
+
+
+def use_replica(request: HTTPConnection) -> bool:
+    """
+    Reads go to the replica, unless the caller wrote within the read-your-writes window.
+    """
+    if request.scope.get("method") not in READ_METHODS:
+        return False
+    user_id = request_subject(request)
+    return user_id is None or not _wrote_recently(user_id)
+
+
+async def use_replica_async(request: HTTPConnection) -> bool:
+    if request.scope.get("method") not in READ_METHODS:
+        return False
+    user_id = request_subject(request)
+    return user_id is None or not await _wrote_recently_async(user_id)
+
+
+def after_request(request: HTTPConnection) -> None:
+    # Open the read-your-writes window once an authenticated write has finished.
+    if request.scope.get("method") in READ_METHODS:
+        return
+    user_id = request_subject(request)
+    if user_id is not None:
+        mark_recent_write(user_id)
+
+
+async def after_request_async(request: HTTPConnection) -> None:
+    if request.scope.get("method") in READ_METHODS:
+        return
+    user_id = request_subject(request)
+    if user_id is not None:
+        await mark_recent_write_async(user_id)
@@ -1,17 +1,62 @@
 from __future__ import annotations
 
-from typing import Generator
+from typing import Any, AsyncGenerator, Generator
 
-from sqlalchemy import create_engine
+from fastapi import Request
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
 
 from app.core.config import settings
+from app.db import routing
+from app.db.pool_metrics import PoolStats, instrument_engine, pool_snapshot, timed_pool_class
 
-engine = create_engine(
-    settings.database_url,
-    future=True,
-    pool_pre_ping=True,  # avoids stale connections
-)
+
+def _engine_options(url: str, pool_base: type[Pool], stats: PoolStats) -> dict[str, Any]:
+    # SQLite (local benchmarks) keeps SQLAlchemy's default pool.
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+
+    options: dict[str, Any] = {
+        "poolclass": timed_pool_class(pool_base, stats),
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+    }
+    if settings.db_statement_timeout_ms > 0:
+        options["connect_args"] = {"options": f"-c statement_timeout={settings.db_statement_timeout_ms}"}
+    return options
+
+
+def _make_engine(url: str, stats: PoolStats) -> Engine:
+    eng = create_engine(
+        url,
+        future=True,
+        pool_pre_ping=True,  # avoids stale connections
+        **_engine_options(url, QueuePool, stats),
+    )
+    instrument_engine(eng, stats)
+    return eng
+
+
+def _make_async_engine(url: str, stats: PoolStats) -> AsyncEngine:
+    # Same URL: postgresql+psycopg resolves to psycopg's async driver under create_async_engine.
+    eng = create_async_engine(url, pool_pre_ping=True, **_engine_options(url, AsyncAdaptedQueuePool, stats))
+    instrument_engine(eng.sync_engine, stats)
+    return eng
+
+
+pool_stats = PoolStats()
+async_pool_stats = PoolStats()
+read_pool_stats = PoolStats()
+async_read_pool_stats = PoolStats()
+
+engine = _make_engine(settings.database_url, pool_stats)
+# Without a replica, reads share the primary engine.
+read_engine = _make_engine(settings.database_read_url, read_pool_stats) if settings.database_read_url else engine
 
 SessionLocal = sessionmaker(
     bind=engine,
@@ -19,11 +64,78 @@ SessionLocal = sessionmaker(
     autocommit=False,
     future=True,
 )
+ReadSessionLocal = sessionmaker(bind=read_engine, autoflush=False, autocommit=False, future=True)
+
+async_engine: AsyncEngine | None = None
+async_read_engine: AsyncEngine | None = None
+if settings.db_async_enabled:
+    async_engine = _make_async_engine(settings.database_url, async_pool_stats)
+    async_read_engine = (
+        _make_async_engine(settings.database_read_url, async_read_pool_stats)
+        if settings.database_read_url
+        else async_engine
+    )
 
+# Handlers serialize ORM rows after commit; don't expire them (no implicit IO on access).
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+AsyncReadSessionLocal = async_sessionmaker(bind=async_read_engine, autoflush=False, expire_on_commit=False)
 
-def get_db() -> Generator[Session, None, None]:
-    db = SessionLocal()
+
+def get_db(request: Request) -> Generator[Session, None, None]:
+    """
+    Request session, routed: GET/HEAD go to the read replica (when configured)
+    unless the caller is inside their read-your-writes window; everything else
+    goes to the primary.
+    """
+    if read_engine is engine:
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+        return
+
+    db = ReadSessionLocal() if routing.use_replica(request) else SessionLocal()
     try:
         yield db
     finally:
         db.close()
+        routing.after_request(request)
+
+
+def open_request_session(request: Request) -> Session:
+    """
+    A session routed like `get_db`, owned by the caller. For work that outlives
+    the request dependencies (streamed response bodies); close it when done.
+    """
+    if read_engine is not engine and routing.use_replica(request):
+        return ReadSessionLocal()
+    return SessionLocal()
+
+
+async def get_async_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    if async_read_engine is async_engine:
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+
+    factory = AsyncReadSessionLocal if await routing.use_replica_async(request) else AsyncSessionLocal
+    try:
+        async with factory() as db:
+            yield db
+    finally:
+        await routing.after_request_async(request)
+
+
+def db_pool_metrics() -> dict[str, Any]:
+    """
+    Live gauges and counters of this worker's pools (sync, and async when enabled).
+    """
+    metrics = {"sync": pool_snapshot(engine.pool, pool_stats)}
+    if read_engine is not engine:
+        metrics["sync_read"] = pool_snapshot(read_engine.pool, read_pool_stats)
+    if async_engine is not None:
+        metrics["async"] = pool_snapshot(async_engine.pool, async_pool_stats)
+        if async_read_engine is not async_engine:
+            metrics["async_read"] = pool_snapshot(async_read_engine.pool, async_read_pool_stats)
+    return metrics
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from typing import Optional
-from app.infra.redis.client import get_redis_client
+from app.infra.redis.client import get_async_redis_client, get_redis_client
 
 def cache_get_str(key: str) -> Optional[str]:
     r = get_redis_client()
@@ -8,14 +8,78 @@ def cache_get_str(key: str) -> Optional[str]:
         return None
     return r.get(key)
 
+def cache_mget_str(keys: list[str]) -> list[Optional[str]]:
+    r = get_redis_client()
+    if r is None or not keys:
+        return [None] * len(keys)
+    return r.mget(keys)
+
 def cache_set_str(key: str, value: str, ttl_seconds: int) -> None:
     r = get_redis_client()
     if r is None:
         return
     r.setex(key, ttl_seconds, value)
 
+def cache_add_str(key: str, value: str, ttl_seconds: int) -> bool:
+    # SET NX: only if the key is absent. True if it was written.
+    r = get_redis_client()
+    if r is None:
+        return False
+    return bool(r.set(key, value, ex=ttl_seconds, nx=True))
+
 def cache_delete(key: str) -> None:
     r = get_redis_client()
     if r is None:
         return
     r.delete(key)
+
+def cache_delete_many(keys: list[str]) -> None:
+    r = get_redis_client()
+    if r is None or not keys:
+        return
+    r.delete(*keys)
+
+def cache_incr(key: str) -> Optional[int]:
+    r = get_redis_client()
+    if r is None:
+        return None
+    return r.incr(key)
+
+
+# Event-loop variants (redis.asyncio): same keys and semantics as above.
+
+async def cache_get_str_async(key: str) -> Optional[str]:
+    r = get_async_redis_client()
+    if r is None:
+        return None
+    return await r.get(key)
+
+async def cache_mget_str_async(keys: list[str]) -> list[Optional[str]]:
+    r = get_async_redis_client()
+    if r is None or not keys:
+        return [None] * len(keys)
+    return await r.mget(keys)
+
+async def cache_set_str_async(key: str, value: str, ttl_seconds: int) -> None:
+    r = get_async_redis_client()
+    if r is None:
+        return
+    await r.setex(key, ttl_seconds, value)
+
+async def cache_add_str_async(key: str, value: str, ttl_seconds: int) -> bool:
+    r = get_async_redis_client()
+    if r is None:
+        return False
+    return bool(await r.set(key, value, ex=ttl_seconds, nx=True))
+
+async def cache_delete_async(key: str) -> None:
+    r = get_async_redis_client()
+    if r is None:
+        return
+    await r.delete(key)
+
+async def cache_incr_async(key: str) -> Optional[int]:
+    r = get_async_redis_client()
+    if r is None:
+        return None
+    return await r.incr(key)
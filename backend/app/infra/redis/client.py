@@ -1,13 +1,20 @@
+import asyncio
 import os
+import weakref
 from functools import lru_cache
 from typing import Optional
 
 import redis
+import redis.asyncio as aioredis
+
+
+def _redis_enabled() -> bool:
+    return os.getenv("REDIS_ENABLED", "true").lower() == "true"
 
 
 @lru_cache(maxsize=1)
 def get_redis_client() -> Optional[redis.Redis]:
-    enabled = os.getenv("REDIS_ENABLED", "true").lower() == "true"
+    enabled = _redis_enabled()
     if not enabled:
         return None
 
@@ -21,3 +28,42 @@ def get_redis_client() -> Optional[redis.Redis]:
         db=db,
         decode_responses=True,
     )
+
+
+# asyncio connections are bound to the loop that opened them, so each event
+# loop (one per uvicorn worker; one per TestClient portal) gets its own pool.
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aioredis.Redis]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_async_redis_client() -> Optional[aioredis.Redis]:
+    """
+    redis.asyncio client for code running on the event loop (rate limiter,
+    async cache paths): no worker-thread hop per command.
+
+    The pool is bounded (REDIS_ASYNC_MAX_CONNECTIONS); when it is exhausted
+    callers wait up to REDIS_ASYNC_POOL_TIMEOUT seconds for a free connection
+    instead of opening more.
+    """
+    if not _redis_enabled():
+        return None
+
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        pool = aioredis.BlockingConnectionPool(
+            host=os.getenv("REDIS_HOST", "localhost"),
+            port=int(os.getenv("REDIS_PORT", "6379")),
+            db=int(os.getenv("REDIS_DB", "0")),
+            max_connections=int(os.getenv("REDIS_ASYNC_MAX_CONNECTIONS", "50")),
+            timeout=float(os.getenv("REDIS_ASYNC_POOL_TIMEOUT", "2.0")),
+            socket_timeout=float(os.getenv("REDIS_SOCKET_TIMEOUT", "1.0")),
+            socket_connect_timeout=float(os.getenv("REDIS_SOCKET_TIMEOUT", "1.0")),
+            socket_keepalive=True,
+            health_check_interval=30,
+            decode_responses=True,
+        )
+        client = aioredis.Redis(connection_pool=pool)
+        _async_clients[loop] = client
+    return client
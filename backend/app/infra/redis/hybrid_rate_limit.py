@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+import redis.asyncio as aioredis
+from redis.commands.core import AsyncScript
+
+from app.infra.redis.client import get_async_redis_client
+from app.infra.redis.rate_limit import RateLimitResult, RateLimitRule
+
+
+LUA_TOKEN_BUCKET_LEASE = r"""
+-- Sync of a worker-local lease with the shared bucket.
+-- KEYS[1] = key
+-- ARGV[1] = now (float seconds)
+-- ARGV[2] = capacity (float)
+-- ARGV[3] = refill_per_sec (float)
+-- ARGV[4] = expire_seconds (int)
+-- ARGV[5] = used: requests the worker admitted locally since its last sync,
+--           minus tokens it refunded (may be negative: a credit)
+-- ARGV[6] = lease: max requests the worker may admit locally until its next sync
+
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local refill_per_sec = tonumber(ARGV[3])
+local expire_seconds = tonumber(ARGV[4])
+local used = tonumber(ARGV[5])
+local lease = tonumber(ARGV[6])
+
+local data = redis.call("HMGET", key, "tokens", "ts")
+local tokens = tonumber(data[1])
+local ts = tonumber(data[2])
+
+if tokens == nil then
+  tokens = capacity
+end
+if ts == nil then
+  ts = now
+end
+
+local delta = now - ts
+if delta < 0 then
+  delta = 0
+end
+
+tokens = math.min(capacity, tokens + (delta * refill_per_sec))
+
+-- charge what was admitted locally; may go negative (overshoot is repaid by refill)
+tokens = math.min(capacity, tokens - used)
+
+-- the request that triggered the sync, then the next lease (not debited until used)
+local allowed = 0
+local grant = 0
+if tokens >= 1 then
+  allowed = 1
+  tokens = tokens - 1
+  grant = math.max(0, math.min(lease, math.floor(tokens)))
+end
+
+redis.call("HMSET", key, "tokens", tokens, "ts", now)
+redis.call("EXPIRE", key, expire_seconds)
+
+local reset_after = 0
+if tokens < 1 then
+  reset_after = math.ceil((1 - tokens) / refill_per_sec)
+end
+
+return {allowed, grant, tokens, reset_after}
+"""
+
+
+@dataclass
+class _Lease:
+    allowance: int = 0
+    used: int = 0
+    expires_at: float = 0.0
+    # Shared-bucket tokens left at the last sync (for X-RateLimit-Remaining).
+    remaining: int = 0
+    # Refunds of tokens Redis was already charged for, returned at the next sync.
+    credit: int = 0
+
+
+@dataclass
+class HybridRateLimitStats:
+    local_allowed: int = 0
+    syncs: int = 0
+    denied: int = 0
+    refunds: int = 0
+    evicted_unsynced: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "local_allowed": self.local_allowed,
+            "syncs": self.syncs,
+            "denied": self.denied,
+            "refunds": self.refunds,
+            "evicted_unsynced": self.evicted_unsynced,
+        }
+
+
+class HybridTokenBucketLimiter:
+    """
+    Token bucket with a per-worker local tier in front of the Redis bucket.
+
+    On a sync the worker reports how many requests it admitted locally, Redis
+    charges them and grants a lease of up to `lease_size` further requests.
+    Those are admitted from process memory, with no Redis call, until the lease
+    runs out or expires. A lease stays valid for as long as refill would take
+    to restore the tokens the bucket held at the sync (and at least
+    `sync_seconds`), so a client sending one request every few seconds still
+    syncs about once per lease, not per request. Denials always come from Redis.
+
+    Leases are not debited up front, so each worker may admit up to
+    `lease_size` requests per client that the shared bucket has not confirmed:
+    the overshoot is bounded by workers x lease_size and repaid by refill.
+    `lease_size=0` syncs on every request (exact, same as the Redis limiter).
+
+    Runs on the event loop only (no locking).
+    """
+
+    def __init__(self, *, lease_size: int, sync_seconds: float, max_keys: int) -> None:
+        self.lease_size = lease_size
+        self.sync_seconds = sync_seconds
+        self.max_keys = max_keys
+        self.stats = HybridRateLimitStats()
+        self._leases: OrderedDict[str, _Lease] = OrderedDict()
+        self._script: Optional[AsyncScript] = None
+
+    def _get_script(self, r: aioredis.Redis) -> AsyncScript:
+        if self._script is None:
+            self._script = r.register_script(LUA_TOKEN_BUCKET_LEASE)
+        return self._script
+
+    def _lease(self, key: str) -> _Lease:
+        lease = self._leases.get(key)
+        if lease is None:
+            lease = self._leases[key] = _Lease()
+            while len(self._leases) > self.max_keys:
+                _, evicted = self._leases.popitem(last=False)
+                # Locally admitted requests that Redis will never be charged for.
+                self.stats.evicted_unsynced += evicted.used
+        else:
+            self._leases.move_to_end(key)
+        return lease
+
+    async def allow_async(self, key: str, rule: RateLimitRule) -> Optional[RateLimitResult]:
+        r = get_async_redis_client()
+        if r is None:
+            return None
+
+        lease = self._lease(key)
+        now = time.monotonic()
+        if lease.allowance >= 1 and now < lease.expires_at:
+            lease.allowance -= 1
+            lease.used += 1
+            self.stats.local_allowed += 1
+            return RateLimitResult(
+                allowed=True,
+                remaining=max(0, lease.remaining - lease.used),
+                reset_after_seconds=0,
+                limit=int(rule.capacity),
+            )
+
+        # Hand the local count to this sync before awaiting, so concurrent
+        # requests for the same key cannot report it twice.
+        used = lease.used - lease.credit
+        lease.used, lease.allowance, lease.credit = 0, 0, 0
+        expire_seconds = int(os.getenv("RL_KEY_EXPIRE_SECONDS", "600"))
+        script = self._get_script(r)
+        allowed, grant, tokens_left, reset_after = await script(
+            keys=[key],
+            args=[time.time(), rule.capacity, rule.refill_per_sec, expire_seconds, used, self.lease_size],
+            client=r,
+        )
+        self.stats.syncs += 1
+
+        remaining = int(tokens_left) if tokens_left is not None else 0
+        valid_for = self.sync_seconds
+        if rule.refill_per_sec > 0:
+            valid_for = max(valid_for, remaining / rule.refill_per_sec)
+
+        lease.allowance = int(grant)
+        lease.expires_at = time.monotonic() + valid_for
+        lease.remaining = remaining
+        if int(allowed) != 1:
+            self.stats.denied += 1
+
+        return RateLimitResult(
+            allowed=(int(allowed) == 1),
+            remaining=max(0, remaining),
+            reset_after_seconds=int(reset_after) if reset_after is not None else 0,
+            limit=int(rule.capacity),
+        )
+
+    def refund(self, key: str) -> None:
+        # Give back a token admitted for a request that was then rejected
+        # (e.g. by a stricter route rule). While unreported local admissions
+        # remain, un-count one of them (Redis is never charged for it);
+        # otherwise the token was charged by a sync, so credit it at the next one.
+        # Either way used + allowance stays within the lease.
+        lease = self._leases.get(key)
+        if lease is None:
+            return
+        if lease.used > 0:
+            lease.used -= 1
+            lease.allowance += 1
+        else:
+            lease.credit += 1
+        self.stats.refunds += 1
+
+
+def hybrid_enabled() -> bool:
+    return os.getenv("RL_HYBRID_ENABLED", "false").lower() == "true"
+
+
+hybrid_limiter = HybridTokenBucketLimiter(
+    lease_size=int(os.getenv("RL_HYBRID_LEASE_SIZE", "20")),
+    sync_seconds=float(os.getenv("RL_HYBRID_SYNC_SECONDS", "5.0")),
+    max_keys=int(os.getenv("RL_HYBRID_MAX_KEYS", "10000")),
+)
+
+
+def hybrid_rate_limit_stats() -> dict[str, int]:
+    return hybrid_limiter.stats.as_dict()
@@ -3,3 +3,39 @@ from typing import Any
 
 def day_summary_key(user_id: Any, date: datetime.date) -> str:
     return f"day_summary:v1:{user_id}:{date.isoformat()}"
+
+
+def meal_parse_key(digest: str) -> str:
+    return f"meal_parse:v1:{digest}"
+
+
+def singleflight_lock_key(name: str, key: str) -> str:
+    return f"sf:lock:{name}:{key}"
+
+
+def singleflight_result_key(name: str, key: str) -> str:
+    return f"sf:result:{name}:{key}"
+
+
+def meal_job_key(job_id: Any) -> str:
+    return f"meal_job:v1:{job_id}"
+
+
+def meal_job_worker_key(worker_id: str) -> str:
+    return f"meal_job_worker:v1:{worker_id}"
+
+
+def analytics_version_key(user_id: Any) -> str:
+    return f"analytics_version:v1:{user_id}"
+
+
+def analytics_summary_key(user_id: Any, version: str, fingerprint: str) -> str:
+    return f"analytics_summary:v1:{user_id}:{version}:{fingerprint}"
+
+
+def principal_key(user_id: Any) -> str:
+    return f"principal:v1:{user_id}"
+
+
+def recent_write_key(user_id: Any) -> str:
+    return f"recent_write:v1:{user_id}"
@@ -3,11 +3,13 @@ from __future__ import annotations
 import os
 import time
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from typing import Optional, Sequence, Tuple
 
 import redis
+import redis.asyncio as aioredis
+from redis.commands.core import AsyncScript
 
-from app.infra.redis.client import get_redis_client
+from app.infra.redis.client import get_async_redis_client, get_redis_client
 
 
 LUA_TOKEN_BUCKET = r"""
@@ -62,6 +64,71 @@ return {allowed, tokens, reset_after}
 """
 
 
+LUA_TOKEN_BUCKET_MULTI = r"""
+-- All-or-nothing check of N token buckets: a request is charged one token in
+-- every bucket, or in none of them if any bucket is empty.
+-- KEYS[i] = key of bucket i
+-- ARGV[1] = now (float seconds)
+-- ARGV[2] = expire_seconds (int)
+-- ARGV[1 + 2i] = capacity of bucket i (float)
+-- ARGV[2 + 2i] = refill_per_sec of bucket i (float)
+
+local now = tonumber(ARGV[1])
+local expire_seconds = tonumber(ARGV[2])
+local n = #KEYS
+
+-- refill every bucket; the first empty one denies the request
+local tokens = {}
+local denied = 0
+for i = 1, n do
+  local capacity = tonumber(ARGV[1 + 2 * i])
+  local refill_per_sec = tonumber(ARGV[2 + 2 * i])
+
+  local data = redis.call("HMGET", KEYS[i], "tokens", "ts")
+  local t = tonumber(data[1])
+  local ts = tonumber(data[2])
+  if t == nil then
+    t = capacity
+  end
+  if ts == nil then
+    ts = now
+  end
+
+  local delta = now - ts
+  if delta < 0 then
+    delta = 0
+  end
+
+  tokens[i] = math.min(capacity, t + (delta * refill_per_sec))
+  if denied == 0 and tokens[i] < 1 then
+    denied = i
+  end
+end
+
+-- debit only if every bucket allows; persist refills either way
+local out = {denied}
+for i = 1, n do
+  local refill_per_sec = tonumber(ARGV[2 + 2 * i])
+  if denied == 0 then
+    tokens[i] = tokens[i] - 1
+  end
+
+  redis.call("HMSET", KEYS[i], "tokens", tokens[i], "ts", now)
+  redis.call("EXPIRE", KEYS[i], expire_seconds)
+
+  local reset_after = 0
+  if tokens[i] < 1 then
+    reset_after = math.ceil((1 - tokens[i]) / refill_per_sec)
+  end
+  table.insert(out, tokens[i])
+  table.insert(out, reset_after)
+end
+
+-- {denied bucket index (0 = allowed), tokens_1, reset_after_1, ...}
+return out
+"""
+
+
 @dataclass(frozen=True)
 class RateLimitRule:
     name: str
@@ -77,15 +144,44 @@ class RateLimitResult:
     limit: int
 
 
+@dataclass(frozen=True)
+class MultiRateLimitResult:
+    allowed: bool
+    # Name of the first rule whose bucket was empty; None when allowed.
+    denied_rule: Optional[str]
+    # One result per bucket, in the order they were checked.
+    results: Tuple[RateLimitResult, ...]
+
+    @property
+    def denied_result(self) -> Optional[RateLimitResult]:
+        for res in self.results:
+            if not res.allowed:
+                return res
+        return None
+
+
 class TokenBucketLimiter:
     def __init__(self) -> None:
         self._script: Optional[redis.client.Script] = None
+        self._multi_script: Optional[redis.client.Script] = None
+        self._multi_script_async: Optional[AsyncScript] = None
 
     def _get_script(self, r: redis.Redis) -> redis.client.Script:
         if self._script is None:
             self._script = r.register_script(LUA_TOKEN_BUCKET)
         return self._script
 
+    def _get_multi_script(self, r: redis.Redis) -> redis.client.Script:
+        if self._multi_script is None:
+            self._multi_script = r.register_script(LUA_TOKEN_BUCKET_MULTI)
+        return self._multi_script
+
+    def _get_multi_script_async(self, r: aioredis.Redis) -> AsyncScript:
+        # Called with client=... each time: async clients are per event loop.
+        if self._multi_script_async is None:
+            self._multi_script_async = r.register_script(LUA_TOKEN_BUCKET_MULTI)
+        return self._multi_script_async
+
     def allow(self, key: str, rule: RateLimitRule) -> Optional[RateLimitResult]:
         r = get_redis_client()
         if r is None:
@@ -110,6 +206,60 @@ class TokenBucketLimiter:
             limit=int(rule.capacity),
         )
 
+    def allow_many(self, buckets: Sequence[Tuple[str, RateLimitRule]]) -> Optional[MultiRateLimitResult]:
+        """
+        Check and debit several (key, rule) buckets atomically in one EVALSHA:
+        either every bucket is charged a token or, if any is empty, none is.
+        """
+        r = get_redis_client()
+        if r is None or not buckets:
+            return None
+
+        script = self._get_multi_script(r)
+        reply = script(keys=[key for key, _ in buckets], args=_multi_args(buckets))
+        return _multi_result(buckets, reply)
+
+    async def allow_many_async(self, buckets: Sequence[Tuple[str, RateLimitRule]]) -> Optional[MultiRateLimitResult]:
+        # Same as allow_many, on the event loop (redis.asyncio, no thread hop).
+        r = get_async_redis_client()
+        if r is None or not buckets:
+            return None
+
+        script = self._get_multi_script_async(r)
+        reply = await script(keys=[key for key, _ in buckets], args=_multi_args(buckets), client=r)
+        return _multi_result(buckets, reply)
+
+
+def _multi_args(buckets: Sequence[Tuple[str, RateLimitRule]]) -> list:
+    expire_seconds = int(os.getenv("RL_KEY_EXPIRE_SECONDS", "600"))
+    args: list = [time.time(), expire_seconds]
+    for _, rule in buckets:
+        args.extend((rule.capacity, rule.refill_per_sec))
+    return args
+
+
+def _multi_result(buckets: Sequence[Tuple[str, RateLimitRule]], reply: list) -> MultiRateLimitResult:
+    denied = int(reply[0])
+
+    results = []
+    for i, (_, rule) in enumerate(buckets, start=1):
+        tokens_left, reset_after = reply[2 * i - 1], reply[2 * i]
+        remaining = int(tokens_left) if tokens_left is not None else 0
+        results.append(
+            RateLimitResult(
+                allowed=(denied != i),
+                remaining=max(0, remaining),
+                reset_after_seconds=int(reset_after) if reset_after is not None else 0,
+                limit=int(rule.capacity),
+            )
+        )
+
+    return MultiRateLimitResult(
+        allowed=(denied == 0),
+        denied_rule=buckets[denied - 1][1].name if denied else None,
+        results=tuple(results),
+    )
+
 
 def build_rl_key(rule_name: str, identifier: str, route_group: str) -> str:
     return f"rl:tb:{rule_name}:{identifier}:{route_group}"
@@ -126,6 +276,11 @@ def meals_create_rule() -> RateLimitRule:
     return RateLimitRule(name="meals_create", capacity=10.0, refill_per_sec=(10.0 / 60.0))
 
 
+def meals_import_rule() -> RateLimitRule:
+    # Example: 5 per hour (each call can write a whole history)
+    return RateLimitRule(name="meals_import", capacity=5.0, refill_per_sec=(5.0 / 3600.0))
+
+
 def auth_login_rule() -> RateLimitRule:
     # Example: 10 per 5 minutes
     return RateLimitRule(name="auth_login", capacity=10.0, refill_per_sec=(10.0 / 300.0))
@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Optional
+
+import redis
+import redis.asyncio as aioredis
+from redis.commands.core import AsyncScript
+
+from app.infra.redis.client import get_async_redis_client, get_redis_client
+from app.infra.redis.keys import singleflight_lock_key, singleflight_result_key
+
+logger = logging.getLogger(__name__)
+
+LUA_RELEASE_LOCK = r"""
+-- KEYS[1] = lock key
+-- ARGV[1] = owner token
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+  return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+
+@dataclass
+class SingleFlightStats:
+    # Calls this worker executed (first caller, or after giving up on another worker).
+    leaders: int = 0
+    local_followers: int = 0
+    remote_followers: int = 0
+    # Waited wait_timeout_seconds on another worker's call without a result.
+    timeouts: int = 0
+    # The other worker's lock went away without a result (its call failed).
+    owner_failures: int = 0
+    redis_errors: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "leaders": self.leaders,
+            "local_followers": self.local_followers,
+            "remote_followers": self.remote_followers,
+            "timeouts": self.timeouts,
+            "owner_failures": self.owner_failures,
+            "redis_errors": self.redis_errors,
+        }
+
+
+@dataclass
+class _Call:
+    event: threading.Event = field(default_factory=threading.Event)
+    result: Optional[str] = None
+    error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Request coalescing for expensive calls that return a string.
+
+    - In-process: concurrent callers with the same key wait on the first call.
+    - Across workers: the first caller takes a short Redis lock; others poll a
+      result slot until it is published, the lock disappears, or they time out
+      (then they run the call themselves). Redis is an optimization only: when
+      it errors, the caller runs the call itself (still coalesced in-process).
+    - `do_async` does the same for coroutine calls on the running event loop
+      (redis.asyncio for the cross-worker part). If the leading call on this
+      loop is cancelled, a waiting caller takes it over.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        lock_ttl_seconds: int,
+        wait_timeout_seconds: float,
+        poll_interval_seconds: float = 0.1,
+    ) -> None:
+        self.name = name
+        self.lock_ttl_seconds = lock_ttl_seconds
+        self.wait_timeout_seconds = wait_timeout_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self.stats = SingleFlightStats()
+        self._calls: dict[str, _Call] = {}
+        self._async_calls: dict[str, asyncio.Future[str]] = {}
+        self._lock = threading.Lock()
+        self._release_script: Optional[redis.client.Script] = None
+        self._async_release_script: Optional[AsyncScript] = None
+
+    def do(self, key: str, fn: Callable[[], str]) -> str:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                self.stats.local_followers += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._do_distributed(key, fn)
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+    async def do_async(self, key: str, fn: Callable[[], Awaitable[str]]) -> str:
+        while True:
+            pending = self._async_calls.get(key)
+            if pending is None:
+                return await self._lead_async(key, fn)
+
+            self._count("local_followers")
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                # The leader was cancelled (its client went away), not this caller:
+                # take over the call instead of failing every follower with it.
+                if pending.cancelled() and not asyncio.current_task().cancelling():
+                    continue
+                raise
+
+    async def _lead_async(self, key: str, fn: Callable[[], Awaitable[str]]) -> str:
+        future: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        self._async_calls[key] = future
+        try:
+            result = await self._do_distributed_async(key, fn)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()  # mark retrieved when there are no followers
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._async_calls.get(key) is future:
+                self._async_calls.pop(key, None)
+
+    def _count(self, stat: str, n: int = 1) -> None:
+        with self._lock:
+            setattr(self.stats, stat, getattr(self.stats, stat) + n)
+
+    def _redis_failed(self, step: str) -> None:
+        self._count("redis_errors")
+        logger.warning("singleflight %s: Redis %s failed; continuing without it", self.name, step, exc_info=True)
+
+    def _get_release_script(self, r: redis.Redis) -> redis.client.Script:
+        if self._release_script is None:
+            self._release_script = r.register_script(LUA_RELEASE_LOCK)
+        return self._release_script
+
+    def _execute(self, fn: Callable[[], str]) -> str:
+        self._count("leaders")
+        return fn()
+
+    def _do_distributed(self, key: str, fn: Callable[[], str]) -> str:
+        r = get_redis_client()
+        if r is None:
+            return self._execute(fn)
+
+        lock_key = singleflight_lock_key(self.name, key)
+        result_key = singleflight_result_key(self.name, key)
+        token = uuid.uuid4().hex
+
+        try:
+            owner = r.set(lock_key, token, nx=True, ex=self.lock_ttl_seconds)
+        except redis.RedisError:
+            self._redis_failed("lock")
+            return self._execute(fn)
+
+        if owner:
+            try:
+                result = self._execute(fn)
+                try:
+                    # Short-lived slot: only needs to outlive the followers' polling.
+                    r.setex(result_key, self.lock_ttl_seconds, result)
+                except redis.RedisError:
+                    self._redis_failed("publish")
+                return result
+            finally:
+                try:
+                    self._get_release_script(r)(keys=[lock_key], args=[token])
+                except redis.RedisError:
+                    self._redis_failed("unlock")  # the lock expires after lock_ttl_seconds
+
+        # Another worker owns the call: wait for its result.
+        deadline = time.monotonic() + self.wait_timeout_seconds
+        try:
+            value = r.get(result_key)
+            while value is None and time.monotonic() < deadline and r.exists(lock_key):
+                time.sleep(self.poll_interval_seconds)
+                value = r.get(result_key)
+            if value is None:
+                # The owner may have published just before releasing its lock.
+                value = r.get(result_key)
+        except redis.RedisError:
+            self._redis_failed("wait")
+            return self._execute(fn)
+
+        if value is not None:
+            self._count("remote_followers")
+            return value
+
+        # Owner failed or timed out: do the work ourselves.
+        self._count("timeouts" if time.monotonic() >= deadline else "owner_failures")
+        return self._execute(fn)
+
+    async def _execute_async(self, fn: Callable[[], Awaitable[str]]) -> str:
+        self._count("leaders")
+        return await fn()
+
+    async def _do_distributed_async(self, key: str, fn: Callable[[], Awaitable[str]]) -> str:
+        # `_do_distributed` on the event loop: same keys, so sync and async
+        # callers on any worker share one call.
+        r = get_async_redis_client()
+        if r is None:
+            return await self._execute_async(fn)
+
+        lock_key = singleflight_lock_key(self.name, key)
+        result_key = singleflight_result_key(self.name, key)
+        token = uuid.uuid4().hex
+
+        try:
+            owner = await r.set(lock_key, token, nx=True, ex=self.lock_ttl_seconds)
+        except redis.RedisError:
+            self._redis_failed("lock")
+            return await self._execute_async(fn)
+
+        if owner:
+            try:
+                result = await self._execute_async(fn)
+                try:
+                    await r.setex(result_key, self.lock_ttl_seconds, result)
+                except redis.RedisError:
+                    self._redis_failed("publish")
+                return result
+            finally:
+                try:
+                    await self._get_async_release_script(r)(keys=[lock_key], args=[token], client=r)
+                except redis.RedisError:
+                    self._redis_failed("unlock")
+
+        deadline = time.monotonic() + self.wait_timeout_seconds
+        try:
+            value = await r.get(result_key)
+            while value is None and time.monotonic() < deadline and await r.exists(lock_key):
+                await asyncio.sleep(self.poll_interval_seconds)
+                value = await r.get(result_key)
+            if value is None:
+                value = await r.get(result_key)
+        except redis.RedisError:
+            self._redis_failed("wait")
+            return await self._execute_async(fn)
+
+        if value is not None:
+            self._count("remote_followers")
+            return value
+
+        self._count("timeouts" if time.monotonic() >= deadline else "owner_failures")
+        return await self._execute_async(fn)
+
+    def _get_async_release_script(self, r: aioredis.Redis) -> AsyncScript:
+        # Clients are per event loop; the script is passed the caller's client.
+        if self._async_release_script is None:
+            self._async_release_script = r.register_script(LUA_RELEASE_LOCK)
+        return self._async_release_script
@@ -1,33 +1,61 @@
 from __future__ import annotations
 
 import os
+import time
+from functools import lru_cache
 
-import anyio
 from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 from app.core.config import settings
 
-from app.infra.redis.rate_limit import (
-    TokenBucketLimiter,
-    build_rl_key,
-    global_rule_from_env,
-    meals_create_rule,
-    auth_login_rule,
-    auth_register_rule,
-)
+from app.auth.jwt import token_claims
+from app.infra.redis.hybrid_rate_limit import hybrid_enabled, hybrid_limiter
+from app.infra.redis.rate_limit import RateLimitResult, TokenBucketLimiter, build_rl_key
+from app.middlewares.rate_limit_rules import KeyBy, load_rule_table
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app) -> None:
-        super().__init__(app)
+@lru_cache(maxsize=4096)
+def _bearer_claims(authorization: str) -> tuple[str, float] | None:
+    # Signature checked once per header; `exp` is checked on every use (below).
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    return token_claims(token.strip())
+
+
+def _bearer_subject(authorization: str) -> str | None:
+    # JWT `sub` for bucket keys only (verified, but not an authentication check).
+    # An expired token falls back to the IP bucket, as an invalid one does.
+    claims = _bearer_claims(authorization)
+    if claims is None or claims[1] <= time.time():
+        return None
+    return claims[0]
+
+
+class RateLimitMiddleware:
+    """
+    Token-bucket rate limiting as plain ASGI middleware: rejected requests get
+    a 429 with X-RateLimit-* headers; allowed ones pass through untouched
+    (no extra task or body stream per request, streaming responses included).
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
         self.enabled = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
         self.limiter = TokenBucketLimiter()
-
-    def _get_identifier(self, request: Request) -> str:
-        # Prefer authenticated user id if present (set by your auth dependency later in endpoint).
-        # Middleware runs before dependencies, so we cannot rely on current_user here.
-        # Therefore: we do IP-based limiting in middleware, and (optionally) add per-user limiting in endpoints later.
+        self.rules = load_rule_table()
+        # Global rule from a worker-local lease (RL_HYBRID_*); route rules stay exact.
+        self.hybrid = hybrid_limiter if hybrid_enabled() else None
+
+    def _get_identifier(self, request: Request, key_by: KeyBy = "ip") -> str:
+        # Middleware runs before dependencies, so "user" rules read the JWT `sub`
+        # themselves (users behind one NAT get separate buckets); no valid token -> IP.
+        if key_by == "user":
+            authorization = request.headers.get("authorization")
+            subject = _bearer_subject(authorization) if authorization else None
+            if subject is not None:
+                return f"user:{subject}"
         xff = request.headers.get("x-forwarded-for")
         if xff:
             # take first IP
@@ -35,71 +63,73 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         client = request.client.host if request.client else "unknown"
         return f"ip:{client}"
 
-    def _route_group(self, request: Request) -> str:
-        # Global bucket groups by "all"
-        # Specific buckets group by "METHOD:PATH"
-        return f"{request.method}:{request.url.path}"
-
-    async def _check(self, key: str, rule):
-        return await anyio.to_thread.run_sync(self.limiter.allow, key, rule)
-
-    async def dispatch(self, request: Request, call_next):
+    async def _check(self, buckets):
+        # redis.asyncio on the loop: no worker thread taken from sync endpoints.
+        return await self.limiter.allow_many_async(buckets)
+
+    def _too_many(self, res: RateLimitResult) -> JSONResponse:
+        return JSONResponse(
+            status_code=429,
+            content={"code": "RATE_LIMITED", "message": "Too many requests"},
+            headers={
+                "X-RateLimit-Limit": str(res.limit),
+                "X-RateLimit-Remaining": str(res.remaining),
+                "X-RateLimit-Reset": str(res.reset_after_seconds),
+            },
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        response = await self._rejection(Request(scope))
+        if response is not None:
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
+
+    async def _rejection(self, request: Request) -> JSONResponse | None:
+        # The 429 response for a request over its limits, else None.
         if request.method.upper() == "OPTIONS":
-            return await call_next(request)
-        if not self.enabled:
-            return await call_next(request)
+            return None
         path = request.url.path
         if path == "/health":
-            return await call_next(request)
+            return None
         if path.endswith("/telegram/webhook"):
-            return await call_next(request)
-
-        identifier = self._get_identifier(request)
-        # 1) Global rule for everything (soft)
-        global_rule = global_rule_from_env()
-        global_key = build_rl_key(global_rule.name, identifier, "all")
-        global_res = await self._check(global_key, global_rule)
-
-        if global_res is not None and not global_res.allowed:
-            return JSONResponse(
-                status_code=429,
-                content={"code": "RATE_LIMITED", "message": "Too many requests"},
-                headers={
-                    "X-RateLimit-Limit": str(global_res.limit),
-                    "X-RateLimit-Remaining": str(global_res.remaining),
-                    "X-RateLimit-Reset": str(global_res.reset_after_seconds),
-                },
-            )
-
-        # 2) Per-route stricter rules (hard)
-        path = request.url.path
-        method = request.method.upper()
-        route_group = self._route_group(request)
-
-        rule = None
-        if method == "POST" and path == "/api/v1/meals":
-            rule = meals_create_rule()
-        elif method == "POST" and path == "/auth/login":
-            rule = auth_login_rule()
-        elif method == "POST" and path == "/auth/register":
-            rule = auth_register_rule()
+            return None
 
+        rules = self.rules.current()
 
-
-
-        if rule is not None:
-            key = build_rl_key(rule.name, identifier, route_group)
-            res = await self._check(key, rule)
-
+        # 1) Global rule for everything (soft)
+        global_rule = rules.global_rule.rule
+        global_key = build_rl_key(global_rule.name, self._get_identifier(request, rules.global_rule.key_by), "all")
+
+        # 2) At most one stricter route rule (hard); buckets grouped by "METHOD:pattern"
+        matched = rules.match(request.method.upper(), path)
+        route_bucket = None
+        if matched is not None:
+            identifier = self._get_identifier(request, matched.key_by)
+            route_bucket = (build_rl_key(matched.rule.name, identifier, matched.route_group), matched.rule)
+
+        if self.hybrid is not None:
+            res = await self.hybrid.allow_async(global_key, global_rule)
             if res is not None and not res.allowed:
-                return JSONResponse(
-                    status_code=429,
-                    content={"code": "RATE_LIMITED", "message": "Too many requests"},
-                    headers={
-                        "X-RateLimit-Limit": str(res.limit),
-                        "X-RateLimit-Remaining": str(res.remaining),
-                        "X-RateLimit-Reset": str(res.reset_after_seconds),
-                    },
-                )
-
-        return await call_next(request)
+                return self._too_many(res)
+            if route_bucket is not None:
+                route_res = await self._check([route_bucket])
+                if route_res is not None and not route_res.allowed:
+                    self.hybrid.refund(global_key)
+                    return self._too_many(route_res.denied_result)
+            return None
+
+        # One round trip for all buckets; nothing is debited unless all allow.
+        buckets = [(global_key, global_rule)]
+        if route_bucket is not None:
+            buckets.append(route_bucket)
+        res = await self._check(buckets)
+        if res is not None and not res.allowed:
+            return self._too_many(res.denied_result)
+
+        return None
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from app.core.config import settings
+from app.infra.redis.rate_limit import (
+    RateLimitRule,
+    auth_login_rule,
+    auth_register_rule,
+    global_rule_from_env,
+    meals_create_rule,
+    meals_import_rule,
+)
+
+logger = logging.getLogger(__name__)
+
+KeyBy = Literal["ip", "user"]
+
+
+class GlobalRuleSpec(BaseModel):
+    capacity: float = Field(gt=0)
+    refill_per_sec: float = Field(gt=0)
+    # "user": bucket per JWT `sub` when the request carries a valid token, else per IP.
+    key: KeyBy = "ip"
+
+
+class RouteRuleSpec(GlobalRuleSpec):
+    name: str
+    # Exact paths ("/auth/login") or patterns with {param} segments ("/api/v1/meals/{id}").
+    paths: list[str]
+    # "*" matches any method.
+    methods: list[str] = ["*"]
+    # Bucket shared by every path and method of the rule (e.g. "POST:/api/v1/meals").
+    # Default: one bucket per "METHOD:path".
+    group: Optional[str] = None
+
+
+class RuleTableSpec(BaseModel):
+    """
+    The rate-limit rule table (RATE_LIMIT_RULES / RATE_LIMIT_RULES_FILE), e.g.
+
+        {"global": {"capacity": 300, "refill_per_sec": 1.0, "key": "user"},
+         "routes": [{"name": "auth_login", "methods": ["POST"], "paths": ["/auth/login"],
+                     "capacity": 10, "refill_per_sec": 0.0333}]}
+
+    Every request is checked against the global rule and at most one route rule.
+    """
+
+    global_: GlobalRuleSpec = Field(alias="global")
+    routes: list[RouteRuleSpec] = []
+
+
+@dataclass(frozen=True)
+class MatchedRule:
+    rule: RateLimitRule
+    key_by: KeyBy
+    # Route group of the bucket: "METHOD:pattern", so ids in a path share one bucket.
+    route_group: str
+
+
+@dataclass
+class _Node:
+    children: dict[str, "_Node"] = field(default_factory=dict)
+    param: Optional["_Node"] = None
+    # METHOD (or "*") -> rule
+    rules: dict[str, MatchedRule] = field(default_factory=dict)
+
+
+def _segments(path: str) -> list[str]:
+    return [s for s in path.split("/") if s]
+
+
+class CompiledRules:
+    """
+    Route rules precompiled for lookup: exact (method, path) pairs in a dict,
+    {param} patterns in a segment trie. Exact paths win over patterns, literal
+    segments over {param} ones, a named method over "*".
+    """
+
+    def __init__(self, spec: RuleTableSpec) -> None:
+        g = spec.global_
+        self.global_rule = MatchedRule(
+            rule=RateLimitRule(name="global", capacity=g.capacity, refill_per_sec=g.refill_per_sec),
+            key_by=g.key,
+            route_group="all",
+        )
+        self._exact: dict[tuple[str, str], MatchedRule] = {}
+        self._trie = _Node()
+
+        for r in spec.routes:
+            rule = RateLimitRule(name=r.name, capacity=r.capacity, refill_per_sec=r.refill_per_sec)
+            for path in r.paths:
+                for method in r.methods:
+                    method = method.upper()
+                    matched = MatchedRule(rule=rule, key_by=r.key, route_group=r.group or f"{method}:{path}")
+                    if "{" not in path:
+                        self._exact.setdefault((method, path), matched)
+                        continue
+                    node = self._trie
+                    for seg in _segments(path):
+                        if seg.startswith("{") and seg.endswith("}"):
+                            node.param = node.param or _Node()
+                            node = node.param
+                        else:
+                            node = node.children.setdefault(seg, _Node())
+                    node.rules.setdefault(method, matched)
+
+    def match(self, method: str, path: str) -> Optional[MatchedRule]:
+        hit = self._exact.get((method, path)) or self._exact.get(("*", path))
+        if hit is not None:
+            return hit
+        return self._match_trie(self._trie, _segments(path), 0, method)
+
+    def _match_trie(self, node: _Node, segs: list[str], i: int, method: str) -> Optional[MatchedRule]:
+        if i == len(segs):
+            return node.rules.get(method) or node.rules.get("*")
+        child = node.children.get(segs[i])
+        if child is not None:
+            hit = self._match_trie(child, segs, i + 1, method)
+            if hit is not None:
+                return hit
+        if node.param is not None:
+            return self._match_trie(node.param, segs, i + 1, method)
+        return None
+
+
+def default_rule_table() -> RuleTableSpec:
+    # The built-in rules (previously hard-coded in the middleware), per IP as
+    # before; other per-user buckets are opt-in through RATE_LIMIT_RULES(_FILE).
+    g = global_rule_from_env()
+    routes = [
+        # Sync and queued creation spend the same LLM budget: one bucket.
+        (meals_create_rule(), ["/api/v1/meals", "/api/v1/meals/jobs"], "POST:/api/v1/meals", "ip"),
+        # Imports are heavy writes on the account itself: limit the account, so
+        # changing IPs does not help and users behind one NAT do not share it.
+        (meals_import_rule(), ["/api/v1/meals/import"], None, "user"),
+        (auth_login_rule(), ["/auth/login"], None, "ip"),
+        (auth_register_rule(), ["/auth/register"], None, "ip"),
+    ]
+    return RuleTableSpec.model_validate(
+        {
+            "global": {"capacity": g.capacity, "refill_per_sec": g.refill_per_sec, "key": "ip"},
+            "routes": [
+                {
+                    "name": rule.name,
+                    "methods": ["POST"],
+                    "paths": paths,
+                    "capacity": rule.capacity,
+                    "refill_per_sec": rule.refill_per_sec,
+                    "key": key,
+                    "group": group,
+                }
+                for rule, paths, group, key in routes
+            ],
+        }
+    )
+
+
+class RuleTable:
+    """
+    The live rule table of this worker: loaded once, then served from memory.
+    With a rules file, the file's mtime is checked at most every
+    `reload_seconds` and a changed file is reloaded in place (no restart); a
+    file that fails to parse is logged and the previous table kept.
+    """
+
+    def __init__(self, *, inline: str | None, path: str | None, reload_seconds: float) -> None:
+        self.inline = inline
+        self.path = path
+        self.reload_seconds = reload_seconds
+        self._lock = threading.Lock()
+        self._mtime: float | None = None
+        self._next_check = 0.0
+        self._compiled = CompiledRules(self._load())
+
+    def _load(self) -> RuleTableSpec:
+        if self.path:
+            self._mtime = os.stat(self.path).st_mtime
+            with open(self.path, "rb") as f:
+                return RuleTableSpec.model_validate_json(f.read())
+        if self.inline:
+            return RuleTableSpec.model_validate(json.loads(self.inline))
+        return default_rule_table()
+
+    def current(self) -> CompiledRules:
+        if self.path and time.monotonic() >= self._next_check:
+            self._maybe_reload()
+        return self._compiled
+
+    def _maybe_reload(self) -> None:
+        with self._lock:
+            if time.monotonic() < self._next_check:
+                return
+            self._next_check = time.monotonic() + self.reload_seconds
+            try:
+                if os.stat(self.path).st_mtime == self._mtime:
+                    return
+                self._compiled = CompiledRules(self._load())
+                logger.info("Reloaded rate-limit rules from %s", self.path)
+            except Exception:
+                logger.exception("Invalid rate-limit rules in %s; keeping the previous table", self.path)
+
+
+def load_rule_table() -> RuleTable:
+    return RuleTable(
+        inline=settings.rate_limit_rules,
+        path=settings.rate_limit_rules_file,
+        reload_seconds=settings.rate_limit_rules_reload_seconds,
+    )
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import datetime
+import uuid
+from decimal import Decimal
+
+from sqlalchemy import Date, ForeignKey, Integer, Numeric
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base_class import Base
+
+
+class DailyTotal(Base):
+    """
+    Per-user, per-day rollup of meals, maintained in the same transaction
+    as meal writes (see MealRepository).
+    """
+
+    __tablename__ = "daily_totals"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    date: Mapped[datetime.date] = mapped_column(Date, primary_key=True)
+
+    meals_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    calories: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    protein_g: Mapped[Decimal] = mapped_column(Numeric(8, 2), nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<DailyTotal user_id={self.user_id} date={self.date} meals={self.meals_count}>"
@@ -12,6 +12,8 @@ from app.db.base_class import Base
 
 
 class Meal(Base):
+    # On Postgres the table is range-partitioned by meal_date (migration 0007) and its
+    # primary key is (id, meal_date); the ORM keeps identifying rows by id (uuid4).
     __tablename__ = "meals"
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
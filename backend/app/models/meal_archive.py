@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import datetime
+
+from sqlalchemy import BigInteger, Date, DateTime, Identity, Integer, Text
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.db.base_class import Base
+
+
+class MealArchive(Base):
+    """
+    One row per archive run of a month of meals detached from the partitioned
+    `meals` table and written to compressed files (see app.db.meal_partitions).
+    A month re-archived later (rows imported after it was first archived) gets
+    a second row and its own files. daily_totals keeps the rollups of archived
+    months.
+    """
+
+    __tablename__ = "meal_archives"
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    month: Mapped[datetime.date] = mapped_column(Date, nullable=False, index=True)
+    meals_rows: Mapped[int] = mapped_column(Integer, nullable=False)
+    items_rows: Mapped[int] = mapped_column(Integer, nullable=False)
+    meals_file: Mapped[str] = mapped_column(Text, nullable=False)
+    items_file: Mapped[str] = mapped_column(Text, nullable=False)
+    archived_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return f"<MealArchive id={self.id} month={self.month} meals={self.meals_rows}>"
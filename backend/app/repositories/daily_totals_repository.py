@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import datetime
+import uuid
+from decimal import Decimal
+
+from sqlalchemy import Row, Select, func, literal, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.daily_total import DailyTotal
+
+
+def _insert(dialect: str):
+    return sqlite.insert if dialect == "sqlite" else postgresql.insert
+
+
+def _add_on_conflict(stmt):
+    return stmt.on_conflict_do_update(
+        index_elements=[DailyTotal.user_id, DailyTotal.date],
+        set_={
+            "meals_count": DailyTotal.meals_count + stmt.excluded.meals_count,
+            "calories": DailyTotal.calories + stmt.excluded.calories,
+            "protein_g": DailyTotal.protein_g + stmt.excluded.protein_g,
+        },
+    )
+
+
+def _delta_stmt(
+    dialect: str,
+    *,
+    user_id: uuid.UUID,
+    date: datetime.date,
+    meals: int,
+    calories: int,
+    protein_g: Decimal,
+):
+    # INSERT ... ON CONFLICT (user_id, date) DO UPDATE += delta.
+    return _add_on_conflict(
+        _insert(dialect)(DailyTotal).values(
+            user_id=user_id,
+            date=date,
+            meals_count=meals,
+            calories=calories,
+            protein_g=protein_g,
+        )
+    )
+
+
+def _bulk_delta_stmt(dialect: str, deltas: Select):
+    """
+    Same upsert fed by a SELECT of (user_id, date, meals_count, calories, protein_g)
+    rows: one statement for any number of days.
+    """
+    columns = ["user_id", "date", "meals_count", "calories", "protein_g"]
+    return _add_on_conflict(_insert(dialect)(DailyTotal).from_select(columns, deltas))
+
+
+def _user_lock_stmt(user_id: uuid.UUID, *, shared: bool) -> Select:
+    """
+    Transaction-scoped advisory lock on one user's rollup rows (Postgres). Meal
+    writes take it shared before their delta, so they only wait for a rebuild
+    (app.db.reconcile_daily_totals), which takes it exclusive.
+    """
+    key = func.hashtextextended(literal(f"daily_totals:{user_id}"), 0)
+    lock = func.pg_advisory_xact_lock_shared if shared else func.pg_advisory_xact_lock
+    return select(lock(key))
+
+
+def _get_stmt(user_id: uuid.UUID, date: datetime.date) -> Select:
+    return select(DailyTotal.meals_count, DailyTotal.calories, DailyTotal.protein_g).where(
+        DailyTotal.user_id == user_id,
+        DailyTotal.date == date,
+    )
+
+
+def _range_stmt(user_id: uuid.UUID, start: datetime.date, end: datetime.date) -> Select:
+    return select(DailyTotal.date, DailyTotal.meals_count, DailyTotal.calories, DailyTotal.protein_g).where(
+        DailyTotal.user_id == user_id,
+        DailyTotal.date >= start,
+        DailyTotal.date <= end,
+    )
+
+
+def _series_stmt(user_id: uuid.UUID) -> Select:
+    return (
+        select(DailyTotal.date, DailyTotal.meals_count, DailyTotal.calories, DailyTotal.protein_g)
+        .where(DailyTotal.user_id == user_id, DailyTotal.meals_count > 0)
+        .order_by(DailyTotal.date.asc())
+    )
+
+
+def _totals(row) -> tuple[int, int, Decimal]:
+    if row is None:
+        return 0, 0, Decimal("0")
+    return int(row.meals_count), int(row.calories), Decimal(row.protein_g)
+
+
+class DailyTotalsRepository:
+    """
+    Access to the daily_totals rollup.
+    Writes never commit: they join the caller's (meal write) transaction.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def apply_delta(
+        self,
+        *,
+        user_id: uuid.UUID,
+        date: datetime.date,
+        meals: int = 0,
+        calories: int = 0,
+        protein_g: Decimal = Decimal("0"),
+    ) -> None:
+        """
+        Atomic upsert: INSERT ... ON CONFLICT (user_id, date) DO UPDATE += delta.
+        """
+        self._lock_user(user_id, shared=True)
+        self.db.execute(
+            _delta_stmt(
+                self.db.get_bind().dialect.name,
+                user_id=user_id,
+                date=date,
+                meals=meals,
+                calories=calories,
+                protein_g=protein_g,
+            )
+        )
+
+    def apply_deltas(self, user_id: uuid.UUID, deltas: Select) -> None:
+        """
+        Bulk `apply_delta` for one user: `deltas` selects (user_id, date,
+        meals_count, calories, protein_g) rows, at most one per date.
+        """
+        self._lock_user(user_id, shared=True)
+        self.db.execute(_bulk_delta_stmt(self.db.get_bind().dialect.name, deltas))
+
+    def lock_for_rebuild(self, user_ids: list[uuid.UUID]) -> None:
+        """
+        Exclusive rollup locks of `user_ids` until the transaction ends: no meal
+        write of theirs can commit between reading meals and replacing their rows.
+        Taken in a fixed order (writers only ever hold one user's lock).
+        """
+        for user_id in sorted(user_ids, key=str):
+            self._lock_user(user_id, shared=False)
+
+    def _lock_user(self, user_id: uuid.UUID, *, shared: bool) -> None:
+        # SQLite (dev/tests) has no advisory locks.
+        if self.db.get_bind().dialect.name == "postgresql":
+            self.db.execute(_user_lock_stmt(user_id, shared=shared))
+
+    def get(self, user_id: uuid.UUID, date: datetime.date) -> tuple[int, int, Decimal]:
+        """
+        (meals_count, calories, protein_g) for one day; zeros when there is no row.
+        """
+        return _totals(self.db.execute(_get_stmt(user_id, date)).one_or_none())
+
+    def get_range(
+        self,
+        user_id: uuid.UUID,
+        start: datetime.date,
+        end: datetime.date,
+    ) -> dict[datetime.date, tuple[int, int, Decimal]]:
+        """
+        Per-day (meals_count, calories, protein_g) for start..end inclusive,
+        one range scan on the (user_id, date) primary key. Days without meals are absent.
+        """
+        rows = self.db.execute(_range_stmt(user_id, start, end)).all()
+        return {r.date: _totals(r) for r in rows}
+
+    def get_series(self, user_id: uuid.UUID) -> list[Row]:
+        """
+        The user's whole history as (date, meals_count, calories, protein_g), oldest first.
+        """
+        return list(self.db.execute(_series_stmt(user_id)).all())
+
+
+class AsyncDailyTotalsRepository:
+    """
+    `DailyTotalsRepository` over an AsyncSession; same statements, same semantics.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def apply_delta(
+        self,
+        *,
+        user_id: uuid.UUID,
+        date: datetime.date,
+        meals: int = 0,
+        calories: int = 0,
+        protein_g: Decimal = Decimal("0"),
+    ) -> None:
+        if self.db.get_bind().dialect.name == "postgresql":
+            await self.db.execute(_user_lock_stmt(user_id, shared=True))
+        await self.db.execute(
+            _delta_stmt(
+                self.db.get_bind().dialect.name,
+                user_id=user_id,
+                date=date,
+                meals=meals,
+                calories=calories,
+                protein_g=protein_g,
+            )
+        )
+
+    async def get(self, user_id: uuid.UUID, date: datetime.date) -> tuple[int, int, Decimal]:
+        return _totals((await self.db.execute(_get_stmt(user_id, date))).one_or_none())
+
+    async def get_range(
+        self,
+        user_id: uuid.UUID,
+        start: datetime.date,
+        end: datetime.date,
+    ) -> dict[datetime.date, tuple[int, int, Decimal]]:
+        rows = (await self.db.execute(_range_stmt(user_id, start, end))).all()
+        return {r.date: _totals(r) for r in rows}
+
+    async def get_series(self, user_id: uuid.UUID) -> list[Row]:
+        return list((await self.db.execute(_series_stmt(user_id))).all())
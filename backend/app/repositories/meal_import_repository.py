@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import datetime
+import itertools
+import uuid
+from dataclasses import dataclass
+from typing import Iterable
+
+from sqlalchemy import (
+    Column,
+    Date,
+    DateTime,
+    Integer,
+    MetaData,
+    Numeric,
+    Table,
+    Text,
+    Uuid,
+    delete,
+    distinct,
+    exists,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    text,
+)
+from sqlalchemy.orm import Session
+
+from app.models.meal import Meal
+from app.models.meal_item import MealItem
+from app.repositories.daily_totals_repository import DailyTotalsRepository
+
+# Flat staging rows, one per item (meal columns repeated) or one per item-less meal.
+# Temporary: private to the importing connection, dropped at the end of the import.
+_stage = Table(
+    "meal_import_stage",
+    MetaData(),
+    Column("meal_id", Uuid, nullable=False),
+    Column("raw_text", Text, nullable=False),
+    Column("title", Text, nullable=False),
+    Column("total_calories", Integer, nullable=False),
+    Column("total_protein_g", Numeric(6, 2), nullable=False),
+    Column("meal_date", Date, nullable=False),
+    Column("created_at", DateTime(timezone=True), nullable=False),
+    Column("item_id", Uuid),
+    Column("item_position", Integer),
+    Column("item_name", Text),
+    Column("item_quantity", Numeric(8, 2)),
+    Column("item_unit", Text),
+    Column("item_calories", Integer),
+    Column("item_protein_g", Numeric(6, 2)),
+    prefixes=["TEMPORARY"],
+)
+
+STAGE_COLUMNS = tuple(c.name for c in _stage.columns)
+
+# Executemany batch for dialects without COPY (SQLite in local benchmarks).
+_INSERT_BATCH = 5000
+
+# One staged row per meal: its first item, or its only row when it has none.
+_meal_rows = or_(_stage.c.item_position.is_(None), _stage.c.item_position == 0)
+
+
+@dataclass
+class ImportCounts:
+    meals: int
+    items: int
+    skipped: int
+    dates: list[datetime.date]
+
+
+class MealImportRepository:
+    """
+    Bulk meal import: rows are staged in a temporary table (COPY on Postgres),
+    then merged into meals / meal_items / daily_totals with a handful of
+    set-based statements. Nothing commits here: the caller owns the transaction.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.daily_totals = DailyTotalsRepository(db)
+
+    def stage(self, rows: Iterable[tuple]) -> None:
+        """
+        Load `rows` (tuples in STAGE_COLUMNS order) into a fresh staging table.
+        `rows` is consumed lazily; an exception raised while producing it aborts the load.
+        """
+        conn = self.db.connection()
+        _stage.drop(conn, checkfirst=True)
+        _stage.create(conn)
+
+        if conn.dialect.name != "postgresql":
+            rows = iter(rows)
+            while batch := list(itertools.islice(rows, _INSERT_BATCH)):
+                conn.execute(insert(_stage), [dict(zip(STAGE_COLUMNS, row)) for row in batch])
+            return
+
+        # The session's own psycopg connection, so COPY joins its transaction.
+        raw = conn.connection.driver_connection
+        with raw.cursor() as cur:
+            with cur.copy(f"COPY {_stage.name} ({', '.join(STAGE_COLUMNS)}) FROM STDIN") as copy:
+                for row in rows:
+                    copy.write_row(row)
+        # Temporary tables are never auto-analyzed; the merge joins need row estimates.
+        conn.execute(text(f"ANALYZE {_stage.name}"))
+
+    def merge(self, user_id: uuid.UUID) -> ImportCounts:
+        """
+        Move the staged rows into the user's history. Meals that already exist
+        (same meal_date, created_at and raw_text) are skipped, so re-sending a
+        file is harmless. daily_totals gets one upsert per affected day.
+        """
+        staged = self.db.scalar(select(func.count(distinct(_stage.c.meal_id))))
+
+        self.db.execute(
+            delete(_stage).where(
+                exists().where(
+                    Meal.user_id == user_id,
+                    Meal.meal_date == _stage.c.meal_date,
+                    Meal.created_at == _stage.c.created_at,
+                    Meal.raw_text == _stage.c.raw_text,
+                )
+            )
+        )
+
+        # INSERT ... SELECT reports no usable rowcount; count the surviving rows instead.
+        meals, items = self.db.execute(
+            select(func.count().filter(_meal_rows), func.count(_stage.c.item_position))
+        ).one()
+
+        self.db.execute(
+            insert(Meal.__table__).from_select(
+                ["id", "user_id", "raw_text", "title", "total_calories", "total_protein_g", "meal_date", "created_at"],
+                select(
+                    _stage.c.meal_id,
+                    literal(user_id, Uuid),
+                    _stage.c.raw_text,
+                    _stage.c.title,
+                    _stage.c.total_calories,
+                    _stage.c.total_protein_g,
+                    _stage.c.meal_date,
+                    _stage.c.created_at,
+                ).where(_meal_rows),
+            )
+        )
+        self.db.execute(
+            insert(MealItem.__table__).from_select(
+                ["id", "meal_id", "name", "quantity", "unit", "calories", "protein_g", "position"],
+                select(
+                    _stage.c.item_id,
+                    _stage.c.meal_id,
+                    _stage.c.item_name,
+                    _stage.c.item_quantity,
+                    _stage.c.item_unit,
+                    _stage.c.item_calories,
+                    _stage.c.item_protein_g,
+                    _stage.c.item_position,
+                ).where(_stage.c.item_position.is_not(None)),
+            )
+        )
+
+        self.daily_totals.apply_deltas(
+            user_id,
+            select(
+                literal(user_id, Uuid),
+                _stage.c.meal_date,
+                func.count(),
+                func.sum(_stage.c.total_calories),
+                func.sum(_stage.c.total_protein_g),
+            )
+            .where(_meal_rows)
+            .group_by(_stage.c.meal_date)
+        )
+
+        dates = list(self.db.scalars(select(_stage.c.meal_date).distinct().order_by(_stage.c.meal_date)))
+        _stage.drop(self.db.connection())
+        return ImportCounts(meals=meals, items=items, skipped=staged - meals, dates=dates)
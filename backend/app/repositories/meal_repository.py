@@ -3,17 +3,152 @@ from __future__ import annotations
 import datetime
 import uuid
 from decimal import Decimal
-from typing import Iterable
+from typing import Iterable, Iterator, Sequence
 
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import DateTime, Row, Select, delete, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session, noload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.sql.functions import FunctionElement
 
 from app.models.meal import Meal
 from app.models.meal_item import MealItem
+from app.repositories.daily_totals_repository import AsyncDailyTotalsRepository, DailyTotalsRepository
+
+
+def _q2(value) -> Decimal | None:
+    # Match Numeric(_, 2) storage so in-memory rows equal what the DB holds.
+    if value is None:
+        return None
+    return Decimal(str(value)).quantize(Decimal("0.01"))
+
+
+class _keyset_ts(FunctionElement):
+    """
+    A timestamp as the keyset cursor compares and orders it: the column itself,
+    except on SQLite. There timestamps are text, `server_default=now()` stores
+    "YYYY-MM-DD HH:MM:SS" and bound datetimes carry ".ffffff", so both sides
+    are brought to one format (millisecond precision).
+    """
+
+    type = DateTime(timezone=True)
+    inherit_cache = True
+
+
+@compiles(_keyset_ts)
+def _keyset_ts_default(element, compiler, **kw):
+    return compiler.process(element.clauses, **kw)
+
+
+@compiles(_keyset_ts, "sqlite")
+def _keyset_ts_sqlite(element, compiler, **kw):
+    return "strftime('%%Y-%%m-%%d %%H:%%M:%%f', %s)" % compiler.process(element.clauses, **kw)
+
+
+def _meal_insert_stmt(**values):
+    # noload: the new meal has no items yet; don't let RETURNING trigger a selectin reload.
+    return insert(Meal).values(**values).returning(Meal).options(noload(Meal.items))
+
+
+def _items_insert_stmt():
+    return (
+        insert(MealItem)
+        .returning(MealItem, sort_by_parameter_order=True)
+        # keep NULL quantity/unit in the batch instead of splitting it per row shape
+        .execution_options(render_nulls=True)
+    )
+
+
+def _item_rows(meal_id: uuid.UUID, items: Iterable[dict]) -> list[dict]:
+    return [
+        {
+            "meal_id": meal_id,
+            "name": it["name"],
+            "quantity": it.get("quantity"),
+            "unit": it.get("unit"),
+            "calories": it["calories"],
+            "protein_g": it["protein_g"],
+            "position": idx,
+        }
+        for idx, it in enumerate(items)
+    ]
+
+
+def _get_stmt(meal_id: uuid.UUID, user_id: uuid.UUID | None = None, *, for_update: bool = False) -> Select:
+    stmt = select(Meal).options(selectinload(Meal.items)).where(Meal.id == meal_id)
+    if user_id is not None:
+        stmt = stmt.where(Meal.user_id == user_id)
+    if for_update:
+        # Row lock until commit: patch/delete derive the daily_totals delta from
+        # the loaded totals, so concurrent writers must see each other's result.
+        stmt = stmt.with_for_update(of=Meal)
+    return stmt
+
+
+def _list_stmt(
+    user_id: uuid.UUID,
+    *,
+    date: datetime.date | None,
+    limit: int,
+    offset: int,
+    after: tuple[datetime.datetime, uuid.UUID] | None,
+) -> Select:
+    stmt = select(Meal).options(selectinload(Meal.items)).where(Meal.user_id == user_id)
+    if date is not None:
+        stmt = stmt.where(Meal.meal_date == date)
+
+    created = _keyset_ts(Meal.created_at)
+    if after is not None:
+        created_at, meal_id = after
+        after_ts = _keyset_ts(created_at)
+        # Expanded row comparison: the first conjunct is a plain index range.
+        stmt = stmt.where(
+            created <= after_ts,
+            or_(created < after_ts, Meal.id < meal_id),
+        )
+        offset = 0
+
+    return stmt.order_by(created.desc(), Meal.id.desc()).limit(limit).offset(offset)
+
+
+def _day_briefs_stmt(user_id: uuid.UUID, date: datetime.date) -> Select:
+    return (
+        select(Meal.id, Meal.title, Meal.total_calories, Meal.total_protein_g)
+        .where(Meal.user_id == user_id, Meal.meal_date == date)
+        .order_by(Meal.created_at.asc())
+    )
+
+
+def _export_stmt(user_id: uuid.UUID) -> Select:
+    # Flat meal x item rows (items outer-joined), oldest meal first, items in position order.
+    return (
+        select(
+            Meal.id,
+            Meal.meal_date,
+            Meal.created_at,
+            Meal.title,
+            Meal.raw_text,
+            Meal.total_calories,
+            Meal.total_protein_g,
+            MealItem.id.label("item_id"),
+            MealItem.position.label("item_position"),
+            MealItem.name.label("item_name"),
+            MealItem.quantity.label("item_quantity"),
+            MealItem.unit.label("item_unit"),
+            MealItem.calories.label("item_calories"),
+            MealItem.protein_g.label("item_protein_g"),
+        )
+        .outerjoin(MealItem, MealItem.meal_id == Meal.id)
+        .where(Meal.user_id == user_id)
+        .order_by(Meal.created_at.asc(), Meal.id.asc(), MealItem.position.asc())
+    )
 
 
 class MealRepository:
     def __init__(self, db: Session):
         self.db = db
+        self.daily_totals = DailyTotalsRepository(db)
 
     def create_meal_with_items(
         self,
@@ -26,41 +161,38 @@ class MealRepository:
         meal_date: datetime.date,
         items: Iterable[dict],
     ) -> Meal:
-        meal = Meal(
+        # INSERT ... RETURNING for the meal, then one multi-row INSERT ... RETURNING
+        # for its items. The response is built from the returned rows (no refresh).
+        meal = self.db.scalars(
+            _meal_insert_stmt(
+                user_id=user_id,
+                raw_text=raw_text,
+                title=title,
+                total_calories=total_calories,
+                total_protein_g=total_protein_g,
+                meal_date=meal_date,
+            )
+        ).one()
+
+        item_rows = _item_rows(meal.id, items)
+        meal_items = list(self.db.scalars(_items_insert_stmt(), item_rows)) if item_rows else []
+        set_committed_value(meal, "items", meal_items)
+
+        self.daily_totals.apply_delta(
             user_id=user_id,
-            raw_text=raw_text,
-            title=title,
-            total_calories=total_calories,
-            total_protein_g=total_protein_g,
-            meal_date=meal_date,
+            date=meal_date,
+            meals=1,
+            calories=meal.total_calories,
+            protein_g=meal.total_protein_g,
         )
-        self.db.add(meal)
-        self.db.flush()  # populate meal.id
-
-        for idx, it in enumerate(items):
-            self.db.add(
-                MealItem(
-                    meal_id=meal.id,
-                    name=it["name"],
-                    quantity=it.get("quantity"),
-                    unit=it.get("unit"),
-                    calories=it["calories"],
-                    protein_g=it["protein_g"],
-                    position=idx,
-                )
-            )
 
+        # Detach before commit so the returned rows are not expired (and re-queried).
+        self.db.expunge(meal)
         self.db.commit()
-        self.db.refresh(meal)
         return meal
 
     def get_by_id(self, meal_id: uuid.UUID) -> Meal | None:
-        return (
-            self.db.query(Meal)
-            .options(selectinload(Meal.items))
-            .filter(Meal.id == meal_id)
-            .one_or_none()
-        )
+        return self.db.scalars(_get_stmt(meal_id)).one_or_none()
 
     def list_by_user(
         self,
@@ -69,23 +201,35 @@ class MealRepository:
         date: datetime.date | None = None,
         limit: int = 50,
         offset: int = 0,
+        after: tuple[datetime.datetime, uuid.UUID] | None = None,
     ) -> list[Meal]:
-        q = (
-            self.db.query(Meal)
-            .options(selectinload(Meal.items))
-            .filter(Meal.user_id == user_id)
-        )
-        if date is not None:
-            q = q.filter(Meal.meal_date == date)
-
-        return (
-            q.order_by(Meal.created_at.desc())
-            .limit(limit)
-            .offset(offset)
-            .all()
+        """
+        Newest first, ordered by (created_at, id).
+        `after` switches to keyset pagination: rows strictly older than the given
+        (created_at, id) boundary, served by ix_meals_user_created_at.
+        """
+        return list(
+            self.db.scalars(_list_stmt(user_id, date=date, limit=limit, offset=offset, after=after))
         )
 
+    def iter_export_rows(self, user_id: uuid.UUID, *, batch_size: int = 1000) -> Iterator[Sequence[Row]]:
+        """
+        The user's whole history as flat meal x item rows (see `_export_stmt`),
+        in batches of `batch_size` fetched from a server-side cursor: only one
+        batch is held in memory at a time. Consume it inside the session's transaction.
+        """
+        result = self.db.execute(_export_stmt(user_id).execution_options(yield_per=batch_size))
+        yield from result.partitions()
+
     def delete(self, meal: Meal) -> None:
+        # `meal` must be loaded with for_update=True (see _get_stmt).
+        self.daily_totals.apply_delta(
+            user_id=meal.user_id,
+            date=meal.meal_date,
+            meals=-1,
+            calories=-meal.total_calories,
+            protein_g=-meal.total_protein_g,
+        )
         self.db.delete(meal)
         self.db.commit()
 
@@ -95,48 +239,192 @@ class MealRepository:
         *,
         title: str | None,
         items: Iterable[dict] | None,
+        total_calories: int | None = None,
+        total_protein_g: Decimal | None = None,
     ) -> Meal:
+        """
+        Apply a patch with the minimal set of statements: one UPDATE for the meal
+        (title + totals), then positional item diffs as batched UPDATE / DELETE /
+        INSERT. The returned meal is built from the diffed rows (no refresh).
+        `meal` must be loaded with for_update=True (see _get_stmt).
+        """
+        meal_values: dict = {}
         if title is not None:
-            meal.title = title
+            meal_values["title"] = title
+        if total_calories is not None:
+            meal_values["total_calories"] = total_calories
+        if total_protein_g is not None:
+            meal_values["total_protein_g"] = _q2(total_protein_g)
+
+        if total_calories is not None or total_protein_g is not None:
+            self.daily_totals.apply_delta(
+                user_id=meal.user_id,
+                date=meal.meal_date,
+                calories=meal_values.get("total_calories", meal.total_calories) - meal.total_calories,
+                protein_g=meal_values.get("total_protein_g", meal.total_protein_g) - meal.total_protein_g,
+            )
+
+        if meal_values:
+            self.db.execute(
+                update(Meal)
+                .where(Meal.id == meal.id)
+                .values(**meal_values)
+                .execution_options(synchronize_session=False)
+            )
+            for key, value in meal_values.items():
+                set_committed_value(meal, key, value)
 
         if items is not None:
-            meal.items.clear()
-            self.db.flush()
-            for idx, it in enumerate(items):
-                meal.items.append(
-                    MealItem(
-                        meal_id=meal.id,
-                        name=it["name"],
-                        quantity=it.get("quantity"),
-                        unit=it.get("unit"),
-                        calories=it["calories"],
-                        protein_g=it["protein_g"],
-                        position=idx,
-                    )
-                )
+            set_committed_value(meal, "items", self._sync_items(meal, list(items)))
 
+        # Detach before commit so the patched rows are not expired (and re-queried).
+        self.db.expunge(meal)
         self.db.commit()
-        self.db.refresh(meal)
         return meal
 
-    def day_summary(
+    def _sync_items(self, meal: Meal, items: list[dict]) -> list[MealItem]:
+        existing = sorted(meal.items, key=lambda x: x.position)
+        result: list[MealItem] = []
+        updates: list[dict] = []
+        inserts: list[dict] = []
+
+        for idx, it in enumerate(items):
+            values = {
+                "name": it["name"],
+                "quantity": _q2(it.get("quantity")),
+                "unit": it.get("unit"),
+                "calories": int(it["calories"]),
+                "protein_g": _q2(it["protein_g"]),
+            }
+            if idx >= len(existing):
+                inserts.append({"meal_id": meal.id, "position": idx, **values})
+                continue
+
+            row = existing[idx]
+            if any(getattr(row, key) != value for key, value in values.items()):
+                updates.append({"id": row.id, **values})
+                for key, value in values.items():
+                    set_committed_value(row, key, value)
+            result.append(row)
+
+        stale_ids = [row.id for row in existing[len(items):]]
+
+        if updates:
+            # ORM bulk UPDATE by primary key: a single executemany batch.
+            self.db.execute(update(MealItem), updates)
+        if stale_ids:
+            self.db.execute(
+                delete(MealItem)
+                .where(MealItem.id.in_(stale_ids))
+                .execution_options(synchronize_session=False)
+            )
+        if inserts:
+            result.extend(self.db.scalars(_items_insert_stmt(), inserts))
+        return result
+
+    def day_totals(
+        self,
+        user_id: uuid.UUID,
+        date: datetime.date,
+    ) -> tuple[int, int, Decimal]:
+        """
+        (meals_count, total_calories, total_protein_g) for one day,
+        read from the daily_totals rollup (single primary-key lookup).
+        """
+        return self.daily_totals.get(user_id, date)
+
+    def day_meal_briefs(
         self,
         user_id: uuid.UUID,
         date: datetime.date,
-    ) -> tuple[list[Meal], int, Decimal]:
-        meals = (
-            self.db.query(Meal)
-            .options(selectinload(Meal.items))
-            .filter(Meal.user_id == user_id, Meal.meal_date == date)
-            .order_by(Meal.created_at.asc())
-            .all()
+    ) -> list[Row]:
+        """
+        Brief-only projection of a day's meals (id, title, totals):
+        no items and no raw_text are loaded.
+        """
+        return list(self.db.execute(_day_briefs_stmt(user_id, date)).all())
+
+    def get_by_id_for_user(
+        self,
+        meal_id: uuid.UUID,
+        user_id: uuid.UUID,
+        *,
+        for_update: bool = False,
+    ) -> Meal | None:
+        return self.db.scalars(_get_stmt(meal_id, user_id, for_update=for_update)).one_or_none()
+
+
+class AsyncMealRepository:
+    """
+    Async counterpart of `MealRepository` for the endpoints served on the event loop:
+    reads plus meal creation. Patch/delete stay on the sync repository.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.daily_totals = AsyncDailyTotalsRepository(db)
+
+    async def create_meal_with_items(
+        self,
+        *,
+        user_id: uuid.UUID,
+        raw_text: str,
+        title: str,
+        total_calories: int,
+        total_protein_g: Decimal,
+        meal_date: datetime.date,
+        items: Iterable[dict],
+    ) -> Meal:
+        meal = (
+            await self.db.scalars(
+                _meal_insert_stmt(
+                    user_id=user_id,
+                    raw_text=raw_text,
+                    title=title,
+                    total_calories=total_calories,
+                    total_protein_g=total_protein_g,
+                    meal_date=meal_date,
+                )
+            )
+        ).one()
+
+        item_rows = _item_rows(meal.id, items)
+        meal_items = list(await self.db.scalars(_items_insert_stmt(), item_rows)) if item_rows else []
+        set_committed_value(meal, "items", meal_items)
+
+        await self.daily_totals.apply_delta(
+            user_id=user_id,
+            date=meal_date,
+            meals=1,
+            calories=meal.total_calories,
+            protein_g=meal.total_protein_g,
         )
 
-        total_calories = sum(m.total_calories for m in meals)
-        total_protein = sum(m.total_protein_g for m in meals)
+        self.db.expunge(meal)
+        await self.db.commit()
+        return meal
+
+    async def get_by_id(self, meal_id: uuid.UUID) -> Meal | None:
+        return (await self.db.scalars(_get_stmt(meal_id))).one_or_none()
+
+    async def get_by_id_for_user(self, meal_id: uuid.UUID, user_id: uuid.UUID) -> Meal | None:
+        return (await self.db.scalars(_get_stmt(meal_id, user_id))).one_or_none()
+
+    async def list_by_user(
+        self,
+        user_id: uuid.UUID,
+        *,
+        date: datetime.date | None = None,
+        limit: int = 50,
+        offset: int = 0,
+        after: tuple[datetime.datetime, uuid.UUID] | None = None,
+    ) -> list[Meal]:
+        return list(
+            await self.db.scalars(_list_stmt(user_id, date=date, limit=limit, offset=offset, after=after))
+        )
 
-        return meals, total_calories, total_protein
-    
-    def get_by_id_for_user(self, meal_id: uuid.UUID, user_id: uuid.UUID) -> Meal | None:
-        return (self.db.query(Meal).options(selectinload(Meal.items)).filter(Meal.id == meal_id, Meal.user_id == user_id).one_or_none())
+    async def day_totals(self, user_id: uuid.UUID, date: datetime.date) -> tuple[int, int, Decimal]:
+        return await self.daily_totals.get(user_id, date)
 
+    async def day_meal_briefs(self, user_id: uuid.UUID, date: datetime.date) -> list[Row]:
+        return list((await self.db.execute(_day_briefs_stmt(user_id, date))).all())
@@ -3,6 +3,8 @@ from __future__ import annotations
 import datetime
 import uuid
 
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.models.telegram_link import TelegramLink
@@ -62,3 +64,48 @@ class TelegramRepository:
     def mark_code_used(self, row: TelegramLinkCode) -> None:
         row.used_at = datetime.datetime.now(datetime.timezone.utc)
         self.db.commit()
+
+
+class AsyncTelegramRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_link_by_user(self, user_id: uuid.UUID) -> TelegramLink | None:
+        return (await self.db.scalars(select(TelegramLink).where(TelegramLink.user_id == user_id))).one_or_none()
+
+    async def get_link_by_chat(self, chat_id: int) -> TelegramLink | None:
+        return (await self.db.scalars(select(TelegramLink).where(TelegramLink.chat_id == chat_id))).one_or_none()
+
+    async def create_link(self, *, user_id: uuid.UUID, chat_id: int) -> TelegramLink:
+        link = TelegramLink(user_id=user_id, chat_id=chat_id)
+        self.db.add(link)
+        await self.db.commit()
+        await self.db.refresh(link)
+        return link
+
+    async def create_link_code(
+        self,
+        *,
+        user_id: uuid.UUID,
+        code_hash: str,
+        expires_at: datetime.datetime,
+    ) -> TelegramLinkCode:
+        row = TelegramLinkCode(
+            user_id=user_id,
+            code_hash=code_hash,
+            expires_at=expires_at,
+            used_at=None,
+        )
+        self.db.add(row)
+        await self.db.commit()
+        await self.db.refresh(row)
+        return row
+
+    async def get_code(self, code_hash: str) -> TelegramLinkCode | None:
+        return (
+            await self.db.scalars(select(TelegramLinkCode).where(TelegramLinkCode.code_hash == code_hash))
+        ).one_or_none()
+
+    async def mark_code_used(self, row: TelegramLinkCode) -> None:
+        row.used_at = datetime.datetime.now(datetime.timezone.utc)
+        await self.db.commit()
@@ -3,8 +3,11 @@ from __future__ import annotations
 import uuid
 from decimal import Decimal
 
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.auth.principal import principal_cache
 from app.models.user import User
 
 
@@ -42,5 +45,41 @@ class UserRepository:
             user.goal_protein_g = goal_protein_g
 
         self.db.commit()
+        principal_cache.invalidate(user.id)
         self.db.refresh(user)
         return user
+
+
+class AsyncUserRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_by_id(self, user_id: uuid.UUID) -> User | None:
+        return await self.db.get(User, user_id)
+
+    async def get_by_email(self, email: str) -> User | None:
+        return (await self.db.scalars(select(User).where(User.email == email))).one_or_none()
+
+    async def create(self, *, email: str, hashed_password: str) -> User:
+        user = User(email=email, hashed_password=hashed_password)
+        self.db.add(user)
+        await self.db.commit()
+        await self.db.refresh(user)
+        return user
+
+    async def update_goals(
+        self,
+        user: User,
+        *,
+        goal_calories: int | None,
+        goal_protein_g: Decimal | None,
+    ) -> User:
+        if goal_calories is not None:
+            user.goal_calories = goal_calories
+        if goal_protein_g is not None:
+            user.goal_protein_g = goal_protein_g
+
+        await self.db.commit()
+        await principal_cache.invalidate_async(user.id)
+        await self.db.refresh(user)
+        return user
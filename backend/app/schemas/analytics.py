@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import datetime
+
+from pydantic import BaseModel
+
+
+class SeriesStats(BaseModel):
+    avg_7d: float | None = None
+    avg_30d: float | None = None
+    mean: float | None = None
+    variance: float | None = None
+
+
+class StreakStats(BaseModel):
+    current: int
+    longest: int
+
+
+class WeekdayStats(BaseModel):
+    weekday: int  # 0 = Monday
+    days: int
+    avg_calories: float | None = None
+    avg_protein_g: float | None = None
+
+
+class AnalyticsSummaryOut(BaseModel):
+    first_date: datetime.date | None = None
+    last_date: datetime.date | None = None
+    days_tracked: int
+    calories: SeriesStats
+    protein_g: SeriesStats
+    # None when the user has no goals set.
+    streaks: StreakStats | None = None
+    weekdays: list[WeekdayStats]
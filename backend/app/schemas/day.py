@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import datetime
 import uuid
+from typing import Literal
 
 from pydantic import BaseModel
 
@@ -31,3 +32,21 @@ class DaySummaryOut(BaseModel):
     goals: DayGoals
     progress: DayProgress
     meals: list[DayMealBrief]
+
+
+class DayBucketOut(BaseModel):
+    start: datetime.date
+    end: datetime.date
+    days: int
+    meals_count: int
+    totals: MealTotals
+    # Daily goals scaled by the number of days in the bucket.
+    progress: DayProgress
+
+
+class DayRangeOut(BaseModel):
+    start: datetime.date
+    end: datetime.date
+    bucket: Literal["day", "week", "month"]
+    goals: DayGoals
+    buckets: list[DayBucketOut]
@@ -3,8 +3,9 @@ from __future__ import annotations
 import datetime
 import uuid
 from decimal import Decimal
+from typing import Literal
 
-from pydantic import BaseModel, ConfigDict, Field, computed_field
+from pydantic import BaseModel, ConfigDict, Field, computed_field, model_validator
 
 
 class MealItemIn(BaseModel):
@@ -57,3 +58,57 @@ class MealOut(BaseModel):
             calories=int(self.total_calories),
             protein_g=self.total_protein_g,
         )
+
+
+class MealJobOut(BaseModel):
+    job_id: uuid.UUID
+    status: Literal["queued", "running", "succeeded", "failed"]
+    meal: MealOut | None = None
+    # When failed: MEAL_PARSE_FAILED (LLM step), MEAL_SAVE_FAILED (storing the meal)
+    # or MEAL_JOB_LOST (the worker running it went away before finishing).
+    error: str | None = None
+
+
+class MealImportItem(BaseModel):
+    # Bounds mirror the meal_items columns so bad rows fail validation, not the COPY.
+    name: str = Field(min_length=1)
+    quantity: Decimal | None = Field(default=None, ge=0, lt=1_000_000)
+    unit: str | None = None
+    calories: int = Field(ge=0, le=2_147_483_647)
+    protein_g: Decimal = Field(ge=0, lt=10_000)
+
+
+class MealImportTotals(BaseModel):
+    calories: int = Field(ge=0, le=2_147_483_647)
+    protein_g: Decimal = Field(ge=0, lt=10_000)
+
+
+class MealImportRecord(BaseModel):
+    """
+    One imported meal; the NDJSON export lines are valid records. Without `totals`
+    the item sums are used; without `created_at` the meal is placed at noon
+    (APP_TIMEZONE) on its meal_date. Any `id` is ignored.
+    """
+
+    title: str = Field(min_length=1)
+    raw_text: str = ""
+    meal_date: datetime.date
+    created_at: datetime.datetime | None = None
+    items: list[MealImportItem] = Field(default_factory=list)
+    totals: MealImportTotals | None = None
+
+    @model_validator(mode="after")
+    def _default_totals(self) -> "MealImportRecord":
+        if self.totals is None:
+            self.totals = MealImportTotals(
+                calories=sum(it.calories for it in self.items),
+                protein_g=sum((it.protein_g for it in self.items), Decimal("0")),
+            )
+        return self
+
+
+class MealImportOut(BaseModel):
+    meals_imported: int
+    items_imported: int
+    meals_skipped: int
+    days_affected: int
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import datetime
+import os
+from typing import Any
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.infra.redis.cache import cache_get_str, cache_incr, cache_incr_async, cache_set_str
+from app.infra.redis.keys import analytics_summary_key, analytics_version_key
+from app.repositories.daily_totals_repository import DailyTotalsRepository
+from app.schemas.analytics import AnalyticsSummaryOut, SeriesStats, StreakStats, WeekdayStats
+
+
+def bump_analytics_version(user_id: Any) -> None:
+    """
+    Invalidate every cached analytics summary of a user.
+    Call after any meal write.
+    """
+    cache_incr(analytics_version_key(user_id))
+
+
+async def bump_analytics_version_async(user_id: Any) -> None:
+    # Same as bump_analytics_version, for code on the event loop (redis.asyncio).
+    await cache_incr_async(analytics_version_key(user_id))
+
+
+def _window_avg(values: np.ndarray, logged: np.ndarray, window: int) -> float | None:
+    # Average over the *logged* days of the last `window` calendar days.
+    count = int(logged[-window:].sum())
+    if count == 0:
+        return None
+    return round(float(values[-window:].sum()) / count, 2)
+
+
+def _series_stats(values: np.ndarray, logged: np.ndarray) -> SeriesStats:
+    logged_values = values[logged]
+    return SeriesStats(
+        avg_7d=_window_avg(values, logged, 7),
+        avg_30d=_window_avg(values, logged, 30),
+        mean=round(float(logged_values.mean()), 2),
+        variance=round(float(logged_values.var()), 2),
+    )
+
+
+def _streaks(adherent: np.ndarray) -> StreakStats:
+    # Run lengths of consecutive adherent days via edges of the padded mask.
+    edges = np.diff(np.concatenate(([0], adherent.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    lengths = ends - starts
+    if lengths.size == 0:
+        return StreakStats(current=0, longest=0)
+
+    n = adherent.size
+    # Today is still in progress: a streak ending yesterday is still current.
+    current = int(lengths[-1]) if ends[-1] >= n - 1 else 0
+    return StreakStats(current=current, longest=int(lengths.max()))
+
+
+def compute_summary(
+    dates: np.ndarray,
+    calories: np.ndarray,
+    protein: np.ndarray,
+    *,
+    today: datetime.date,
+    goal_calories: float | None,
+    goal_protein_g: float | None,
+) -> AnalyticsSummaryOut:
+    """
+    Vectorized summary over a user's daily series.
+    `dates` (datetime64[D], ascending) are the logged days; calories/protein align with them.
+    """
+    if dates.size == 0:
+        return AnalyticsSummaryOut(
+            days_tracked=0,
+            calories=SeriesStats(),
+            protein_g=SeriesStats(),
+            weekdays=[WeekdayStats(weekday=d, days=0) for d in range(7)],
+        )
+
+    first = dates[0]
+    end = max(np.datetime64(today, "D"), dates[-1])
+    n_days = int((end - first).astype(int)) + 1
+    offsets = (dates - first).astype(int)
+
+    # Dense calendar arrays: one slot per day from the first logged day to today.
+    cal = np.zeros(n_days)
+    pro = np.zeros(n_days)
+    logged = np.zeros(n_days, dtype=bool)
+    cal[offsets] = calories
+    pro[offsets] = protein
+    logged[offsets] = True
+
+    streaks = None
+    if goal_calories is not None or goal_protein_g is not None:
+        adherent = logged.copy()
+        if goal_calories is not None:
+            adherent &= cal <= goal_calories
+        if goal_protein_g is not None:
+            adherent &= pro >= goal_protein_g
+        streaks = _streaks(adherent)
+
+    # datetime64 epoch (1970-01-01) was a Thursday.
+    weekday = (np.arange(n_days) + int(first.astype(int)) + 3) % 7
+    wd_logged = weekday[logged]
+    wd_days = np.bincount(wd_logged, minlength=7)
+    wd_cal = np.bincount(wd_logged, weights=cal[logged], minlength=7)
+    wd_pro = np.bincount(wd_logged, weights=pro[logged], minlength=7)
+
+    weekdays = [
+        WeekdayStats(
+            weekday=d,
+            days=int(wd_days[d]),
+            avg_calories=round(float(wd_cal[d] / wd_days[d]), 2) if wd_days[d] else None,
+            avg_protein_g=round(float(wd_pro[d] / wd_days[d]), 2) if wd_days[d] else None,
+        )
+        for d in range(7)
+    ]
+
+    return AnalyticsSummaryOut(
+        first_date=first.item(),
+        last_date=dates[-1].item(),
+        days_tracked=int(dates.size),
+        calories=_series_stats(cal, logged),
+        protein_g=_series_stats(pro, logged),
+        streaks=streaks,
+        weekdays=weekdays,
+    )
+
+
+class AnalyticsService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.daily_totals = DailyTotalsRepository(db)
+
+    def _load_series(self, user_id: Any) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        rows = self.daily_totals.get_series(user_id)
+        dates = np.array([r.date for r in rows], dtype="datetime64[D]")
+        calories = np.array([r.calories for r in rows], dtype=np.float64)
+        protein = np.array([float(r.protein_g) for r in rows], dtype=np.float64)
+        return dates, calories, protein
+
+    def get_summary(self, user: Any, today: datetime.date) -> AnalyticsSummaryOut:
+        goal_calories = float(user.goal_calories) if user.goal_calories is not None else None
+        goal_protein = float(user.goal_protein_g) if user.goal_protein_g is not None else None
+
+        version = cache_get_str(analytics_version_key(user.id)) or "0"
+        fingerprint = f"{today.isoformat()}:{goal_calories}:{goal_protein}"
+        key = analytics_summary_key(user.id, version, fingerprint)
+
+        cached = cache_get_str(key)
+        if cached:
+            return AnalyticsSummaryOut.model_validate_json(cached)
+
+        dates, calories, protein = self._load_series(user.id)
+        result = compute_summary(
+            dates,
+            calories,
+            protein,
+            today=today,
+            goal_calories=goal_calories,
+            goal_protein_g=goal_protein,
+        )
+        ttl_seconds = int(os.getenv("ANALYTICS_CACHE_TTL_SECONDS", "3600"))
+        cache_set_str(key, result.model_dump_json(), ttl_seconds=ttl_seconds)
+        return result
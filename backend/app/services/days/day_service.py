@@ -2,73 +2,201 @@ from __future__ import annotations
 
 import os
 import datetime
+from decimal import Decimal
 from typing import Any
 
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.infra.redis.cache import cache_get_str, cache_set_str
+from app.core.errors import ErrorCodes, http_error
+from app.infra.redis.cache import (
+    cache_get_str,
+    cache_get_str_async,
+    cache_mget_str,
+    cache_mget_str_async,
+    cache_set_str,
+    cache_set_str_async,
+)
 from app.infra.redis.keys import day_summary_key
-from app.repositories.meal_repository import MealRepository
-from app.schemas.day import DayGoals, DayMealBrief, DayProgress, DaySummaryOut
+from app.repositories.meal_repository import AsyncMealRepository, MealRepository
+from app.schemas.day import DayBucketOut, DayGoals, DayMealBrief, DayProgress, DayRangeOut, DaySummaryOut
 from app.schemas.meal import MealTotals
 
 
+MAX_RANGE_DAYS = 366
+
+
 def _calc_progress(total: float, goal: float | None) -> float | None:
     if goal is None or goal <= 0:
         return None
     return round((total / goal) * 100.0, 2)
 
 
-class DayService:
-    def __init__(self, db: Session):
-        self.db = db
-        self.meal_repo = MealRepository(db)
+def _bucket_start(date: datetime.date, bucket: str) -> datetime.date:
+    if bucket == "week":
+        return date - datetime.timedelta(days=date.weekday())  # ISO week, Monday
+    if bucket == "month":
+        return date.replace(day=1)
+    return date
 
-    def _build_day_summary(self, user: Any, date: datetime.date) -> DaySummaryOut:
-        meals, total_cal, total_pro = self.meal_repo.day_summary(user.id, date)
 
-        goals = DayGoals(
-            calories=user.goal_calories,
-            protein_g=float(user.goal_protein_g) if user.goal_protein_g is not None else None,
-        )
+def _goals(user: Any) -> DayGoals:
+    return DayGoals(
+        calories=user.goal_calories,
+        protein_g=float(user.goal_protein_g) if user.goal_protein_g is not None else None,
+    )
 
-        progress = DayProgress(
-            calories_pct=_calc_progress(
-                float(total_cal),
-                float(goals.calories) if goals.calories is not None else None,
-            ),
-            protein_pct=_calc_progress(
-                float(total_pro),
-                float(goals.protein_g) if goals.protein_g is not None else None,
+
+def _day_summary(
+    user: Any,
+    date: datetime.date,
+    totals: tuple[int, int, Decimal],
+    meals: list[Row],
+) -> DaySummaryOut:
+    meals_count, total_cal, total_pro = totals
+    goals = _goals(user)
+
+    progress = DayProgress(
+        calories_pct=_calc_progress(
+            float(total_cal),
+            float(goals.calories) if goals.calories is not None else None,
+        ),
+        protein_pct=_calc_progress(
+            float(total_pro),
+            float(goals.protein_g) if goals.protein_g is not None else None,
+        ),
+    )
+
+    meal_briefs = [
+        DayMealBrief(
+            id=m.id,
+            title=m.title,
+            totals=MealTotals(
+                calories=int(m.total_calories),
+                protein_g=float(m.total_protein_g),
             ),
         )
+        for m in meals
+    ]
+
+    return DaySummaryOut(
+        date=date,
+        meals_count=meals_count,
+        totals=MealTotals(
+            calories=int(total_cal),
+            protein_g=float(total_pro),
+        ),
+        goals=goals,
+        progress=progress,
+        meals=meal_briefs,
+    )
 
-        meal_briefs = [
-            DayMealBrief(
-                id=m.id,
-                title=m.title,
-                totals=MealTotals(
-                    calories=int(m.total_calories),
-                    protein_g=float(m.total_protein_g),
+
+def _range_days(start: datetime.date, end: datetime.date) -> list[datetime.date]:
+    if end < start or (end - start).days >= MAX_RANGE_DAYS:
+        raise http_error(400, ErrorCodes.DAY_RANGE_INVALID, f"Range must be 1..{MAX_RANGE_DAYS} days")
+    return [start + datetime.timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+def _cached_days(
+    user: Any,
+    days: list[datetime.date],
+) -> tuple[dict[datetime.date, tuple[int, int, float]], list[datetime.date]]:
+    # Day-level values from cached day summaries (one MGET); returns (hits, misses).
+    return _split_cached(days, cache_mget_str([day_summary_key(user.id, d) for d in days]))
+
+
+async def _cached_days_async(
+    user: Any,
+    days: list[datetime.date],
+) -> tuple[dict[datetime.date, tuple[int, int, float]], list[datetime.date]]:
+    return _split_cached(days, await cache_mget_str_async([day_summary_key(user.id, d) for d in days]))
+
+
+def _split_cached(
+    days: list[datetime.date],
+    cached: list[str | None],
+) -> tuple[dict[datetime.date, tuple[int, int, float]], list[datetime.date]]:
+    per_day: dict[datetime.date, tuple[int, int, float]] = {}
+    missing: list[datetime.date] = []
+    for day, raw in zip(days, cached):
+        if raw:
+            summary = DaySummaryOut.model_validate_json(raw)
+            per_day[day] = (summary.meals_count, int(summary.totals.calories), float(summary.totals.protein_g))
+        else:
+            missing.append(day)
+    return per_day, missing
+
+
+def _fill_missing(
+    per_day: dict[datetime.date, tuple[int, int, float]],
+    missing: list[datetime.date],
+    rows: dict[datetime.date, tuple[int, int, Decimal]],
+) -> None:
+    for day in missing:
+        count, calories, protein = rows.get(day, (0, 0, 0))
+        per_day[day] = (count, calories, float(protein))
+
+
+def _range_out(
+    user: Any,
+    start: datetime.date,
+    end: datetime.date,
+    bucket: str,
+    days: list[datetime.date],
+    per_day: dict[datetime.date, tuple[int, int, float]],
+) -> DayRangeOut:
+    goals = _goals(user)
+
+    grouped: dict[datetime.date, list[datetime.date]] = {}
+    for day in days:
+        grouped.setdefault(_bucket_start(day, bucket), []).append(day)
+
+    buckets = []
+    for bucket_days in grouped.values():
+        meals_count = sum(per_day[d][0] for d in bucket_days)
+        total_cal = sum(per_day[d][1] for d in bucket_days)
+        total_pro = sum(per_day[d][2] for d in bucket_days)
+        n_days = len(bucket_days)
+        buckets.append(
+            DayBucketOut(
+                start=bucket_days[0],
+                end=bucket_days[-1],
+                days=n_days,
+                meals_count=meals_count,
+                totals=MealTotals(calories=total_cal, protein_g=round(total_pro, 2)),
+                progress=DayProgress(
+                    calories_pct=_calc_progress(
+                        float(total_cal),
+                        float(goals.calories) * n_days if goals.calories is not None else None,
+                    ),
+                    protein_pct=_calc_progress(
+                        total_pro,
+                        goals.protein_g * n_days if goals.protein_g is not None else None,
+                    ),
                 ),
             )
-            for m in meals
-        ]
-
-        return DaySummaryOut(
-            date=date,
-            meals_count=len(meals),
-            totals=MealTotals(
-                calories=int(total_cal),
-                protein_g=float(total_pro),
-            ),
-            goals=goals,
-            progress=progress,
-            meals=meal_briefs,
         )
 
+    return DayRangeOut(start=start, end=end, bucket=bucket, goals=goals, buckets=buckets)
+
+
+def _summary_ttl_seconds() -> int:
+    return int(os.getenv("DAY_SUMMARY_CACHE_TTL_SECONDS", "120"))
+
+
+class DayService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.meal_repo = MealRepository(db)
+
+    def _build_day_summary(self, user: Any, date: datetime.date) -> DaySummaryOut:
+        totals = self.meal_repo.day_totals(user.id, date)
+        meals = self.meal_repo.day_meal_briefs(user.id, date)
+        return _day_summary(user, date, totals, meals)
+
     def get_day_summary(self, user: Any, date: datetime.date) -> DaySummaryOut:
-        ttl_seconds = int(os.getenv("DAY_SUMMARY_CACHE_TTL_SECONDS", "120"))
         key = day_summary_key(user.id, date)
 
         cached = cache_get_str(key)
@@ -76,5 +204,64 @@ class DayService:
             return DaySummaryOut.model_validate_json(cached)
 
         result = self._build_day_summary(user=user, date=date)
-        cache_set_str(key, result.model_dump_json(), ttl_seconds=ttl_seconds)
+        cache_set_str(key, result.model_dump_json(), ttl_seconds=_summary_ttl_seconds())
+        return result
+
+    def get_range(
+        self,
+        user: Any,
+        start: datetime.date,
+        end: datetime.date,
+        bucket: str,
+    ) -> DayRangeOut:
+        """
+        Per-bucket totals and goal progress for start..end (inclusive).
+
+        Day-level values come from cached day summaries (one MGET);
+        only the misses are filled from the daily_totals rollup, in one range query.
+        """
+        days = _range_days(start, end)
+        per_day, missing = _cached_days(user, days)
+        if missing:
+            _fill_missing(per_day, missing, self.meal_repo.daily_totals.get_range(user.id, missing[0], missing[-1]))
+        return _range_out(user, start, end, bucket, days, per_day)
+
+
+class AsyncDayService:
+    """
+    `DayService` over an AsyncSession (same cache keys and payloads).
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.meal_repo = AsyncMealRepository(db)
+
+    async def _build_day_summary(self, user: Any, date: datetime.date) -> DaySummaryOut:
+        totals = await self.meal_repo.day_totals(user.id, date)
+        meals = await self.meal_repo.day_meal_briefs(user.id, date)
+        return _day_summary(user, date, totals, meals)
+
+    async def get_day_summary(self, user: Any, date: datetime.date) -> DaySummaryOut:
+        key = day_summary_key(user.id, date)
+
+        cached = await cache_get_str_async(key)
+        if cached:
+            return DaySummaryOut.model_validate_json(cached)
+
+        result = await self._build_day_summary(user=user, date=date)
+        await cache_set_str_async(key, result.model_dump_json(), ttl_seconds=_summary_ttl_seconds())
         return result
+
+    async def get_range(
+        self,
+        user: Any,
+        start: datetime.date,
+        end: datetime.date,
+        bucket: str,
+    ) -> DayRangeOut:
+        days = _range_days(start, end)
+        per_day, missing = await _cached_days_async(user, days)
+        if missing:
+            rows = await self.meal_repo.daily_totals.get_range(user.id, missing[0], missing[-1])
+            _fill_missing(per_day, missing, rows)
+        return _range_out(user, start, end, bucket, days, per_day)
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import csv
+import io
+import uuid
+from decimal import Decimal
+from typing import Callable, Iterable, Iterator, Literal, Sequence
+
+import orjson
+from sqlalchemy import Row
+from sqlalchemy.orm import Session
+
+from app.repositories.meal_repository import MealRepository
+
+ExportFormat = Literal["ndjson", "csv"]
+
+EXPORT_BATCH_SIZE = 2000
+
+MEDIA_TYPES: dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+CSV_HEADER = (
+    "meal_id",
+    "meal_date",
+    "created_at",
+    "title",
+    "raw_text",
+    "total_calories",
+    "total_protein_g",
+    "item_position",
+    "item_name",
+    "item_quantity",
+    "item_unit",
+    "item_calories",
+    "item_protein_g",
+)
+
+
+def _json_default(value):
+    # Decimals go out as strings, like the JSON API (MealOut).
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError
+
+
+def _dumps(record: dict) -> bytes:
+    return orjson.dumps(record, default=_json_default, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_UTC_Z)
+
+
+def _meal_record(r: Row) -> dict:
+    # Same shape (and UTC "Z" timestamps) as MealOut.
+    return {
+        "id": r.id,
+        "title": r.title,
+        "raw_text": r.raw_text,
+        "meal_date": r.meal_date,
+        "created_at": r.created_at,
+        "items": [],
+        "totals": {"calories": r.total_calories, "protein_g": r.total_protein_g},
+    }
+
+
+def ndjson_chunks(batches: Iterable[Sequence[Row]]) -> Iterator[bytes]:
+    """
+    One JSON line per meal (items nested). Rows of one meal are adjacent but may
+    span two batches, so the last meal of a batch is held until the next one.
+    """
+    meal: dict | None = None
+    for rows in batches:
+        lines = []
+        for r in rows:
+            if meal is None or meal["id"] != r.id:
+                if meal is not None:
+                    lines.append(_dumps(meal))
+                meal = _meal_record(r)
+            if r.item_id is not None:
+                meal["items"].append(
+                    {
+                        "id": r.item_id,
+                        "name": r.item_name,
+                        "quantity": r.item_quantity,
+                        "unit": r.item_unit,
+                        "calories": r.item_calories,
+                        "protein_g": r.item_protein_g,
+                        "position": r.item_position,
+                    }
+                )
+        if lines:
+            yield b"".join(lines)
+    if meal is not None:
+        yield _dumps(meal)
+
+
+def csv_chunks(batches: Iterable[Sequence[Row]]) -> Iterator[bytes]:
+    """
+    One CSV row per item, meal columns repeated; a meal without items gets one
+    row with empty item columns.
+    """
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(CSV_HEADER)
+    for rows in batches:
+        writer.writerows(
+            (
+                r.id,
+                r.meal_date.isoformat(),
+                r.created_at.isoformat(),
+                r.title,
+                r.raw_text,
+                r.total_calories,
+                r.total_protein_g,
+                r.item_position,
+                r.item_name,
+                r.item_quantity,
+                r.item_unit,
+                r.item_calories,
+                r.item_protein_g,
+            )
+            for r in rows
+        )
+        yield buf.getvalue().encode()
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode()
+
+
+def export_meals(
+    open_session: Callable[[], Session],
+    user_id: uuid.UUID,
+    fmt: ExportFormat,
+    *,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> Iterator[bytes]:
+    """
+    Stream a user's full meal history as encoded chunks, one per fetched batch.
+    The session is opened on first iteration and closed when the stream ends
+    (or is abandoned), so it can back a StreamingResponse.
+    """
+    db = open_session()
+    try:
+        batches = MealRepository(db).iter_export_rows(user_id, batch_size=batch_size)
+        encode = ndjson_chunks if fmt == "ndjson" else csv_chunks
+        yield from encode(batches)
+    finally:
+        db.close()
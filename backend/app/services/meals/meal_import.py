@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import csv
+import datetime
+import io
+import uuid
+from typing import BinaryIO, Iterable, Iterator, Literal
+from zoneinfo import ZoneInfo
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.errors import ErrorCodes, http_error
+from app.infra.redis.cache import cache_delete_many
+from app.infra.redis.keys import day_summary_key
+from app.repositories.meal_import_repository import MealImportRepository
+from app.schemas.meal import MealImportOut, MealImportRecord
+from app.services.analytics.analytics_service import bump_analytics_version
+
+ImportFormat = Literal["ndjson", "csv"]
+
+# Columns a CSV import needs; the rest of the export header is optional.
+CSV_REQUIRED = frozenset({"meal_id", "meal_date", "title"})
+
+
+def _invalid(line_no: int, error: ValidationError | str) -> HTTPException:
+    if isinstance(error, ValidationError):
+        first = error.errors()[0]
+        loc = ".".join(str(part) for part in first["loc"])
+        error = f"{loc}: {first['msg']}" if loc else first["msg"]
+    return http_error(422, ErrorCodes.MEAL_IMPORT_INVALID, f"line {line_no}: {error}")
+
+
+def _ndjson_records(f: BinaryIO) -> Iterator[tuple[int, MealImportRecord]]:
+    for line_no, line in enumerate(f, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_no, MealImportRecord.model_validate_json(line)
+        except ValidationError as e:
+            raise _invalid(line_no, e)
+
+
+def _blank_to_none(value: str | None) -> str | None:
+    return value if value else None
+
+
+def _csv_records(f: BinaryIO) -> Iterator[tuple[int, MealImportRecord]]:
+    """
+    The CSV export layout: one row per item with the meal columns repeated,
+    rows of a meal adjacent (grouped by meal_id). Empty item_name = no item.
+    """
+    reader = csv.DictReader(io.TextIOWrapper(f, encoding="utf-8-sig", newline=""))
+    missing = CSV_REQUIRED - set(reader.fieldnames or ())
+    if missing:
+        raise _invalid(1, f"missing columns: {', '.join(sorted(missing))}")
+
+    meal: dict | None = None
+    meal_key = None
+    meal_line = 0
+    for row in reader:
+        if meal is None or row["meal_id"] != meal_key:
+            if meal is not None:
+                yield _validated(meal_line, meal)
+            meal_key = row["meal_id"]
+            meal_line = reader.line_num
+            meal = {
+                "title": row["title"],
+                "raw_text": row.get("raw_text") or "",
+                "meal_date": row["meal_date"],
+                "created_at": _blank_to_none(row.get("created_at")),
+                "items": [],
+            }
+            if row.get("total_calories") or row.get("total_protein_g"):
+                meal["totals"] = {"calories": row.get("total_calories"), "protein_g": row.get("total_protein_g")}
+        if row.get("item_name"):
+            meal["items"].append(
+                {
+                    "name": row["item_name"],
+                    "quantity": _blank_to_none(row.get("item_quantity")),
+                    "unit": _blank_to_none(row.get("item_unit")),
+                    "calories": row.get("item_calories"),
+                    "protein_g": row.get("item_protein_g"),
+                }
+            )
+    if meal is not None:
+        yield _validated(meal_line, meal)
+
+
+def _validated(line_no: int, meal: dict) -> tuple[int, MealImportRecord]:
+    try:
+        return line_no, MealImportRecord.model_validate(meal)
+    except ValidationError as e:
+        raise _invalid(line_no, e)
+
+
+def _stage_rows(records: Iterable[tuple[int, MealImportRecord]]) -> Iterator[tuple]:
+    # Flat rows in MealImportRepository.STAGE_COLUMNS order; ids are assigned here.
+    tz = ZoneInfo(settings.app_timezone)
+    no_item = (None,) * 7
+    for count, (line_no, rec) in enumerate(records, start=1):
+        if count > settings.meal_import_max_meals:
+            raise http_error(
+                413,
+                ErrorCodes.MEAL_IMPORT_TOO_LARGE,
+                f"line {line_no}: more than {settings.meal_import_max_meals} meals in one import",
+            )
+
+        created_at = rec.created_at or datetime.datetime.combine(rec.meal_date, datetime.time(12))
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=tz)
+
+        meal = (
+            uuid.uuid4(),
+            rec.raw_text,
+            rec.title,
+            rec.totals.calories,
+            rec.totals.protein_g,
+            rec.meal_date,
+            created_at,
+        )
+        if not rec.items:
+            yield meal + no_item
+        for position, it in enumerate(rec.items):
+            yield meal + (uuid.uuid4(), position, it.name, it.quantity, it.unit, it.calories, it.protein_g)
+
+
+class MealImportService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.repo = MealImportRepository(db)
+
+    def import_file(self, user_id: uuid.UUID, f: BinaryIO, fmt: ImportFormat) -> MealImportOut:
+        """
+        Validate and stage the file in one streaming pass, then merge it in a single
+        transaction: a bad row rejects the whole file with its line number.
+        """
+        records = _ndjson_records(f) if fmt == "ndjson" else _csv_records(f)
+        self.repo.stage(_stage_rows(records))
+        counts = self.repo.merge(user_id)
+        self.db.commit()
+
+        if counts.meals:
+            cache_delete_many([day_summary_key(user_id, d) for d in counts.dates])
+            bump_analytics_version(user_id)
+
+        return MealImportOut(
+            meals_imported=counts.meals,
+            items_imported=counts.items,
+            meals_skipped=counts.skipped,
+            days_affected=len(counts.dates),
+        )
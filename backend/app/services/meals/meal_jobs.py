@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import datetime
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Optional
+
+import redis
+
+from app.core.config import settings
+from app.core.errors import ErrorCodes, http_error
+from app.db.routing import mark_recent_write
+from app.db.session import SessionLocal
+from app.infra.redis.cache import cache_delete, cache_get_str, cache_set_str
+from app.infra.redis.client import get_redis_client
+from app.infra.redis.keys import day_summary_key, meal_job_key, meal_job_worker_key
+from app.repositories.meal_repository import MealRepository
+from app.services.analytics.analytics_service import bump_analytics_version
+from app.services.openai.meal_parser import parse_meal
+
+logger = logging.getLogger(__name__)
+
+
+class MealJobStore:
+    """
+    Job records (JSON) live in Redis so any API worker can answer status polls.
+    Falls back to process memory when Redis is disabled, with the same TTL.
+
+    A job only runs in the worker that accepted it (`worker` in the record).
+    With Redis, a queued or running job whose worker stopped refreshing its
+    liveness key is marked failed (MEAL_JOB_LOST) when loaded; in memory the
+    records die with the worker.
+    """
+
+    def __init__(self) -> None:
+        # job id -> (expires_at, value), oldest write first: every write gets the
+        # same TTL and moves to the end, so expired records are always at the front.
+        self._local: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _prune_local(self, now: float) -> None:
+        while self._local:
+            expires_at, _ = next(iter(self._local.values()))
+            if expires_at > now:
+                break
+            self._local.popitem(last=False)
+
+    def save(self, job: dict[str, Any]) -> None:
+        value = json.dumps(job)
+        if get_redis_client() is None:
+            now = time.monotonic()
+            with self._lock:
+                self._prune_local(now)
+                self._local[job["id"]] = (now + settings.meal_job_ttl_seconds, value)
+                self._local.move_to_end(job["id"])
+            return
+        cache_set_str(meal_job_key(job["id"]), value, ttl_seconds=settings.meal_job_ttl_seconds)
+
+    def load(self, job_id: uuid.UUID) -> Optional[dict[str, Any]]:
+        if get_redis_client() is None:
+            with self._lock:
+                self._prune_local(time.monotonic())
+                entry = self._local.get(str(job_id))
+            return json.loads(entry[1]) if entry is not None else None
+
+        value = cache_get_str(meal_job_key(job_id))
+        job = json.loads(value) if value else None
+        if job is not None and self._orphaned(job):
+            self.update(job, status="failed", error=ErrorCodes.MEAL_JOB_LOST)
+        return job
+
+    def heartbeat(self, worker_id: str) -> None:
+        ttl = 3 * settings.meal_job_heartbeat_seconds
+        cache_set_str(meal_job_worker_key(worker_id), "1", ttl_seconds=ttl)
+
+    def _orphaned(self, job: dict[str, Any]) -> bool:
+        if job.get("status") not in ("queued", "running") or not job.get("worker"):
+            return False
+        return cache_get_str(meal_job_worker_key(job["worker"])) is None
+
+    def update(self, job: dict[str, Any], **changes: Any) -> None:
+        job.update(changes)
+        self.save(job)
+
+
+class MealJobError(Exception):
+    """A job step failed; `code` (an ErrorCodes value) is what the job record reports."""
+
+    def __init__(self, code: str) -> None:
+        super().__init__(code)
+        self.code = code
+
+
+class MealJobPool:
+    """
+    Bounded in-process worker pool for meal creation.
+    `concurrency` jobs run at once; at most `max_queue_depth` may be pending
+    (queued + running) before submissions are rejected with 503.
+    """
+
+    def __init__(self, *, concurrency: int, max_queue_depth: int, store: MealJobStore) -> None:
+        self.max_queue_depth = max_queue_depth
+        self.store = store
+        self.worker_id = uuid.uuid4().hex
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="meal-job")
+        self._pending = 0
+        self._lock = threading.Lock()
+        if get_redis_client() is not None:
+            self._beat()
+            threading.Thread(target=self._heartbeat_loop, name="meal-job-heartbeat", daemon=True).start()
+
+    def _beat(self) -> None:
+        try:
+            self.store.heartbeat(self.worker_id)
+        except redis.RedisError:
+            logger.warning("Meal job heartbeat failed", exc_info=True)
+
+    def _heartbeat_loop(self) -> None:
+        while True:
+            time.sleep(settings.meal_job_heartbeat_seconds)
+            self._beat()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def submit(self, user_id: uuid.UUID, text: str, meal_date: datetime.date) -> dict[str, Any]:
+        with self._lock:
+            if self._pending >= self.max_queue_depth:
+                raise http_error(503, ErrorCodes.MEAL_JOBS_SATURATED, "Too many pending meal jobs")
+            self._pending += 1
+
+        job = {
+            "id": str(uuid.uuid4()),
+            "user_id": str(user_id),
+            "status": "queued",
+            "raw_text": text,
+            "meal_date": meal_date.isoformat(),
+            "meal_id": None,
+            "error": None,
+            "worker": self.worker_id,
+        }
+        try:
+            self.store.save(job)
+            self._executor.submit(self._run, dict(job))
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+        return job
+
+    def _run(self, job: dict[str, Any]) -> None:
+        try:
+            self.store.update(job, status="running")
+            meal_id = run_meal_job(job)
+            self.store.update(job, status="succeeded", meal_id=str(meal_id))
+        except Exception as exc:
+            logger.exception("Meal job failed", extra={"job_id": job["id"]})
+            code = exc.code if isinstance(exc, MealJobError) else ErrorCodes.MEAL_SAVE_FAILED
+            self.store.update(job, status="failed", error=code)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+
+def run_meal_job(job: dict[str, Any]) -> uuid.UUID:
+    # Parse first: no DB connection is held while waiting on the LLM.
+    try:
+        parsed = parse_meal(job["raw_text"])
+    except Exception as exc:
+        raise MealJobError(ErrorCodes.MEAL_PARSE_FAILED) from exc
+    user_id = uuid.UUID(job["user_id"])
+    meal_date = datetime.date.fromisoformat(job["meal_date"])
+
+    db = SessionLocal()
+    try:
+        meal = MealRepository(db).create_meal_with_items(
+            user_id=user_id,
+            raw_text=job["raw_text"],
+            title=parsed.title,
+            total_calories=parsed.totals.calories,
+            total_protein_g=Decimal(parsed.totals.protein_g),
+            meal_date=meal_date,
+            items=[it.model_dump() for it in parsed.items],
+        )
+        meal_id = meal.id
+    except Exception as exc:
+        raise MealJobError(ErrorCodes.MEAL_SAVE_FAILED) from exc
+    finally:
+        db.close()
+
+    # The meal is committed: a cache hiccup must not report the job as failed
+    # (the client would resubmit and get a duplicate).
+    try:
+        cache_delete(day_summary_key(user_id, meal_date))
+        bump_analytics_version(user_id)
+        mark_recent_write(user_id)
+    except redis.RedisError:
+        logger.warning("Meal job %s: cache refresh failed", job["id"], exc_info=True)
+    return meal_id
+
+
+@lru_cache(maxsize=1)
+def get_meal_job_pool() -> MealJobPool:
+    return MealJobPool(
+        concurrency=settings.meal_jobs_concurrency,
+        max_queue_depth=settings.meal_jobs_max_queue_depth,
+        store=MealJobStore(),
+    )
@@ -6,12 +6,15 @@ import uuid
 from decimal import Decimal
 from zoneinfo import ZoneInfo
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.errors import ErrorCodes, http_error
-from app.repositories.meal_repository import MealRepository
-from app.services.openai.meal_parser import ParsedMeal, parse_meal
+from app.core.pagination import decode_cursor, encode_cursor
+from app.repositories.meal_repository import AsyncMealRepository, MealRepository
+from app.services.meals.meal_jobs import get_meal_job_pool
+from app.services.openai.meal_parser import ParsedMeal, parse_meal, parse_meal_async
 
 logger = logging.getLogger(__name__)
 
@@ -21,28 +24,82 @@ def _today_local_date() -> datetime.date:
     return datetime.datetime.now(tz).date()
 
 
+def _meal_values(user_id: uuid.UUID, text: str, parsed: ParsedMeal) -> dict:
+    return {
+        "user_id": user_id,
+        "raw_text": text,
+        "title": parsed.title,
+        "total_calories": parsed.totals.calories,
+        "total_protein_g": Decimal(parsed.totals.protein_g),
+        "meal_date": _today_local_date(),
+        "items": [it.model_dump() for it in parsed.items],
+    }
+
+
+def _decode_after(cursor: str | None) -> tuple[datetime.datetime, uuid.UUID] | None:
+    if not cursor:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise http_error(400, ErrorCodes.MEAL_CURSOR_INVALID, "Invalid cursor")
+
+
+def _next_cursor(meals: list, limit: int) -> str | None:
+    # None when the page is not full.
+    return encode_cursor(meals[-1].created_at, meals[-1].id) if len(meals) == limit else None
+
+
 class MealService:
     def __init__(self, db: Session):
+        self.db = db
         self.repo = MealRepository(db)
 
     def analyze_and_create(self, user_id: uuid.UUID, text: str):
+        # 1) Parse with no connection held: the request session may already have
+        #    checked one out (e.g. for auth), so hand it back to the pool first.
+        self._release_connection()
         try:
             parsed: ParsedMeal = parse_meal(text)
         except Exception:
             logger.exception("Meal parsing failed (OpenAI)")
             raise http_error(502, ErrorCodes.MEAL_PARSE_FAILED, "Meal parsing failed")
 
-        meal_date = _today_local_date()
+        # 2) Short transaction just for the insert, 3) released right after.
+        meal = self._create_from_parsed(user_id, text, parsed)
+        self._release_connection()
+        return meal
 
-        return self.repo.create_meal_with_items(
-            user_id=user_id,
-            raw_text=text,
-            title=parsed.title,
-            total_calories=parsed.totals.calories,
-            total_protein_g=Decimal(parsed.totals.protein_g),
-            meal_date=meal_date,
-            items=[it.model_dump() for it in parsed.items],
-        )
+    async def analyze_and_create_async(self, user_id: uuid.UUID, text: str):
+        # For callers already on the event loop (e.g. the Telegram webhook).
+        self._release_connection()
+        try:
+            parsed: ParsedMeal = await parse_meal_async(text)
+        except Exception:
+            logger.exception("Meal parsing failed (OpenAI)")
+            raise http_error(502, ErrorCodes.MEAL_PARSE_FAILED, "Meal parsing failed")
+
+        meal = self._create_from_parsed(user_id, text, parsed)
+        self._release_connection()
+        return meal
+
+    def _release_connection(self) -> None:
+        # Ends the session's transaction and returns its connection to the pool.
+        # Already-loaded objects (current user, the new meal) stay usable, detached.
+        self.db.close()
+
+    def _create_from_parsed(self, user_id: uuid.UUID, text: str, parsed: ParsedMeal):
+        return self.repo.create_meal_with_items(**_meal_values(user_id, text, parsed))
+
+    def submit_job(self, user_id: uuid.UUID, text: str) -> dict:
+        # meal_date is fixed at submission time, not when a worker picks the job up.
+        return get_meal_job_pool().submit(user_id, text, _today_local_date())
+
+    def get_job(self, job_id: uuid.UUID, user_id: uuid.UUID) -> dict:
+        job = get_meal_job_pool().store.load(job_id)
+        if job is None or job["user_id"] != str(user_id):
+            raise http_error(404, ErrorCodes.MEAL_JOB_NOT_FOUND, "Meal job not found")
+        return job
 
     def get(self, meal_id: uuid.UUID):
         meal = self.repo.get_by_id(meal_id)
@@ -50,23 +107,79 @@ class MealService:
             raise http_error(404, ErrorCodes.MEAL_NOT_FOUND, "Meal not found")
         return meal
 
-    def list(self, user_id: uuid.UUID, date: datetime.date | None, limit: int, offset: int):
-        return self.repo.list_by_user(user_id=user_id, date=date, limit=limit, offset=offset)
+    def list(
+        self,
+        user_id: uuid.UUID,
+        date: datetime.date | None,
+        limit: int,
+        offset: int,
+        cursor: str | None = None,
+    ):
+        """
+        Returns (meals, next_cursor). next_cursor is None when the page is not full.
+        """
+        after = _decode_after(cursor)
+        meals = self.repo.list_by_user(user_id=user_id, date=date, limit=limit, offset=offset, after=after)
+        return meals, _next_cursor(meals, limit)
 
     def delete(self, meal_id: uuid.UUID, user_id: uuid.UUID) -> None:
-        meal = self.get_owned(meal_id, user_id)
+        meal = self.get_owned(meal_id, user_id, for_update=True)
         self.repo.delete(meal)
 
     def patch(self, meal_id: uuid.UUID, user_id: uuid.UUID, title: str | None, items: list[dict] | None):
-        meal = self.get_owned(meal_id, user_id)
+        meal = self.get_owned(meal_id, user_id, for_update=True)
+        total_calories = None
+        total_protein_g = None
         if items is not None:
-            meal.total_calories = sum(it["calories"] for it in items)
-            meal.total_protein_g = sum(Decimal(it["protein_g"]) for it in items)    
-        return self.repo.patch(meal, title=title, items=items)
+            total_calories = sum(it["calories"] for it in items)
+            total_protein_g = sum((Decimal(it["protein_g"]) for it in items), Decimal("0"))
+        return self.repo.patch(
+            meal,
+            title=title,
+            items=items,
+            total_calories=total_calories,
+            total_protein_g=total_protein_g,
+        )
 
     #IDOR (Insecure Direct Object Reference) protection
-    def get_owned(self, meal_id: uuid.UUID, user_id: uuid.UUID):
-        meal = self.repo.get_by_id_for_user(meal_id, user_id)
+    def get_owned(self, meal_id: uuid.UUID, user_id: uuid.UUID, *, for_update: bool = False):
+        meal = self.repo.get_by_id_for_user(meal_id, user_id, for_update=for_update)
         if meal is None:
             raise http_error(404, ErrorCodes.MEAL_NOT_FOUND, "Meal not found")
         return meal
+
+
+class AsyncMealService:
+    """
+    The subset of `MealService` served on the event loop: listing and
+    LLM-backed creation (Telegram webhook).
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.repo = AsyncMealRepository(db)
+
+    async def analyze_and_create_async(self, user_id: uuid.UUID, text: str):
+        # Hand the connection back before the LLM call, as the sync path does.
+        await self.db.close()
+        try:
+            parsed: ParsedMeal = await parse_meal_async(text)
+        except Exception:
+            logger.exception("Meal parsing failed (OpenAI)")
+            raise http_error(502, ErrorCodes.MEAL_PARSE_FAILED, "Meal parsing failed")
+
+        meal = await self.repo.create_meal_with_items(**_meal_values(user_id, text, parsed))
+        await self.db.close()
+        return meal
+
+    async def list(
+        self,
+        user_id: uuid.UUID,
+        date: datetime.date | None,
+        limit: int,
+        offset: int,
+        cursor: str | None = None,
+    ):
+        after = _decode_after(cursor)
+        meals = await self.repo.list_by_user(user_id=user_id, date=date, limit=limit, offset=offset, after=after)
+        return meals, _next_cursor(meals, limit)
@@ -1,11 +1,55 @@
 from __future__ import annotations
 
-from openai import OpenAI
+from functools import lru_cache
+
+import httpx
+from openai import AsyncOpenAI, OpenAI
 
 from app.core.config import settings
 
 
-def get_openai_client() -> OpenAI:
+def _require_api_key() -> str:
     if not settings.openai_api_key or settings.openai_api_key == "change_me":
         raise RuntimeError("OPENAI_API_KEY is not configured")
-    return OpenAI(api_key=settings.openai_api_key)
+    return settings.openai_api_key
+
+
+def _http_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.openai_max_connections,
+        max_keepalive_connections=settings.openai_max_keepalive_connections,
+    )
+
+
+def _http_timeout() -> httpx.Timeout:
+    return httpx.Timeout(
+        settings.openai_timeout_seconds,
+        connect=settings.openai_connect_timeout_seconds,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_openai_client() -> OpenAI:
+    """
+    Process-wide OpenAI client.
+    Reusing it keeps the HTTP connection pool (and TLS sessions) warm across calls.
+    """
+    return OpenAI(
+        api_key=_require_api_key(),
+        base_url=settings.openai_base_url,
+        max_retries=settings.openai_max_retries,
+        http_client=httpx.Client(limits=_http_limits(), timeout=_http_timeout()),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_async_openai_client() -> AsyncOpenAI:
+    """
+    Process-wide AsyncOpenAI client for callers running on the event loop.
+    """
+    return AsyncOpenAI(
+        api_key=_require_api_key(),
+        base_url=settings.openai_base_url,
+        max_retries=settings.openai_max_retries,
+        http_client=httpx.AsyncClient(limits=_http_limits(), timeout=_http_timeout()),
+    )
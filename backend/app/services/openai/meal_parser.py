@@ -6,7 +6,9 @@ import logging
 from pydantic import BaseModel, Field
 
 from app.core.config import settings
-from app.services.openai.client import get_openai_client
+from app.infra.redis.singleflight import SingleFlight
+from app.services.openai.client import get_async_openai_client, get_openai_client
+from app.services.openai.parse_cache import build_parse_digest, parse_cache
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +29,16 @@ Rules:
 - Keep title short (1-2 words).
 """
 
+meal_parse_flight = SingleFlight(
+    "meal_parse",
+    lock_ttl_seconds=settings.meal_parse_singleflight_lock_ttl_seconds,
+    wait_timeout_seconds=settings.meal_parse_singleflight_wait_seconds,
+)
+
+
+def meal_parse_flight_stats() -> dict[str, int]:
+    return meal_parse_flight.stats.as_dict()
+
 
 class ParsedItem(BaseModel):
     name: str
@@ -60,35 +72,123 @@ def _extract_json(text: str) -> str:
     return text
 
 
-def parse_meal(text: str) -> ParsedMeal:
+def parse_meal(text: str, *, bypass_cache: bool = False) -> ParsedMeal:
+    """
+    Parse free-text meal input into structured nutrition data.
+
+    Results are served from the two-tier parse cache when possible;
+    `bypass_cache=True` (or MEAL_PARSE_CACHE_ENABLED=false) forces a fresh LLM call.
+    Concurrent identical parses are coalesced into a single LLM call.
+    """
+    digest = build_parse_digest(text, settings.openai_model, SYSTEM_PROMPT)
+    use_cache = not bypass_cache and settings.meal_parse_cache_enabled
+
+    if use_cache:
+        cached = parse_cache.get(digest)
+        if cached is not None:
+            return ParsedMeal.model_validate_json(cached)
+    else:
+        parse_cache.record_bypass()
+
+    def compute() -> str:
+        raw = _parse_meal_uncached(text).model_dump_json()
+        if use_cache:
+            parse_cache.set(digest, raw)
+        return raw
+
+    if not settings.meal_parse_singleflight_enabled:
+        return ParsedMeal.model_validate_json(compute())
+
+    return ParsedMeal.model_validate_json(meal_parse_flight.do(digest, compute))
+
+
+async def parse_meal_async(text: str, *, bypass_cache: bool = False) -> ParsedMeal:
+    """
+    Event-loop friendly variant of `parse_meal` (AsyncOpenAI, no thread hop for the LLM call).
+    Same cache semantics; identical in-flight parses share one call, across workers too.
+    """
+    digest = build_parse_digest(text, settings.openai_model, SYSTEM_PROMPT)
+    use_cache = not bypass_cache and settings.meal_parse_cache_enabled
+
+    if use_cache:
+        cached = await parse_cache.get_async(digest)
+        if cached is not None:
+            return ParsedMeal.model_validate_json(cached)
+    else:
+        parse_cache.record_bypass()
+
+    async def compute() -> str:
+        raw = (await _parse_meal_uncached_async(text)).model_dump_json()
+        if use_cache:
+            await parse_cache.set_async(digest, raw)
+        return raw
+
+    if not settings.meal_parse_singleflight_enabled:
+        return ParsedMeal.model_validate_json(await compute())
+
+    return ParsedMeal.model_validate_json(await meal_parse_flight.do_async(digest, compute))
+
+
+def _build_messages(prompt: str) -> list[dict[str, str]]:
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def _fix_prompt(raw: str) -> str:
+    return f"Fix this to be ONLY valid JSON that matches the schema exactly.\n\n{raw}"
+
+
+def _load_parsed(raw: str) -> ParsedMeal:
+    data = json.loads(_extract_json(raw))
+    return ParsedMeal.model_validate(data)
+
+
+def _parse_meal_uncached(text: str) -> ParsedMeal:
     client = get_openai_client()
 
     def call(prompt: str) -> str:
         # Use Chat Completions API (compatible with openai==1.55.3)
         resp = client.chat.completions.create(
             model=settings.openai_model,
-            messages=[
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": prompt},
-            ],
+            messages=_build_messages(prompt),
             temperature=0.2,
         )
         return resp.choices[0].message.content or ""
 
     raw = call(text)
-    raw_json = _extract_json(raw)
+    try:
+        return _load_parsed(raw)
+    except Exception:
+        # retry once for invalid JSON
+        raw2 = call(_fix_prompt(raw))
+        try:
+            return _load_parsed(raw2)
+        except Exception:
+            logger.exception("Failed to parse OpenAI output as JSON")
+            raise
+
+
+async def _parse_meal_uncached_async(text: str) -> ParsedMeal:
+    client = get_async_openai_client()
+
+    async def call(prompt: str) -> str:
+        resp = await client.chat.completions.create(
+            model=settings.openai_model,
+            messages=_build_messages(prompt),
+            temperature=0.2,
+        )
+        return resp.choices[0].message.content or ""
 
+    raw = await call(text)
     try:
-        data = json.loads(raw_json)
-        return ParsedMeal.model_validate(data)
+        return _load_parsed(raw)
     except Exception:
         # retry once for invalid JSON
-        fix_prompt = f"Fix this to be ONLY valid JSON that matches the schema exactly.\n\n{raw}"
-        raw2 = call(fix_prompt)
-        raw2_json = _extract_json(raw2)
+        raw2 = await call(_fix_prompt(raw))
         try:
-            data2 = json.loads(raw2_json)
-            return ParsedMeal.model_validate(data2)
+            return _load_parsed(raw2)
         except Exception:
             logger.exception("Failed to parse OpenAI output as JSON")
             raise
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+import redis
+
+from app.core.config import settings
+from app.infra.redis.cache import cache_get_str, cache_get_str_async, cache_set_str, cache_set_str_async
+from app.infra.redis.keys import meal_parse_key
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_meal_text(text: str) -> str:
+    """
+    Normalize free-text meal input so trivially different spellings
+    ("2 Eggs  ", "2 eggs") share a cache entry.
+    """
+    return " ".join(text.split()).casefold()
+
+
+def build_parse_digest(text: str, model: str, system_prompt: str) -> str:
+    """
+    Content address of a parse: normalized input + model + prompt version.
+    Changing the model or editing the prompt naturally invalidates old entries.
+    """
+    prompt_hash = hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()
+    material = f"{model}\n{prompt_hash}\n{normalize_meal_text(text)}"
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class ParseCacheStats:
+    local_hits: int = 0
+    redis_hits: int = 0
+    misses: int = 0
+    bypassed: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+        }
+
+
+class ParseCache:
+    """
+    Two-tier cache for LLM parse results (JSON strings).
+
+    - L1: in-process LRU with TTL, bounded by `max_entries`
+    - L2: Redis (shared across workers), via app.infra.redis.cache
+
+    Redis is an optimization only: when it errors, reads count as a miss and
+    writes keep the L1 copy, so a parse never fails because of the cache.
+    """
+
+    def __init__(self, *, max_entries: int, ttl_seconds: int) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.stats = ParseCacheStats()
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _local_get(self, digest: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[digest]
+                return None
+            self._entries.move_to_end(digest)
+            self.stats.local_hits += 1
+            return value
+
+    def _l2_result(self, digest: str, value: Optional[str]) -> Optional[str]:
+        # Count the L2 lookup and promote a hit into L1.
+        if value is None:
+            with self._lock:
+                self.stats.misses += 1
+            return None
+        with self._lock:
+            self.stats.redis_hits += 1
+        self._local_set(digest, value)
+        return value
+
+    def _local_set(self, digest: str, value: str) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[digest] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, digest: str) -> Optional[str]:
+        value = self._local_get(digest)
+        if value is not None:
+            return value
+
+        try:
+            value = cache_get_str(meal_parse_key(digest))
+        except redis.RedisError:
+            logger.warning("parse cache: Redis read failed; treating as a miss", exc_info=True)
+            value = None
+        return self._l2_result(digest, value)
+
+    def set(self, digest: str, value: str) -> None:
+        self._local_set(digest, value)
+        try:
+            cache_set_str(meal_parse_key(digest), value, ttl_seconds=self.ttl_seconds)
+        except redis.RedisError:
+            logger.warning("parse cache: Redis write failed; kept in the local cache only", exc_info=True)
+
+    async def get_async(self, digest: str) -> Optional[str]:
+        # `get` for callers on the event loop: L2 through redis.asyncio.
+        value = self._local_get(digest)
+        if value is not None:
+            return value
+
+        try:
+            value = await cache_get_str_async(meal_parse_key(digest))
+        except redis.RedisError:
+            logger.warning("parse cache: Redis read failed; treating as a miss", exc_info=True)
+            value = None
+        return self._l2_result(digest, value)
+
+    async def set_async(self, digest: str, value: str) -> None:
+        self._local_set(digest, value)
+        try:
+            await cache_set_str_async(meal_parse_key(digest), value, ttl_seconds=self.ttl_seconds)
+        except redis.RedisError:
+            logger.warning("parse cache: Redis write failed; kept in the local cache only", exc_info=True)
+
+    def record_bypass(self) -> None:
+        with self._lock:
+            self.stats.bypassed += 1
+
+    def clear_local(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+parse_cache = ParseCache(
+    max_entries=settings.meal_parse_cache_local_max_entries,
+    ttl_seconds=settings.meal_parse_cache_ttl_seconds,
+)
+
+
+def parse_cache_stats() -> dict[str, int]:
+    return parse_cache.stats.as_dict()
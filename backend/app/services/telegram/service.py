@@ -4,6 +4,7 @@ import datetime
 import hashlib
 import logging
 import random
+from typing import Any
 from zoneinfo import ZoneInfo
 
 import httpx
@@ -12,9 +13,11 @@ from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.errors import http_error, ErrorCodes
-from app.repositories.meal_repository import MealRepository
+from app.db.routing import mark_recent_write_async
+from app.infra.redis.cache import cache_delete_async
+from app.infra.redis.keys import day_summary_key
 from app.repositories.telegram_repository import TelegramRepository
-from app.services.meals.meal_service import MealService
+from app.services.analytics.analytics_service import bump_analytics_version_async
 from app.services.telegram.messages import meal_added_message, today_summary_message
 from app.schemas.telegram import TgUpdate
 
@@ -51,8 +54,6 @@ async def send_telegram_message(chat_id: int, text: str) -> None:
 class TelegramService:
     def __init__(self, db: Session):
         self.repo = TelegramRepository(db)
-        self.meal_repo = MealRepository(db)
-        self.meal_service = MealService(db)
 
     def create_link_code(self, user_id):
         # block if already linked
@@ -74,6 +75,20 @@ class TelegramService:
         masked = "*" * max(0, len(s) - 4) + s[-4:]
         return {"is_linked": True, "linked_at": link.linked_at.isoformat(), "chat_id_masked": masked}
 
+
+
+class TelegramWebhookService:
+    """
+    Bot updates, handled on the event loop. Takes the async interface of the
+    Telegram/meal repositories and of the meal service (see
+    `app.api.deps.get_telegram_webhook_service` for how they are built).
+    """
+
+    def __init__(self, *, repo: Any, meal_repo: Any, meal_service: Any):
+        self.repo = repo
+        self.meal_repo = meal_repo
+        self.meal_service = meal_service
+
     async def handle_update(self, update: dict) -> None:
         try:
             parsed = TgUpdate.model_validate(update)
@@ -95,7 +110,7 @@ class TelegramService:
                 return
 
             if text.startswith("/today"):
-                link = self.repo.get_link_by_chat(chat_id)
+                link = await self.repo.get_link_by_chat(chat_id)
                 if not link:
                     await send_telegram_message(chat_id, "Not linked. Use /link <code> from the app.")
                     return
@@ -103,8 +118,8 @@ class TelegramService:
                 # compute today by app timezone
                 tz = ZoneInfo(settings.app_timezone)
                 today = datetime.datetime.now(tz).date()
-                meals, total_cal, total_pro = self.meal_repo.day_summary(link.user_id, today)
-                msg = today_summary_message(text, len(meals), total_cal, total_pro)
+                meals_count, total_cal, total_pro = await self.meal_repo.day_totals(link.user_id, today)
+                msg = today_summary_message(text, meals_count, total_cal, float(total_pro))
                 await send_telegram_message(chat_id, msg)
                 return
 
@@ -116,7 +131,7 @@ class TelegramService:
 
                 code = parts[1].strip().upper()
                 code_hash = _hash_code(code)
-                row = self.repo.get_code(code_hash)
+                row = await self.repo.get_code(code_hash)
                 if not row:
                     await send_telegram_message(chat_id, "Invalid link code.")
                     return
@@ -130,27 +145,31 @@ class TelegramService:
                     return
 
                 # block if user already linked
-                if self.repo.get_link_by_user(row.user_id):
+                if await self.repo.get_link_by_user(row.user_id):
                     await send_telegram_message(chat_id, "Already linked.")
                     return
 
                 # block if chat already linked
-                if self.repo.get_link_by_chat(chat_id):
+                if await self.repo.get_link_by_chat(chat_id):
                     await send_telegram_message(chat_id, "This Telegram chat is already linked.")
                     return
 
-                self.repo.create_link(user_id=row.user_id, chat_id=chat_id)
-                self.repo.mark_code_used(row)
+                await self.repo.create_link(user_id=row.user_id, chat_id=chat_id)
+                await self.repo.mark_code_used(row)
+                await mark_recent_write_async(row.user_id)
                 await send_telegram_message(chat_id, "Linked successfully ✅")
                 return
 
             # Otherwise: treat as meal text
-            link = self.repo.get_link_by_chat(chat_id)
+            link = await self.repo.get_link_by_chat(chat_id)
             if not link:
                 await send_telegram_message(chat_id, "Not linked. Use /link <code> from the app.")
                 return
 
-            meal = self.meal_service.analyze_and_create(link.user_id, text)
+            meal = await self.meal_service.analyze_and_create_async(link.user_id, text)
+            await cache_delete_async(day_summary_key(link.user_id, meal.meal_date))
+            await bump_analytics_version_async(link.user_id)
+            await mark_recent_write_async(link.user_id)
             items = [
                 {
                     "name": it.name,
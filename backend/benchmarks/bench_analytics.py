@@ -0,0 +1,116 @@
+"""
+Cost of the analytics summary over 5 years of synthetic daily totals:
+the vectorized NumPy computation vs a plain-Python loop over the same series.
+
+    cd backend && python -m benchmarks.bench_analytics --years 5
+
+Pure CPU; no database or Redis involved.
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import os
+import statistics
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("JWT_SECRET", "bench")
+os.environ.setdefault("DB_ASYNC_ENABLED", "false")  # pysqlite has no async driver
+
+import numpy as np  # noqa: E402
+
+from app.services.analytics.analytics_service import compute_summary  # noqa: E402
+
+REPEATS = 50
+GOAL_CALORIES = 2200.0
+GOAL_PROTEIN = 120.0
+
+
+def _series(years: int, today: datetime.date) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(42)
+    n = years * 365 + years // 4
+    all_dates = np.arange(np.datetime64(today - datetime.timedelta(days=n - 1)), np.datetime64(today) + 1)
+    logged = rng.random(n) < 0.85
+    dates = all_dates[logged]
+    calories = rng.normal(2100, 350, dates.size).round()
+    protein = rng.normal(125, 25, dates.size).round(2)
+    return dates, calories, protein
+
+
+def _python_summary(dates, calories, protein, today: datetime.date) -> dict:
+    """Reference loop implementation, the way it would be written without NumPy."""
+    by_day = {d: (c, p) for d, c, p in zip(dates.tolist(), calories.tolist(), protein.tolist())}
+    first = min(by_day)
+    days = [first + datetime.timedelta(days=i) for i in range((today - first).days + 1)]
+
+    def window(n: int, idx: int) -> float | None:
+        vals = [by_day[d][idx] for d in days[-n:] if d in by_day]
+        return sum(vals) / len(vals) if vals else None
+
+    cal_vals = [v[0] for v in by_day.values()]
+    mean = sum(cal_vals) / len(cal_vals)
+    variance = sum((v - mean) ** 2 for v in cal_vals) / len(cal_vals)
+
+    longest = run = 0
+    for d in days:
+        c, p = by_day.get(d, (None, None))
+        if c is not None and c <= GOAL_CALORIES and p >= GOAL_PROTEIN:
+            run += 1
+            longest = max(longest, run)
+        else:
+            run = 0
+
+    weekdays: dict[int, list[float]] = {}
+    for d, (c, _) in by_day.items():
+        weekdays.setdefault(d.weekday(), []).append(c)
+
+    return {
+        "avg_7d": window(7, 0),
+        "avg_30d": window(30, 0),
+        "mean": mean,
+        "variance": variance,
+        "longest": longest,
+        "weekdays": {k: sum(v) / len(v) for k, v in weekdays.items()},
+    }
+
+
+def _time(fn) -> float:
+    samples = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--years", type=int, default=5)
+    args = parser.parse_args()
+
+    today = datetime.date.today()
+    dates, calories, protein = _series(args.years, today)
+
+    def vectorized():
+        return compute_summary(
+            dates,
+            calories,
+            protein,
+            today=today,
+            goal_calories=GOAL_CALORIES,
+            goal_protein_g=GOAL_PROTEIN,
+        )
+
+    result = vectorized()
+    reference = _python_summary(dates, calories, protein, today)
+    assert result.streaks is not None and result.streaks.longest == reference["longest"]
+    assert abs(result.calories.mean - reference["mean"]) < 0.01
+
+    numpy_ms = _time(vectorized)
+    python_ms = _time(lambda: _python_summary(dates, calories, protein, today))
+    print(f"days={dates.size} numpy={numpy_ms:.2f}ms python={python_ms:.2f}ms speedup={python_ms / numpy_ms:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
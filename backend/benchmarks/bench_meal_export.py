@@ -0,0 +1,154 @@
+"""
+Streamed export of a long meal history (GET /api/v1/meals/export): throughput
+and resident memory while 1M meals are encoded, for both formats.
+
+    cd backend && python -m benchmarks.bench_meal_export --meals 1000000
+
+The export generator is driven directly (the test client would buffer the whole
+body). RSS is sampled from /proc while it runs: the peak should sit a few MB
+above the baseline whatever --meals is, since only one yield_per batch is alive.
+Uses a throwaway SQLite file by default; point DATABASE_URL at a migrated
+Postgres to exercise the server-side cursor.
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import gc
+import os
+import tempfile
+import threading
+import time
+import uuid
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/export.sqlite")
+os.environ.setdefault("JWT_SECRET", "bench")
+os.environ.setdefault("DB_ASYNC_ENABLED", "false")  # pysqlite has no async driver
+
+from sqlalchemy import Index, insert  # noqa: E402
+
+from app.db.base import Base  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.models.meal import Meal  # noqa: E402
+from app.models.meal_item import MealItem  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.meals.meal_export import export_meals  # noqa: E402
+
+SEED_BATCH = 10_000
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+def _rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * PAGE_SIZE / 2**20
+
+
+class _RssSampler(threading.Thread):
+    def __init__(self, interval: float = 0.05):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak = _rss_mb()
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            self.peak = max(self.peak, _rss_mb())
+
+    def stop(self) -> float:
+        self._stop_event.set()
+        self.join()
+        return max(self.peak, _rss_mb())
+
+
+def _seed(n_meals: int, items_per_meal: int) -> uuid.UUID:
+    if engine.dialect.name == "sqlite":
+        Base.metadata.create_all(engine)
+        Index("ix_meals_user_created_at", Meal.user_id, Meal.created_at).create(engine, checkfirst=True)
+
+    db = SessionLocal()
+    user = User(email=f"export-{time.time_ns()}@bench.dev", hashed_password="x")
+    db.add(user)
+    db.commit()
+    user_id = user.id
+
+    start = datetime.datetime(2015, 1, 1, tzinfo=datetime.timezone.utc)
+    meals: list[dict] = []
+    items: list[dict] = []
+    for i in range(n_meals):
+        created_at = start + datetime.timedelta(minutes=5 * i)
+        meal_id = uuid.uuid4()
+        meals.append(
+            {
+                "id": meal_id,
+                "user_id": user_id,
+                "raw_text": "2 eggs and a slice of toast, coffee with milk",
+                "title": "Breakfast",
+                "total_calories": 350 * items_per_meal,
+                "total_protein_g": 12 * items_per_meal,
+                "meal_date": created_at.date(),
+                "created_at": created_at,
+            }
+        )
+        items.extend(
+            {
+                "id": uuid.uuid4(),
+                "meal_id": meal_id,
+                "name": f"item {pos}",
+                "quantity": 1,
+                "unit": "serving",
+                "calories": 350,
+                "protein_g": 12,
+                "position": pos,
+            }
+            for pos in range(items_per_meal)
+        )
+        if len(meals) == SEED_BATCH:
+            db.execute(insert(Meal.__table__), meals)
+            db.execute(insert(MealItem.__table__), items)
+            db.commit()
+            meals.clear()
+            items.clear()
+    if meals:
+        db.execute(insert(Meal.__table__), meals)
+        if items:
+            db.execute(insert(MealItem.__table__), items)
+        db.commit()
+    db.close()
+    return user_id
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--meals", type=int, default=1_000_000)
+    parser.add_argument("--items-per-meal", type=int, default=2)
+    parser.add_argument("--formats", default="ndjson,csv")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    user_id = _seed(args.meals, args.items_per_meal)
+    print(f"seeded {args.meals} meals x {args.items_per_meal} items in {time.perf_counter() - started:.1f}s")
+
+    for fmt in args.formats.split(","):
+        gc.collect()
+        baseline = _rss_mb()
+        sampler = _RssSampler()
+        sampler.start()
+
+        started = time.perf_counter()
+        n_bytes = 0
+        n_chunks = 0
+        for chunk in export_meals(SessionLocal, user_id, fmt):
+            n_bytes += len(chunk)
+            n_chunks += 1
+        elapsed = time.perf_counter() - started
+        peak = sampler.stop()
+
+        print(
+            f"{fmt:<6} {n_bytes / 2**20:8.1f} MB in {elapsed:6.1f}s "
+            f"({args.meals / elapsed:9.0f} meals/s, {n_chunks} chunks)  "
+            f"rss baseline={baseline:6.1f}MB peak={peak:6.1f}MB (+{peak - baseline:.1f}MB)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Bulk history import (POST /api/v1/meals/import): wall time to validate, stage
+and merge N meals from an NDJSON or CSV file.
+
+    cd backend && python -m benchmarks.bench_meal_import --meals 100000
+
+The file is generated up front and fed to MealImportService directly, so the
+numbers cover parsing, validation, staging and the merge (not the upload).
+Uses a throwaway SQLite file by default (staging falls back to executemany);
+point DATABASE_URL at a migrated Postgres to measure the COPY path.
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import os
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/import.sqlite")
+os.environ.setdefault("JWT_SECRET", "bench")
+os.environ.setdefault("DB_ASYNC_ENABLED", "false")  # pysqlite has no async driver
+os.environ.setdefault("REDIS_ENABLED", "false")
+os.environ.setdefault("MEAL_IMPORT_MAX_MEALS", "10000000")
+
+import orjson  # noqa: E402
+
+from app.db.base import Base  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.meals.meal_export import CSV_HEADER  # noqa: E402
+from app.services.meals.meal_import import MealImportService  # noqa: E402
+
+
+def _write_file(path: str, fmt: str, n_meals: int, items_per_meal: int) -> None:
+    start = datetime.datetime(2012, 1, 1, 8, tzinfo=datetime.timezone.utc)
+    with open(path, "w", encoding="utf-8") as f:
+        if fmt == "csv":
+            f.write(",".join(CSV_HEADER) + "\n")
+        for i in range(n_meals):
+            created_at = start + datetime.timedelta(hours=4 * i)
+            items = [
+                {"name": f"item {pos}", "quantity": "1.5", "unit": "cup", "calories": 180, "protein_g": "9.25"}
+                for pos in range(items_per_meal)
+            ]
+            meal = {
+                "title": "Oats with milk",
+                "raw_text": f"oats and milk #{i}",
+                "meal_date": created_at.date().isoformat(),
+                "created_at": created_at.isoformat(),
+                "items": items,
+            }
+            if fmt == "ndjson":
+                f.write(orjson.dumps(meal).decode() + "\n")
+                continue
+            for pos, it in enumerate(items):
+                f.write(
+                    f"m{i},{meal['meal_date']},{meal['created_at']},{meal['title']},{meal['raw_text']},,,"
+                    f"{pos},{it['name']},{it['quantity']},{it['unit']},{it['calories']},{it['protein_g']}\n"
+                )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--meals", type=int, default=100_000)
+    parser.add_argument("--items-per-meal", type=int, default=3)
+    parser.add_argument("--formats", default="ndjson,csv")
+    args = parser.parse_args()
+
+    if engine.dialect.name == "sqlite":
+        Base.metadata.create_all(engine)
+
+    for fmt in args.formats.split(","):
+        path = os.path.join(tempfile.mkdtemp(), f"history.{fmt}")
+        _write_file(path, fmt, args.meals, args.items_per_meal)
+        size_mb = os.path.getsize(path) / 2**20
+
+        db = SessionLocal()
+        user = User(email=f"import-{time.time_ns()}@bench.dev", hashed_password="x")
+        db.add(user)
+        db.commit()
+
+        started = time.perf_counter()
+        with open(path, "rb") as f:
+            out = MealImportService(db).import_file(user.id, f, fmt)
+        elapsed = time.perf_counter() - started
+
+        started = time.perf_counter()
+        with open(path, "rb") as f:
+            again = MealImportService(db).import_file(user.id, f, fmt)
+        elapsed_again = time.perf_counter() - started
+        db.close()
+
+        print(
+            f"{fmt:<6} {size_mb:6.1f} MB  {out.meals_imported} meals / {out.items_imported} items "
+            f"over {out.days_affected} days in {elapsed:6.2f}s ({out.meals_imported / elapsed:8.0f} meals/s)  "
+            f"re-import: {again.meals_skipped} skipped in {elapsed_again:6.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
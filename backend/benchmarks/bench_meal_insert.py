@@ -0,0 +1,106 @@
+"""
+Micro-benchmark for MealRepository.create_meal_with_items with 1, 10 and 50
+items: the previous unit-of-work flow (add/flush/add per item/commit/refresh)
+vs the INSERT ... RETURNING path. Reports mean latency and SQL statements
+per meal.
+
+    cd backend && python -m benchmarks.bench_meal_insert --meals 200
+
+Uses a throwaway SQLite file by default; point DATABASE_URL at a migrated
+Postgres to include real network round trips.
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import os
+import tempfile
+import time
+from decimal import Decimal
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/insert.sqlite")
+os.environ.setdefault("JWT_SECRET", "bench")
+os.environ.setdefault("DB_ASYNC_ENABLED", "false")  # pysqlite has no async driver
+
+from sqlalchemy import event  # noqa: E402
+
+from app.db.base import Base  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.models.meal import Meal  # noqa: E402
+from app.models.meal_item import MealItem  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.repositories.meal_repository import MealRepository  # noqa: E402
+
+_statements = 0
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _count(*_args) -> None:
+    global _statements
+    _statements += 1
+
+
+def _legacy_create(db, *, user_id, items, **fields) -> Meal:
+    meal = Meal(user_id=user_id, **fields)
+    db.add(meal)
+    db.flush()
+    for idx, it in enumerate(items):
+        db.add(MealItem(meal_id=meal.id, position=idx, **it))
+    db.commit()
+    db.refresh(meal)
+    return meal
+
+
+def _items(n: int) -> list[dict]:
+    return [
+        {"name": f"item {i}", "quantity": 1, "unit": "g" if i % 2 else None, "calories": 50, "protein_g": 3}
+        for i in range(n)
+    ]
+
+
+def _run(label: str, create, user_id, n_items: int, meals: int) -> None:
+    global _statements
+    items = _items(n_items)
+    db = SessionLocal()
+    try:
+        _statements = 0
+        start = time.perf_counter()
+        for _ in range(meals):
+            create(
+                db,
+                user_id=user_id,
+                raw_text="bench",
+                title="bench",
+                total_calories=50 * n_items,
+                total_protein_g=Decimal(3 * n_items),
+                meal_date=datetime.date.today(),
+                items=items,
+            )
+        elapsed_ms = (time.perf_counter() - start) * 1000
+    finally:
+        db.close()
+    print(f"{label:<8} items={n_items:<3} mean={elapsed_ms / meals:7.3f}ms  statements/meal={_statements / meals:5.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--meals", type=int, default=200)
+    args = parser.parse_args()
+
+    if engine.dialect.name == "sqlite":
+        Base.metadata.create_all(engine)
+
+    db = SessionLocal()
+    user = User(email=f"bench-{time.time_ns()}@bench.dev", hashed_password="x")
+    db.add(user)
+    db.commit()
+    user_id = user.id
+    db.close()
+
+    for n_items in (1, 10, 50):
+        _run("legacy", _legacy_create, user_id, n_items, args.meals)
+        _run("bulk", lambda db, **kw: MealRepository(db).create_meal_with_items(**kw), user_id, n_items, args.meals)
+
+
+if __name__ == "__main__":
+    main()
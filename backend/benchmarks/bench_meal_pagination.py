@@ -0,0 +1,106 @@
+"""
+Deep-page latency of MealRepository.list_by_user for a user with 100k meals:
+LIMIT/OFFSET vs keyset pagination on (created_at, id).
+
+    cd backend && python -m benchmarks.bench_meal_pagination --meals 100000
+
+Uses a throwaway SQLite file by default (with ix_meals_user_created_at created
+as in the migrations); point DATABASE_URL at a migrated Postgres for real numbers.
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import os
+import statistics
+import tempfile
+import time
+import uuid
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/pagination.sqlite")
+os.environ.setdefault("JWT_SECRET", "bench")
+os.environ.setdefault("DB_ASYNC_ENABLED", "false")  # pysqlite has no async driver
+
+from sqlalchemy import Index, insert  # noqa: E402
+
+from app.db.base import Base  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.models.meal import Meal  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.repositories.meal_repository import MealRepository  # noqa: E402
+
+PAGE = 50
+REPEATS = 20
+
+
+def _seed(n_meals: int) -> uuid.UUID:
+    if engine.dialect.name == "sqlite":
+        Base.metadata.create_all(engine)
+        Index("ix_meals_user_created_at", Meal.user_id, Meal.created_at).create(engine, checkfirst=True)
+
+    db = SessionLocal()
+    user = User(email=f"pages-{time.time_ns()}@bench.dev", hashed_password="x")
+    db.add(user)
+    db.commit()
+    user_id = user.id
+
+    start = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+    batch = []
+    for i in range(n_meals):
+        created_at = start + datetime.timedelta(minutes=20 * i)
+        batch.append(
+            {
+                "id": uuid.uuid4(),
+                "user_id": user_id,
+                "raw_text": "bench",
+                "title": "bench",
+                "total_calories": 500,
+                "total_protein_g": 30,
+                "meal_date": created_at.date(),
+                "created_at": created_at,
+            }
+        )
+        if len(batch) == 10_000:
+            db.execute(insert(Meal.__table__), batch)
+            batch.clear()
+    if batch:
+        db.execute(insert(Meal.__table__), batch)
+    db.commit()
+    db.close()
+    return user_id
+
+
+def _time(fn) -> float:
+    samples = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--meals", type=int, default=100_000)
+    args = parser.parse_args()
+
+    user_id = _seed(args.meals)
+    db = SessionLocal()
+    repo = MealRepository(db)
+
+    for depth in (0, 1_000, 10_000, 50_000, args.meals - PAGE):
+        boundary = None
+        if depth > 0:
+            row = repo.list_by_user(user_id, limit=1, offset=depth - 1)[0]
+            boundary = (row.created_at, row.id)
+
+        offset_ms = _time(lambda: repo.list_by_user(user_id, limit=PAGE, offset=depth))
+        keyset_ms = _time(lambda: repo.list_by_user(user_id, limit=PAGE, after=boundary))
+        db.expunge_all()
+        print(f"depth={depth:<7} offset={offset_ms:8.2f}ms  keyset={keyset_ms:6.2f}ms")
+
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
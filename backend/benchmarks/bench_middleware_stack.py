@@ -0,0 +1,153 @@
+"""
+Per-request cost of the middleware stack (rate limit + access log) on a
+trivial endpoint: the previous BaseHTTPMiddleware / @app.middleware("http")
+wrappers vs the plain ASGI middleware now in app.main.
+
+    cd backend && python -m benchmarks.bench_middleware_stack --requests 20000
+
+Requests are fed to the ASGI app directly (no server, no HTTP client), so the
+numbers are the stack's own overhead. Both stacks run the same rate-limit
+logic; with REDIS_ENABLED=false the limiter answers without I/O, leaving only
+the wrapping machinery. "none" is the bare app for reference. /stream returns
+a 100-chunk StreamingResponse.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("JWT_SECRET", "bench")
+os.environ.setdefault("REDIS_ENABLED", "false")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "true")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from fastapi import FastAPI, Request  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+from starlette.responses import PlainTextResponse, StreamingResponse  # noqa: E402
+
+from app.core.logging import AccessLogMiddleware  # noqa: E402
+from app.middlewares.rate_limit import RateLimitMiddleware  # noqa: E402
+
+
+class _BaseHTTPRateLimit(BaseHTTPMiddleware):
+    # The previous wrapper around the same limiter logic.
+    def __init__(self, app) -> None:
+        super().__init__(app)
+        self.limiter = RateLimitMiddleware(app)
+
+    async def dispatch(self, request: Request, call_next):
+        if not self.limiter.enabled:
+            return await call_next(request)
+        response = await self.limiter._rejection(request)
+        return response if response is not None else await call_next(request)
+
+
+async def _http_access_log(request: Request, call_next):
+    # The previous @app.middleware("http") access log.
+    start_time = time.perf_counter()
+    response = await call_next(request)
+    duration_ms = (time.perf_counter() - start_time) * 1000
+    logging.getLogger("access").info(
+        "%s %s -> %s (%.2fms)", request.method, request.url.path, response.status_code, duration_ms
+    )
+    return response
+
+
+def _build(stack: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    def ping() -> PlainTextResponse:
+        return PlainTextResponse("pong")
+
+    @app.get("/stream")
+    def stream() -> StreamingResponse:
+        return StreamingResponse((b"x" * 1024 for _ in range(100)), media_type="application/octet-stream")
+
+    if stack == "basehttp":
+        app.middleware("http")(_http_access_log)
+        app.add_middleware(_BaseHTTPRateLimit)
+    elif stack == "asgi":
+        app.add_middleware(AccessLogMiddleware)
+        app.add_middleware(RateLimitMiddleware)
+    return app
+
+
+async def _request(app: FastAPI, path: str) -> int:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    status = 0
+    body_sent = False
+    done = asyncio.Event()
+
+    async def receive():
+        # The request body once, then (as a server would) block until the
+        # response is complete; StreamingResponse listens for the disconnect.
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body" and not message.get("more_body", False):
+            done.set()
+
+    await app(scope, receive, send)
+    return status
+
+
+async def _run(stack: str, path: str, n: int) -> list[float]:
+    app = _build(stack)
+    for _ in range(200):  # warm-up (route compilation, middleware stack build)
+        await _request(app, path)
+
+    timings = []
+    for _ in range(n):
+        start = time.perf_counter()
+        status = await _request(app, path)
+        timings.append((time.perf_counter() - start) * 1e6)
+        if status != 200:
+            raise RuntimeError(f"{stack} {path}: HTTP {status}")
+    return sorted(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--stacks", default="none,basehttp,asgi")
+    parser.add_argument("--paths", default="/ping,/stream")
+    args = parser.parse_args()
+
+    for path in args.paths.split(","):
+        for stack in args.stacks.split(","):
+            t = asyncio.run(_run(stack, path, args.requests))
+            print(
+                f"{path:<8} {stack:<9} mean={statistics.fmean(t):8.1f}us p50={statistics.median(t):8.1f}us "
+                f"p99={t[int(len(t) * 0.99) - 1]:8.1f}us"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Per-call latency of the OpenAI client: new client per call (old behaviour)
+vs the process-wide pooled client, plus the AsyncOpenAI path.
+
+Runs against a local fake OpenAI server, so no API key or network is needed:
+
+    cd backend && python -m benchmarks.bench_openai_client --calls 200
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+HOST = "127.0.0.1"
+PORT = 8787
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("JWT_SECRET", "bench")
+os.environ.setdefault("DB_ASYNC_ENABLED", "false")  # pysqlite has no async driver
+os.environ.setdefault("REDIS_ENABLED", "false")
+os.environ["OPENAI_API_KEY"] = "bench"
+os.environ["OPENAI_BASE_URL"] = f"http://{HOST}:{PORT}/v1"
+
+from openai import OpenAI  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.services.openai import meal_parser  # noqa: E402
+
+MEAL_JSON = json.dumps(
+    {
+        "title": "Eggs",
+        "totals": {"calories": 140, "protein_g": 12},
+        "items": [{"name": "egg", "quantity": 2, "unit": None, "calories": 140, "protein_g": 12}],
+        "notes": [],
+    }
+)
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+    disable_nagle_algorithm = True
+
+    def do_POST(self) -> None:  # noqa: N802
+        length = int(self.headers.get("content-length", "0"))
+        self.rfile.read(length)
+        body = json.dumps(
+            {
+                "id": "chatcmpl-bench",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": settings.openai_model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "finish_reason": "stop",
+                        "message": {"role": "assistant", "content": MEAL_JSON},
+                    }
+                ],
+            }
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args) -> None:
+        return
+
+
+def _report(label: str, samples_ms: list[float]) -> None:
+    samples_ms.sort()
+    p95 = samples_ms[int(len(samples_ms) * 0.95) - 1]
+    print(f"{label:<28} mean={statistics.mean(samples_ms):7.3f}ms  p50={statistics.median(samples_ms):7.3f}ms  p95={p95:7.3f}ms")
+
+
+def bench_client_per_call(calls: int) -> list[float]:
+    original = meal_parser.get_openai_client
+    meal_parser.get_openai_client = lambda: OpenAI(
+        api_key=settings.openai_api_key, base_url=settings.openai_base_url
+    )
+    try:
+        return _time_sync(calls)
+    finally:
+        meal_parser.get_openai_client = original
+
+
+def _time_sync(calls: int) -> list[float]:
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        meal_parser._parse_meal_uncached("2 eggs")
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+async def _time_async(calls: int) -> list[float]:
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        await meal_parser._parse_meal_uncached_async("2 eggs")
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((HOST, PORT), FakeOpenAIHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        _time_sync(10)  # warm up the pooled client
+        _report("before: client per call", bench_client_per_call(args.calls))
+        _report("after: pooled sync client", _time_sync(args.calls))
+        _report("after: pooled async client", asyncio.run(_time_async(args.calls)))
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Rate limiter overhead per request at a fixed arrival rate: the blocking client
+on the anyio threadpool (the old middleware path) vs redis.asyncio on the loop,
+and the hybrid limiter (global rule from a worker-local lease, RL_HYBRID_*).
+
+    cd backend && python -m benchmarks.bench_rate_limiter --rps 2000 --seconds 10
+    # sparse clients: each of 5000 IPs sends one request every 10s
+    cd backend && python -m benchmarks.bench_rate_limiter --modes hybrid --rps 500 --identifiers 5000 --seconds 60
+
+Checks are fired open-loop at --rps (global + route bucket, one EVALSHA each),
+so latency includes any wait for a worker thread. --sync-load N keeps N
+threadpool tokens busy with --sync-ms blocking calls, the way sync endpoints
+do under load; the thread path queues behind them, the async path does not.
+The hybrid mode checks the global rule of the app (RL_GLOBAL_*) and reports
+how many requests needed a Redis sync.
+
+Needs a Redis at REDIS_HOST/REDIS_PORT (default localhost:6379).
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("JWT_SECRET", "bench")
+os.environ.setdefault("REDIS_HOST", "localhost")
+
+import anyio  # noqa: E402
+
+from app.infra.redis.client import get_redis_client  # noqa: E402
+from app.infra.redis.hybrid_rate_limit import HybridTokenBucketLimiter  # noqa: E402
+from app.infra.redis.rate_limit import (  # noqa: E402
+    RateLimitRule,
+    TokenBucketLimiter,
+    build_rl_key,
+    global_rule_from_env,
+)
+
+# Large buckets: every check is allowed, so only the cost of checking is measured.
+GLOBAL = RateLimitRule(name="bench_global", capacity=1e9, refill_per_sec=1e6)
+ROUTE = RateLimitRule(name="bench_route", capacity=1e9, refill_per_sec=1e6)
+
+
+def _identifier(i: int, identifiers: int) -> str:
+    n = i % identifiers
+    return f"ip:10.0.{n // 256}.{n % 256}"
+
+
+def _buckets(i: int, identifiers: int) -> list[tuple[str, RateLimitRule]]:
+    identifier = _identifier(i, identifiers)
+    return [
+        (build_rl_key(GLOBAL.name, identifier, "all"), GLOBAL),
+        (build_rl_key(ROUTE.name, identifier, "POST:/api/v1/meals"), ROUTE),
+    ]
+
+
+def _hybrid_limiter() -> HybridTokenBucketLimiter:
+    return HybridTokenBucketLimiter(
+        lease_size=int(os.getenv("RL_HYBRID_LEASE_SIZE", "20")),
+        sync_seconds=float(os.getenv("RL_HYBRID_SYNC_SECONDS", "5.0")),
+        max_keys=int(os.getenv("RL_HYBRID_MAX_KEYS", "10000")),
+    )
+
+
+async def _run(mode: str, rps: int, seconds: float, identifiers: int, sync_load: int, sync_ms: float) -> dict:
+    limiter = TokenBucketLimiter()
+    hybrid = _hybrid_limiter()
+    app_rule = global_rule_from_env()
+    # Fresh bucket names per run, so a previous run's debits don't carry over.
+    hybrid_rule = RateLimitRule(
+        name=f"bench_hybrid_{time.time_ns()}",
+        capacity=app_rule.capacity,
+        refill_per_sec=app_rule.refill_per_sec,
+    )
+    latencies: list[float] = []
+    errors = 0
+    total = int(rps * seconds)
+    interval = 1.0 / rps
+
+    async def check(i: int, scheduled: float) -> None:
+        nonlocal errors
+        buckets = _buckets(i, identifiers)
+        try:
+            if mode == "thread":
+                await anyio.to_thread.run_sync(limiter.allow_many, buckets)
+            elif mode == "hybrid":
+                # As RateLimitMiddleware: global rule from the lease, route rule exact.
+                global_key = build_rl_key(hybrid_rule.name, _identifier(i, identifiers), "all")
+                await hybrid.allow_async(global_key, hybrid_rule)
+                await limiter.allow_many_async(buckets[1:])
+            else:
+                await limiter.allow_many_async(buckets)
+        except Exception:
+            errors += 1
+        latencies.append((time.perf_counter() - scheduled) * 1000)
+
+    async def sync_endpoint(stop: anyio.Event) -> None:
+        while not stop.is_set():
+            await anyio.to_thread.run_sync(time.sleep, sync_ms / 1000)
+
+    # Warm up the connection pool and script cache outside the measurement.
+    if mode == "thread":
+        await anyio.to_thread.run_sync(limiter.allow_many, _buckets(0, identifiers))
+    else:
+        await limiter.allow_many_async(_buckets(0, identifiers))
+
+    stop = anyio.Event()
+    started = time.perf_counter()
+    async with anyio.create_task_group() as load:
+        for _ in range(sync_load):
+            load.start_soon(sync_endpoint, stop)
+
+        async with anyio.create_task_group() as tg:
+            for i in range(total):
+                scheduled = started + i * interval
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    await anyio.sleep(delay)
+                tg.start_soon(check, i, scheduled)
+        elapsed = time.perf_counter() - started
+        stop.set()
+
+    latencies.sort()
+    return {
+        "achieved_rps": total / elapsed,
+        "p50": statistics.median(latencies),
+        "p99": latencies[max(int(len(latencies) * 0.99) - 1, 0)],
+        "max": latencies[-1],
+        "errors": errors,
+        "syncs": hybrid.stats.syncs,
+        "requests": total,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rps", type=int, default=2000)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--identifiers", type=int, default=1000, help="distinct client IPs")
+    parser.add_argument("--sync-load", type=int, default=0, help="threadpool tokens held by sync work")
+    parser.add_argument("--sync-ms", type=float, default=50.0, help="duration of each sync call")
+    parser.add_argument("--modes", default="thread,async", help="comma-separated: thread, async, hybrid")
+    args = parser.parse_args()
+
+    r = get_redis_client()
+    if r is None:
+        raise SystemExit("REDIS_ENABLED=false: nothing to measure")
+    r.ping()
+
+    for mode in args.modes.split(","):
+        mode = mode.strip()
+        res = anyio.run(_run, mode, args.rps, args.seconds, args.identifiers, args.sync_load, args.sync_ms)
+        print(
+            f"{mode:<6} sync_load={args.sync_load:<3} achieved={res['achieved_rps']:7.0f} rps  "
+            f"p50={res['p50']:7.2f}ms p99={res['p99']:7.2f}ms max={res['max']:8.2f}ms errors={res['errors']}"
+        )
+        if mode == "hybrid":
+            print(
+                f"       global-rule syncs={res['syncs']} for {res['requests']} requests "
+                f"({res['syncs'] / res['requests']:.1%}), {args.identifiers} clients"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Read throughput of the hot endpoints (GET /api/v1/days/today, GET /api/v1/meals)
+at 500 concurrent connections: the sync services on the threadpool vs the async
+services on the AsyncSession engine (DB_ASYNC_ENABLED=false / true), behind the
+same async handlers.
+
+Starts one uvicorn worker per mode and drives it over real TCP connections:
+
+    cd backend && DATABASE_URL=postgresql+psycopg://... python -m benchmarks.load_async_db \\
+        --concurrency 500 --requests 20000
+
+Needs a migrated Postgres (the async path uses psycopg's async driver). Run the
+load generator on its own core/host, otherwise it competes with the server for CPU.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("JWT_SECRET", "bench")
+os.environ.setdefault("REDIS_ENABLED", "false")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+if not os.getenv("DATABASE_URL", "").startswith("postgresql"):
+    sys.exit("DATABASE_URL must point at a migrated Postgres")
+
+import httpx  # noqa: E402
+from decimal import Decimal  # noqa: E402
+
+from app.auth.jwt import create_access_token  # noqa: E402
+from app.db.session import SessionLocal  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.repositories.meal_repository import MealRepository  # noqa: E402
+from app.services.meals.meal_service import _today_local_date  # noqa: E402
+
+PATHS = ("/api/v1/days/today", "/api/v1/meals?limit=20")
+
+
+def _seed(n_meals: int) -> str:
+    db = SessionLocal()
+    user = User(email=f"async-{time.time_ns()}@bench.dev", hashed_password="x")
+    db.add(user)
+    db.commit()
+    user_id = user.id
+
+    repo = MealRepository(db)
+    for i in range(n_meals):
+        repo.create_meal_with_items(
+            user_id=user_id,
+            raw_text=f"meal {i}",
+            title=f"meal {i}",
+            total_calories=500,
+            total_protein_g=Decimal("30"),
+            meal_date=_today_local_date(),
+            items=[{"name": "egg", "quantity": 2, "calories": 500, "protein_g": 30}],
+        )
+    db.close()
+    return create_access_token(str(user_id))
+
+
+def _start_server(port: int, async_enabled: bool) -> subprocess.Popen:
+    env = {**os.environ, "DB_ASYNC_ENABLED": "true" if async_enabled else "false"}
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning", "--no-access-log"],
+        env=env,
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/openapi.json", timeout=1)
+            return proc
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError("server did not start")
+
+
+async def _drive(base_url: str, token: str, concurrency: int, total: int) -> tuple[float, list[float], int]:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    headers = {"Authorization": f"Bearer {token}"}
+    latencies: list[float] = []
+    errors = 0
+    next_request = 0
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, headers=headers, timeout=60) as client:
+
+        async def worker() -> None:
+            nonlocal errors, next_request
+            while next_request < total:
+                path = PATHS[next_request % len(PATHS)]
+                next_request += 1
+                start = time.perf_counter()
+                try:
+                    r = await client.get(path)
+                    if r.status_code != 200:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+        elapsed = time.perf_counter() - start
+
+    return elapsed, latencies, errors
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--meals", type=int, default=20)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--modes", default="sync,async", help="comma-separated: sync, async")
+    args = parser.parse_args()
+
+    token = _seed(args.meals)
+
+    for mode in args.modes.split(","):
+        async_enabled = mode.strip() == "async"
+        proc = _start_server(args.port, async_enabled)
+        try:
+            elapsed, latencies, errors = asyncio.run(
+                _drive(f"http://127.0.0.1:{args.port}", token, args.concurrency, args.requests)
+            )
+        finally:
+            proc.terminate()
+            proc.wait()
+
+        latencies.sort()
+        print(
+            f"mode={'async' if async_enabled else 'sync':<5} concurrency={args.concurrency} "
+            f"rps={len(latencies) / elapsed:8.1f} p50={statistics.median(latencies):7.1f}ms "
+            f"p99={latencies[int(len(latencies) * 0.99) - 1]:7.1f}ms errors={errors}"
+        )
+
+
+if __name__ == "__main__":
+    main()
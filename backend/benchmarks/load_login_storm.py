@@ -0,0 +1,182 @@
+"""
+Meal/day read latency during a login storm: bcrypt inline on the request
+threadpool (PASSWORD_HASH_WORKERS=0) vs the dedicated password process pool.
+
+Per mode, one uvicorn worker is started and driven over TCP in two phases of
+--seconds each: readers alone (baseline), then readers plus --storm concurrent
+POST /auth/login with the right password. Reader p50/p99 should stay close to
+the baseline with the pool; logins beyond PASSWORD_HASH_MAX_PENDING get 503.
+
+    cd backend && python -m benchmarks.load_login_storm --storm 200 --seconds 10
+
+Uses a throwaway SQLite file and sync handlers by default; point DATABASE_URL
+at a migrated Postgres (and set DB_ASYNC_ENABLED) to measure the real thing.
+bcrypt needs cores: with fewer cores than pool workers + 1 the storm still
+competes with the readers for CPU.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/storm.sqlite")
+os.environ.setdefault("JWT_SECRET", "bench")
+os.environ.setdefault("DB_ASYNC_ENABLED", "false")  # pysqlite has no async driver
+os.environ.setdefault("REDIS_ENABLED", "false")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.setdefault("METRICS_TOKEN", "bench")
+
+import httpx  # noqa: E402
+from decimal import Decimal  # noqa: E402
+
+from app.auth.jwt import create_access_token  # noqa: E402
+from app.core.security import hash_password  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.repositories.meal_repository import MealRepository  # noqa: E402
+from app.services.meals.meal_service import _today_local_date  # noqa: E402
+
+READ_PATHS = ("/api/v1/days/today", "/api/v1/meals?limit=20")
+PASSWORD = "password123"
+
+
+def _seed(n_meals: int) -> tuple[str, str]:
+    if engine.dialect.name == "sqlite":
+        Base.metadata.create_all(engine)
+
+    db = SessionLocal()
+    email = f"storm-{time.time_ns()}@bench.dev"
+    user = User(email=email, hashed_password=hash_password(PASSWORD))
+    db.add(user)
+    db.commit()
+    user_id = user.id
+
+    repo = MealRepository(db)
+    for i in range(n_meals):
+        repo.create_meal_with_items(
+            user_id=user_id,
+            raw_text=f"meal {i}",
+            title=f"meal {i}",
+            total_calories=500,
+            total_protein_g=Decimal("30"),
+            meal_date=_today_local_date(),
+            items=[{"name": "egg", "quantity": 2, "calories": 500, "protein_g": 30}],
+        )
+    db.close()
+    return email, create_access_token(str(user_id))
+
+
+def _start_server(port: int, env_overrides: dict[str, str]) -> subprocess.Popen:
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning", "--no-access-log"],
+        env={**os.environ, **env_overrides},
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/openapi.json", timeout=1)
+            return proc
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError("server did not start")
+
+
+async def _phase(base_url: str, token: str, email: str, readers: int, storm: int, seconds: float) -> dict:
+    read_latencies: list[float] = []
+    read_errors = 0
+    logins: dict[int | str, int] = {}
+    deadline = time.perf_counter() + seconds
+
+    limits = httpx.Limits(max_connections=readers + storm, max_keepalive_connections=readers + storm)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+
+        async def reader(i: int) -> None:
+            nonlocal read_errors
+            headers = {"Authorization": f"Bearer {token}"}
+            n = i
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    r = await client.get(READ_PATHS[n % len(READ_PATHS)], headers=headers)
+                    if r.status_code != 200:
+                        read_errors += 1
+                except httpx.HTTPError:
+                    read_errors += 1
+                read_latencies.append((time.perf_counter() - start) * 1000)
+                n += 1
+
+        async def login() -> None:
+            while time.perf_counter() < deadline:
+                try:
+                    r = await client.post("/auth/login", json={"email": email, "password": PASSWORD})
+                    key: int | str = r.status_code
+                except httpx.HTTPError:
+                    key = "error"
+                logins[key] = logins.get(key, 0) + 1
+
+        await asyncio.gather(*[reader(i) for i in range(readers)], *[login() for _ in range(storm)])
+        metrics_headers = {"Authorization": f"Bearer {os.environ['METRICS_TOKEN']}"}
+        metrics = (await client.get("/metrics", headers=metrics_headers)).json().get("password_pool", {})
+
+    read_latencies.sort()
+    return {
+        "reads": len(read_latencies),
+        "p50": statistics.median(read_latencies) if read_latencies else 0.0,
+        "p99": read_latencies[max(int(len(read_latencies) * 0.99) - 1, 0)] if read_latencies else 0.0,
+        "read_errors": read_errors,
+        "logins": logins,
+        "pool": metrics,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--readers", type=int, default=20)
+    parser.add_argument("--storm", type=int, default=200, help="concurrent login clients")
+    parser.add_argument("--seconds", type=float, default=10.0, help="per phase")
+    parser.add_argument("--workers", type=int, default=2, help="password pool processes")
+    parser.add_argument("--meals", type=int, default=20)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--modes", default="inline,pool", help="comma-separated: inline, pool")
+    args = parser.parse_args()
+
+    email, token = _seed(args.meals)
+    modes = {
+        # Old behaviour: bcrypt on the request threadpool, no admission limit.
+        "inline": {"PASSWORD_HASH_WORKERS": "0", "PASSWORD_HASH_MAX_PENDING": "100000"},
+        "pool": {"PASSWORD_HASH_WORKERS": str(args.workers)},
+    }
+
+    for mode in args.modes.split(","):
+        mode = mode.strip()
+        proc = _start_server(args.port, modes[mode])
+        try:
+            base_url = f"http://127.0.0.1:{args.port}"
+            for label, storm in (("baseline", 0), ("storm", args.storm)):
+                r = asyncio.run(_phase(base_url, token, email, args.readers, storm, args.seconds))
+                logins = " ".join(f"{k}={v}" for k, v in sorted(r["logins"].items(), key=str)) or "-"
+                print(
+                    f"mode={mode:<6} {label:<8} reads={r['reads']:6d} p50={r['p50']:7.1f}ms "
+                    f"p99={r['p99']:7.1f}ms read_errors={r['read_errors']}  logins: {logins}"
+                )
+            pool = r["pool"]
+            print(
+                f"mode={mode:<6} pool: completed={pool.get('completed')} rejected={pool.get('rejected')} "
+                f"queue_wait_ms_avg={pool.get('queue_wait_ms_avg')} hash_ms_avg={pool.get('hash_ms_avg')}"
+            )
+        finally:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Concurrent POST /api/v1/meals against the default SQLAlchemy pool
+(5 + 10 overflow) with a simulated LLM latency.
+
+Reports wall time, peak connections checked out and failures, which shows
+whether the DB pool (not the LLM) is what limits concurrent meal creation:
+
+    cd backend && python -m benchmarks.load_meal_create --concurrency 60 --llm-ms 1000
+
+Uses a throwaway SQLite file by default; point DATABASE_URL at a migrated
+Postgres to measure the real thing.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/load.sqlite")
+os.environ.setdefault("JWT_SECRET", "bench")
+os.environ.setdefault("DB_ASYNC_ENABLED", "false")  # pysqlite has no async driver
+os.environ.setdefault("REDIS_ENABLED", "false")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+import httpx  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app.db.base import Base  # noqa: E402
+from app.db.session import engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.meals import meal_service  # noqa: E402
+from app.services.openai.meal_parser import ParsedMeal  # noqa: E402
+
+_in_use = 0
+_peak = 0
+
+
+@event.listens_for(engine, "checkout")
+def _on_checkout(*_args) -> None:
+    global _in_use, _peak
+    _in_use += 1
+    _peak = max(_peak, _in_use)
+
+
+@event.listens_for(engine, "checkin")
+def _on_checkin(*_args) -> None:
+    global _in_use
+    _in_use -= 1
+
+
+def _fake_parser(latency_s: float):
+    def parse(_text: str, **_kwargs) -> ParsedMeal:
+        time.sleep(latency_s)
+        return ParsedMeal(
+            title="Eggs",
+            totals={"calories": 140, "protein_g": 12},
+            items=[{"name": "egg", "quantity": 2, "calories": 140, "protein_g": 12}],
+        )
+
+    return parse
+
+
+async def run(concurrency: int) -> None:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        creds = {"email": "load@bench.dev", "password": "password123"}
+        await client.post("/auth/register", json=creds)
+        token = (await client.post("/auth/login", json=creds)).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        start = time.perf_counter()
+        responses = await asyncio.gather(
+            *[client.post("/api/v1/meals", json={"text": f"meal {i}"}, headers=headers) for i in range(concurrency)],
+            return_exceptions=True,
+        )
+        elapsed = time.perf_counter() - start
+
+    ok = sum(1 for r in responses if isinstance(r, httpx.Response) and r.status_code == 200)
+    print(
+        f"concurrency={concurrency} ok={ok} failed={concurrency - ok} "
+        f"wall={elapsed:.2f}s peak_connections={_peak} pool_size={engine.pool.size()}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=60)
+    parser.add_argument("--llm-ms", type=int, default=1000)
+    args = parser.parse_args()
+
+    if engine.dialect.name == "sqlite":
+        Base.metadata.create_all(engine)
+    meal_service.parse_meal = _fake_parser(args.llm_ms / 1000)
+    asyncio.run(run(args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import uuid
+from typing import Optional
+
+# Settings are read at import time: configure before anything imports `app`.
+_DB_DIR = tempfile.mkdtemp(prefix="calorie-tracker-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_DIR}/test.db"
+os.environ["JWT_SECRET"] = "test"
+os.environ["DB_ASYNC_ENABLED"] = "false"  # pysqlite has no async driver
+os.environ["REDIS_ENABLED"] = "false"
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+os.environ["PASSWORD_HASH_WORKERS"] = "0"
+
+import pytest  # noqa: E402
+import redis as redis_py  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app.auth.principal import principal_cache  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.session import engine  # noqa: E402
+from app.infra.redis import cache, singleflight  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+class InMemoryRedis:
+    """
+    The few string commands app.infra.redis.cache uses, kept in a dict.
+    TTLs are accepted and ignored: tests never run long enough to see one expire.
+    """
+
+    def __init__(self) -> None:
+        self.data: dict[str, str] = {}
+
+    def get(self, key: str) -> Optional[str]:
+        return self.data.get(key)
+
+    def mget(self, keys: list[str]) -> list[Optional[str]]:
+        return [self.data.get(k) for k in keys]
+
+    def set(self, key: str, value: str, ex: int | None = None, nx: bool = False) -> Optional[bool]:
+        if nx and key in self.data:
+            return None
+        self.data[key] = str(value)
+        return True
+
+    def setex(self, key: str, ttl_seconds: int, value: str) -> bool:
+        return bool(self.set(key, value, ex=ttl_seconds))
+
+    def delete(self, *keys: str) -> int:
+        return sum(self.data.pop(k, None) is not None for k in keys)
+
+    def incr(self, key: str) -> int:
+        value = int(self.data.get(key, "0")) + 1
+        self.data[key] = str(value)
+        return value
+
+
+class DownRedis:
+    """Every command raises, as during a Redis outage."""
+
+    def __getattr__(self, name):
+        def _fail(*args, **kwargs):
+            raise redis_py.ConnectionError("Redis is down")
+
+        return _fail
+
+
+class DownAsyncRedis:
+    def __getattr__(self, name):
+        async def _fail(*args, **kwargs):
+            raise redis_py.ConnectionError("Redis is down")
+
+        return _fail
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _schema():
+    Base.metadata.create_all(engine)
+    yield
+    Base.metadata.drop_all(engine)
+
+
+@pytest.fixture(autouse=True)
+def _clear_principal_cache():
+    principal_cache.clear_local()
+    yield
+    principal_cache.clear_local()
+
+
+@pytest.fixture
+def redis(monkeypatch) -> InMemoryRedis:
+    r = InMemoryRedis()
+    monkeypatch.setattr(cache, "get_redis_client", lambda: r)
+    return r
+
+
+@pytest.fixture
+def client() -> TestClient:
+    return TestClient(app)
+
+
+@pytest.fixture
+def auth_headers(client: TestClient) -> dict[str, str]:
+    email = f"{uuid.uuid4().hex}@example.com"
+    client.post("/auth/register", json={"email": email, "password": "password1"})
+    token = client.post("/auth/login", json={"email": email, "password": "password1"}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def db_queries():
+    """Every SQL statement sent to the database while the test runs."""
+    statements: list[str] = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _count)
+    yield statements
+    event.remove(engine, "before_cursor_execute", _count)
+
+
+@pytest.fixture
+def redis_down(monkeypatch) -> None:
+    monkeypatch.setattr(cache, "get_redis_client", lambda: DownRedis())
+    monkeypatch.setattr(cache, "get_async_redis_client", lambda: DownAsyncRedis())
+    monkeypatch.setattr(singleflight, "get_redis_client", lambda: DownRedis())
+    monkeypatch.setattr(singleflight, "get_async_redis_client", lambda: DownAsyncRedis())
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import json
+import uuid
+
+
+def _register(client) -> dict[str, str]:
+    email = f"{uuid.uuid4().hex}@example.com"
+    client.post("/auth/register", json={"email": email, "password": "password1"})
+    token = client.post("/auth/login", json={"email": email, "password": "password1"}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _import(client, auth_headers, body: bytes, fmt: str = "ndjson") -> dict:
+    response = client.post(
+        f"/api/v1/meals/import?format={fmt}",
+        files={"file": (f"meals.{fmt}", body)},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _history(client, auth_headers) -> list[dict]:
+    meals = client.get("/api/v1/meals?limit=200", headers=auth_headers).json()
+    return sorted(
+        (
+            {
+                "title": m["title"],
+                "raw_text": m["raw_text"],
+                "meal_date": m["meal_date"],
+                "created_at": m["created_at"],
+                "totals": m["totals"],
+                "items": [{k: it[k] for k in ("name", "quantity", "unit", "calories", "protein_g")} for it in m["items"]],
+            }
+            for m in meals
+        ),
+        key=lambda m: (m["meal_date"], m["raw_text"]),
+    )
+
+
+def _days(client, auth_headers, *dates: str) -> list[dict]:
+    days = [client.get(f"/api/v1/days/{d}", headers=auth_headers).json() for d in dates]
+    for day in days:
+        for meal in day["meals"]:
+            del meal["id"]  # new ids on import
+    return days
+
+
+FILE = b"\n".join(
+    json.dumps(rec).encode()
+    for rec in [
+        {
+            "title": "Breakfast",
+            "raw_text": "two eggs and toast",
+            "meal_date": "2021-02-01",
+            "created_at": "2021-02-01T08:30:00+00:00",
+            "items": [
+                {"name": "egg", "quantity": 2, "unit": "pcs", "calories": 140, "protein_g": 12},
+                {"name": "toast", "calories": 90, "protein_g": "3.5"},
+            ],
+        },
+        {"title": "Snack", "raw_text": "apple", "meal_date": "2021-02-01", "items": [{"name": "apple", "calories": 95, "protein_g": "0.5"}]},
+        {"title": "Dinner", "raw_text": "soup", "meal_date": "2021-02-02", "totals": {"calories": 300, "protein_g": 10}},
+    ]
+)
+
+
+def test_importing_the_same_file_twice_inserts_nothing_the_second_time(client, auth_headers):
+    first = _import(client, auth_headers, FILE)
+    assert (first["meals_imported"], first["items_imported"], first["meals_skipped"]) == (3, 3, 0)
+    before = _history(client, auth_headers), _days(client, auth_headers, "2021-02-01", "2021-02-02")
+
+    second = _import(client, auth_headers, FILE)
+
+    assert (second["meals_imported"], second["items_imported"], second["meals_skipped"]) == (0, 0, 3)
+    assert (_history(client, auth_headers), _days(client, auth_headers, "2021-02-01", "2021-02-02")) == before
+
+
+def test_export_reimports_to_the_same_history(client, auth_headers):
+    _import(client, auth_headers, FILE)
+
+    for fmt in ("ndjson", "csv"):
+        export = client.get(f"/api/v1/meals/export?format={fmt}", headers=auth_headers)
+        assert export.status_code == 200
+        target = _register(client)
+        result = _import(client, target, export.content, fmt)
+        assert result["meals_imported"] == 3
+
+        assert _history(client, target) == _history(client, auth_headers)
+        assert _days(client, target, "2021-02-01", "2021-02-02") == _days(client, auth_headers, "2021-02-01", "2021-02-02")
+        # Re-importing the export into its source account is a no-op.
+        assert _import(client, auth_headers, export.content, fmt)["meals_imported"] == 0
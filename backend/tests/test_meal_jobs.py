@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import datetime
+import uuid
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.core.errors import ErrorCodes
+from app.repositories.meal_repository import MealRepository
+from app.services.meals import meal_jobs
+from app.services.meals.meal_jobs import MealJobPool, MealJobStore
+from app.services.openai import meal_parser
+
+
+def _job() -> dict:
+    return {"id": str(uuid.uuid4()), "status": "done", "meal_id": None}
+
+
+def test_local_store_round_trip():
+    store = MealJobStore()
+    job = _job()
+    store.save(job)
+    assert store.load(uuid.UUID(job["id"])) == job
+
+
+def test_local_store_expires_and_prunes_jobs(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(meal_jobs.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(settings, "meal_job_ttl_seconds", 60)
+    store = MealJobStore()
+    old, new = _job(), _job()
+
+    store.save(old)
+    clock[0] += 30
+    store.save(new)
+    clock[0] += 31  # `old` is past its TTL, `new` is not
+
+    assert store.load(uuid.UUID(old["id"])) is None
+    assert store.load(uuid.UUID(new["id"])) == new
+    assert list(store._local) == [new["id"]]
+
+
+def _run_job() -> dict:
+    pool = MealJobPool(concurrency=1, max_queue_depth=1, store=MealJobStore())
+    job = pool.submit(uuid.uuid4(), "two eggs", datetime.date(2022, 2, 2))
+    pool._executor.shutdown(wait=True)
+    return pool.store.load(uuid.UUID(job["id"]))
+
+
+def _parsed(text: str) -> meal_parser.ParsedMeal:
+    return meal_parser.ParsedMeal(title="Eggs", totals={"calories": 140, "protein_g": 12}, items=[])
+
+
+def test_failed_parse_is_reported_as_parse_failure(monkeypatch):
+    def fail(text):
+        raise RuntimeError("LLM unavailable")
+
+    monkeypatch.setattr(meal_jobs, "parse_meal", fail)
+    job = _run_job()
+    assert (job["status"], job["error"]) == ("failed", ErrorCodes.MEAL_PARSE_FAILED)
+
+
+def test_failed_insert_is_reported_as_save_failure(monkeypatch):
+    def fail(self, **values):
+        raise OperationalError("INSERT", {}, Exception("database is down"))
+
+    monkeypatch.setattr(meal_jobs, "parse_meal", _parsed)
+    monkeypatch.setattr(MealRepository, "create_meal_with_items", fail)
+    job = _run_job()
+    assert (job["status"], job["error"]) == ("failed", ErrorCodes.MEAL_SAVE_FAILED)
+
+
+@pytest.fixture
+def redis_store(redis, monkeypatch) -> MealJobStore:
+    monkeypatch.setattr(meal_jobs, "get_redis_client", lambda: redis)
+    return MealJobStore()
+
+
+def test_job_of_a_gone_worker_is_reported_lost(redis_store):
+    job = {**_job(), "status": "queued", "worker": "restarted-worker"}
+    redis_store.save(job)
+
+    loaded = redis_store.load(uuid.UUID(job["id"]))
+    assert (loaded["status"], loaded["error"]) == ("failed", ErrorCodes.MEAL_JOB_LOST)
+    assert redis_store.load(uuid.UUID(job["id"]))["status"] == "failed"
+
+
+def test_job_of_a_live_worker_stays_queued(redis_store):
+    redis_store.heartbeat("live-worker")
+    job = {**_job(), "status": "queued", "worker": "live-worker"}
+    redis_store.save(job)
+
+    assert redis_store.load(uuid.UUID(job["id"]))["status"] == "queued"
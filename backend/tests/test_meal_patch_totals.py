@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import datetime
+import uuid
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, select
+
+from app.db.session import SessionLocal
+from app.models.daily_total import DailyTotal
+from app.models.meal import Meal
+from app.repositories.meal_repository import MealRepository
+
+DAY = datetime.date(2021, 5, 6)
+
+
+def _item(name: str, calories: int, protein_g: str) -> dict:
+    return {"name": name, "quantity": 1, "calories": calories, "protein_g": protein_g}
+
+
+def _add_meal(user_id: uuid.UUID, items: list[dict]) -> uuid.UUID:
+    db = SessionLocal()
+    try:
+        meal = MealRepository(db).create_meal_with_items(
+            user_id=user_id,
+            raw_text="meal",
+            title="meal",
+            total_calories=sum(it["calories"] for it in items),
+            total_protein_g=sum((Decimal(it["protein_g"]) for it in items), Decimal("0")),
+            meal_date=DAY,
+            items=items,
+        )
+        return meal.id
+    finally:
+        db.close()
+
+
+def _daily_total_matches_meals(user_id: uuid.UUID) -> None:
+    db = SessionLocal()
+    try:
+        row = db.get(DailyTotal, (user_id, DAY))
+        count, calories, protein_g = db.execute(
+            select(func.count(), func.sum(Meal.total_calories), func.sum(Meal.total_protein_g)).where(
+                Meal.user_id == user_id, Meal.meal_date == DAY
+            )
+        ).one()
+        assert (row.meals_count, row.calories, row.protein_g) == (count, calories, protein_g)
+    finally:
+        db.close()
+
+
+@pytest.mark.parametrize(
+    "new_items",
+    [
+        [_item("egg", 70, "6")],  # fewer
+        [_item("egg", 70, "6"), _item("toast", 90, "3"), _item("jam", 50, "0"), _item("milk", 60, "3.4")],  # more
+        [_item("oats", 150, "5"), _item("berries", 40, "0.5")],  # same number, new values
+    ],
+    ids=["fewer", "more", "same"],
+)
+def test_patch_items_keeps_daily_totals_equal_to_the_meals(client, auth_headers, new_items):
+    user_id = uuid.UUID(client.get("/api/v1/users/me", headers=auth_headers).json()["id"])
+    _add_meal(user_id, [_item("rice", 200, "4")])
+    meal_id = _add_meal(user_id, [_item("egg", 140, "12"), _item("toast", 90, "3")])
+
+    response = client.patch(f"/api/v1/meals/{meal_id}", json={"items": new_items}, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["totals"]["calories"] == sum(it["calories"] for it in new_items)
+
+    _daily_total_matches_meals(user_id)
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import datetime
+import uuid
+from decimal import Decimal
+
+from app.db.session import SessionLocal
+from app.repositories.meal_repository import MealRepository
+
+
+def _add_meals(user_id: uuid.UUID, n: int) -> None:
+    db = SessionLocal()
+    try:
+        for i in range(n):
+            MealRepository(db).create_meal_with_items(
+                user_id=user_id,
+                raw_text=f"meal {i}",
+                title=f"meal {i}",
+                total_calories=100,
+                total_protein_g=Decimal("10"),
+                meal_date=datetime.date(2020, 1, 1),
+                items=[{"name": "egg", "quantity": 1, "calories": 100, "protein_g": 10}],
+            )
+    finally:
+        db.close()
+
+
+def test_next_cursor_is_readable_cross_origin(client, auth_headers):
+    user_id = uuid.UUID(client.get("/api/v1/users/me", headers=auth_headers).json()["id"])
+    _add_meals(user_id, 2)
+
+    response = client.get("/api/v1/meals?limit=1", headers={**auth_headers, "Origin": "http://localhost:5173"})
+    assert response.status_code == 200
+    assert response.headers["x-next-cursor"]
+    assert "x-next-cursor" in response.headers["access-control-expose-headers"].lower()
+
+
+def test_cursor_pages_are_disjoint_and_complete(client, auth_headers):
+    user_id = uuid.UUID(client.get("/api/v1/users/me", headers=auth_headers).json()["id"])
+    _add_meals(user_id, 7)  # same second: ties on created_at are broken by id
+
+    seen: list[str] = []
+    url = "/api/v1/meals?limit=3"
+    for _ in range(5):
+        response = client.get(url, headers=auth_headers)
+        assert response.status_code == 200
+        seen += [m["id"] for m in response.json()]
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+        url = f"/api/v1/meals?limit=3&cursor={cursor}"
+
+    assert len(seen) == len(set(seen)) == 7
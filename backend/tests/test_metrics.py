@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import pytest
+
+from app.core.config import settings
+
+
+@pytest.fixture
+def metrics_token(monkeypatch) -> str:
+    monkeypatch.setattr(settings, "metrics_token", "scrape-secret")
+    return "scrape-secret"
+
+
+def test_metrics_requires_token(client, metrics_token):
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+
+    response = client.get("/metrics", headers={"Authorization": f"Bearer {metrics_token}"})
+    assert response.status_code == 200
+    assert "db_pool" in response.json()
+    assert set(response.json()["singleflight"]) >= {"leaders", "local_followers", "remote_followers", "timeouts"}
+
+
+def test_metrics_closed_without_configured_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "metrics_token", None)
+    assert client.get("/metrics", headers={"Authorization": "Bearer "}).status_code == 401
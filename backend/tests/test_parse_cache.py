@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import asyncio
+
+from app.services.openai.parse_cache import ParseCache
+
+
+def test_redis_errors_fall_back_to_local_cache(redis_down):
+    pc = ParseCache(max_entries=10, ttl_seconds=60)
+
+    assert pc.get("d1") is None
+    pc.set("d1", '{"title": "eggs"}')
+    assert pc.get("d1") == '{"title": "eggs"}'
+
+    assert pc.stats.as_dict() == {"local_hits": 1, "redis_hits": 0, "misses": 1, "bypassed": 0}
+
+
+def test_redis_errors_fall_back_to_local_cache_async(redis_down):
+    pc = ParseCache(max_entries=10, ttl_seconds=60)
+
+    async def scenario() -> tuple:
+        missed = await pc.get_async("d1")
+        await pc.set_async("d1", '{"title": "eggs"}')
+        return missed, await pc.get_async("d1")
+
+    assert asyncio.run(scenario()) == (None, '{"title": "eggs"}')
+    assert pc.stats.as_dict() == {"local_hits": 1, "redis_hits": 0, "misses": 1, "bypassed": 0}
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import uuid
+from decimal import Decimal
+
+import pytest
+
+from app.auth.principal import Principal, principal_cache
+from app.infra.redis.keys import principal_key
+
+
+@pytest.mark.parametrize("path", ["/api/v1/days/today", "/api/v1/analytics/summary"])
+def test_cache_hit_endpoints_run_no_queries(client, auth_headers, redis, db_queries, path):
+    assert client.get(path, headers=auth_headers).status_code == 200  # warms both caches
+    db_queries.clear()
+
+    response = client.get(path, headers=auth_headers)
+
+    assert response.status_code == 200
+    assert db_queries == []
+
+
+def test_cache_hit_from_redis_runs_no_queries(client, auth_headers, redis, db_queries):
+    client.get("/api/v1/days/today", headers=auth_headers)
+    principal_cache.clear_local()  # as seen from another worker: only Redis is warm
+    db_queries.clear()
+
+    assert client.get("/api/v1/days/today", headers=auth_headers).status_code == 200
+    assert db_queries == []
+
+
+def test_goals_update_invalidates_principal(client, auth_headers, redis):
+    client.get("/api/v1/days/today", headers=auth_headers)
+
+    client.patch("/api/v1/users/me", headers=auth_headers, json={"goal_calories": 2100})
+
+    # A day not summarized before: its goals come from the principal, not a cached summary.
+    goals = client.get("/api/v1/days/2020-01-01", headers=auth_headers).json()["goals"]
+    assert goals["calories"] == 2100
+
+
+def test_stale_read_cannot_repopulate_after_invalidate(redis):
+    user_id = uuid.uuid4()
+    stale = Principal(id=user_id, goal_calories=1800, goal_protein_g=Decimal("120"))
+
+    # A request read the users row, then the goals update committed and invalidated...
+    principal_cache.invalidate(user_id)
+    # ...and only now does that request write its copy back.
+    principal_cache.set(stale)
+    principal_cache.clear_local()
+
+    assert principal_cache.get(user_id) is None
+    assert redis.get(principal_key(user_id)) != stale.to_json()
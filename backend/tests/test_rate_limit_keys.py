@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import time
+
+from jose import jwt
+
+from app.core.config import settings
+from app.middlewares.rate_limit import _bearer_subject
+from app.middlewares.rate_limit_rules import CompiledRules, default_rule_table
+
+
+def _bearer(sub: str, exp: float) -> str:
+    token = jwt.encode({"sub": sub, "exp": int(exp)}, settings.jwt_secret, algorithm=settings.jwt_algorithm)
+    return f"Bearer {token}"
+
+
+def test_built_in_rules_are_per_ip():
+    rules = CompiledRules(default_rule_table())
+    assert rules.global_rule.key_by == "ip"
+    assert rules.match("POST", "/api/v1/meals").key_by == "ip"
+
+
+def test_import_has_a_strict_per_user_rule():
+    matched = CompiledRules(default_rule_table()).match("POST", "/api/v1/meals/import")
+    assert matched.rule.name == "meals_import"
+    assert matched.key_by == "user"
+    assert matched.rule.capacity <= 5
+
+
+def test_bearer_subject_expires_with_the_token(monkeypatch):
+    now = time.time()
+    header = _bearer("user-1", now + 60)
+    assert _bearer_subject(header) == "user-1"
+
+    # Same header, still in the decode cache, after the token's `exp`.
+    monkeypatch.setattr(time, "time", lambda: now + 120)
+    assert _bearer_subject(header) is None
+
+
+def test_sync_and_queued_meal_creation_share_one_bucket():
+    rules = CompiledRules(default_rule_table())
+    sync, queued = rules.match("POST", "/api/v1/meals"), rules.match("POST", "/api/v1/meals/jobs")
+    assert sync.rule is queued.rule
+    assert sync.route_group == queued.route_group == "POST:/api/v1/meals"
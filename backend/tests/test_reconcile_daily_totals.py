@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import datetime
+import uuid
+from decimal import Decimal
+
+from sqlalchemy import update
+
+from app.db.reconcile_daily_totals import reconcile
+from app.db.session import SessionLocal
+from app.infra.redis.keys import analytics_version_key, day_summary_key
+from app.models.daily_total import DailyTotal
+from app.models.user import User
+from app.repositories.meal_repository import MealRepository
+
+DAY = datetime.date(2021, 3, 4)
+
+
+def _user_with_meal() -> uuid.UUID:
+    db = SessionLocal()
+    try:
+        user = User(email=f"{uuid.uuid4().hex}@example.com", hashed_password="x")
+        db.add(user)
+        db.commit()
+        user_id = user.id
+        MealRepository(db).create_meal_with_items(
+            user_id=user_id,
+            raw_text="eggs",
+            title="eggs",
+            total_calories=140,
+            total_protein_g=Decimal("12"),
+            meal_date=DAY,
+            items=[{"name": "egg", "quantity": 2, "calories": 140, "protein_g": 12}],
+        )
+        return user_id
+    finally:
+        db.close()
+
+
+def test_fix_rewrites_drift_and_drops_cached_summaries(redis):
+    user_id = _user_with_meal()
+    db = SessionLocal()
+    try:
+        db.execute(update(DailyTotal).where(DailyTotal.user_id == user_id).values(calories=999))
+        db.commit()
+    finally:
+        db.close()
+    redis.set(day_summary_key(user_id, DAY), '{"stale": true}')
+
+    assert reconcile(fix=True) >= 1
+
+    assert redis.get(day_summary_key(user_id, DAY)) is None
+    assert redis.get(analytics_version_key(user_id)) == "1"
+    assert reconcile(fix=False) == 0
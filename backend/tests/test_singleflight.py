@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import asyncio
+
+import redis
+
+from app.infra.redis import singleflight
+from app.infra.redis.singleflight import SingleFlight
+from app.services.openai import meal_parser
+
+
+def _flight() -> SingleFlight:
+    return SingleFlight("test", lock_ttl_seconds=5, wait_timeout_seconds=1)
+
+
+def test_do_async_coalesces_concurrent_calls():
+    flight = _flight()
+    calls = 0
+
+    async def compute() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "parsed"
+
+    async def scenario() -> list[str]:
+        return await asyncio.gather(*(flight.do_async("k", compute) for _ in range(5)))
+
+    assert asyncio.run(scenario()) == ["parsed"] * 5
+    assert calls == 1
+
+
+def test_follower_takes_over_when_leader_is_cancelled():
+    flight = _flight()
+    calls = 0
+
+    async def compute() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "parsed"
+
+    async def scenario() -> str:
+        leader = asyncio.create_task(flight.do_async("k", compute))
+        await asyncio.sleep(0)  # leader registers the call
+        follower = asyncio.create_task(flight.do_async("k", compute))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await follower
+
+    assert asyncio.run(scenario()) == "parsed"
+    assert calls == 2
+
+
+def test_cancelled_follower_does_not_cancel_the_call():
+    flight = _flight()
+
+    async def compute() -> str:
+        await asyncio.sleep(0.05)
+        return "parsed"
+
+    async def scenario() -> tuple:
+        leader = asyncio.create_task(flight.do_async("k", compute))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do_async("k", compute))
+        await asyncio.sleep(0.01)
+        follower.cancel()
+        result = await leader
+        return result, follower.cancelled()
+
+    assert asyncio.run(scenario()) == ("parsed", True)
+
+
+def test_redis_outage_runs_the_call_locally(redis_down):
+    flight = _flight()
+
+    assert flight.do("k", lambda: "parsed") == "parsed"
+    assert flight.stats.leaders == 1
+    assert flight.stats.redis_errors == 1
+
+
+class _LockOnlyRedis:
+    # Takes the lock, then fails every later step (publish, unlock, ...).
+    def set(self, *args, **kwargs):
+        return True
+
+    def register_script(self, script):
+        def _fail(*args, **kwargs):
+            raise redis.ConnectionError("Redis is down")
+
+        return _fail
+
+    def setex(self, *args, **kwargs):
+        raise redis.ConnectionError("Redis is down")
+
+
+def test_redis_failure_after_the_lock_keeps_the_result(monkeypatch):
+    monkeypatch.setattr(singleflight, "get_redis_client", lambda: _LockOnlyRedis())
+    flight = _flight()
+
+    assert flight.do("k", lambda: "parsed") == "parsed"
+    assert flight.stats.redis_errors == 2  # publish + unlock
+
+
+def test_parse_meal_survives_a_redis_outage(redis_down, monkeypatch):
+    parsed = meal_parser.ParsedMeal(title="Eggs", totals={"calories": 140, "protein_g": 12}, items=[])
+    monkeypatch.setattr(meal_parser, "_parse_meal_uncached", lambda text: parsed)
+
+    assert meal_parser.parse_meal("two eggs during an outage") == parsed
+
+
+class _AsyncMemoryRedis:
+    # The commands the async flight uses, shared by two "workers" (TTLs ignored).
+    def __init__(self) -> None:
+        self.data: dict[str, str] = {}
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def exists(self, key):
+        return int(key in self.data)
+
+    def register_script(self, script):
+        async def release(keys, args, client):
+            if self.data.get(keys[0]) == args[0]:
+                del self.data[keys[0]]
+
+        return release
+
+
+def test_do_async_coalesces_across_workers(monkeypatch):
+    shared = _AsyncMemoryRedis()
+    monkeypatch.setattr(singleflight, "get_async_redis_client", lambda: shared)
+    worker_a, worker_b = _flight(), _flight()
+    calls = 0
+
+    async def compute() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.3)
+        return "parsed"
+
+    async def scenario() -> list[str]:
+        leader = asyncio.create_task(worker_a.do_async("k", compute))
+        await asyncio.sleep(0.05)
+        return [await worker_b.do_async("k", compute), await leader]
+
+    assert asyncio.run(scenario()) == ["parsed", "parsed"]
+    assert calls == 1
+    assert worker_b.stats.remote_followers == 1
+
+
+def test_do_async_redis_outage_runs_the_call_locally(redis_down):
+    flight = _flight()
+
+    async def compute() -> str:
+        return "parsed"
+
+    assert asyncio.run(flight.do_async("k", compute)) == "parsed"
+    assert flight.stats.redis_errors == 1